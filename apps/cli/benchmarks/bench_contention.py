@@ -0,0 +1,78 @@
+"""Benchmark parallel writers on the JSON backend.
+
+For each number of writers, starts that many processes which each add
+projects one transaction at a time to the same data directory, like
+concurrent CI jobs would. Reports the total write throughput, the mean
+latency of a write and checks that no write was lost.
+
+Usage:
+    uv run python benchmarks/bench_contention.py [--writers 1,2,4,8] [--writes N] [--projects N]
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from pathlib import Path
+
+from agentflow import storage
+from agentflow.models import Project
+from synthetic import make_database
+
+
+def write(data_dir: Path, organization_id: str, writer: int, writes: int) -> tuple[float, float]:
+    """Add projects in one writer process.
+
+    Returns:
+        Tuple of (start, end) wall-clock times of the writes
+    """
+    storage.DATA_DIR = data_dir
+    storage.DATA_FILE = data_dir / "data.json"
+    storage.load_database()
+
+    start = time.time()
+    for n in range(writes):
+        slug = f"w{writer}-{n}"
+        storage.add_project(Project(organization_id=organization_id, name=slug, slug=slug))
+    return start, time.time()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", default="1,2,4,8", help="Comma-separated writer counts")
+    parser.add_argument("--writes", type=int, default=100, help="Transactions per writer")
+    parser.add_argument("--projects", type=int, default=5_000, help="Projects stored beforehand")
+    args = parser.parse_args()
+
+    db = make_database(10, 100, args.projects)
+    organization_id = db.organizations[0].id
+    print(f"{len(db.projects)} projects stored beforehand, {args.writes} writes per writer")
+    print()
+    print(f"{'writers':>8}{'writes/s':>12}{'latency':>12}{'lost':>8}")
+
+    context = multiprocessing.get_context("spawn")
+    for writers in map(int, args.writers.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            storage.DATA_DIR = data_dir
+            storage.DATA_FILE = data_dir / "data.json"
+            storage.clear_cache()
+            storage.save_database(db)
+
+            with context.Pool(writers) as pool:
+                times = pool.starmap(
+                    write,
+                    [(data_dir, organization_id, writer, args.writes) for writer in range(writers)],
+                )
+
+            storage.clear_cache()
+            stored = len(storage.load_database().projects) - len(db.projects)
+
+        total = writers * args.writes
+        elapsed = max(end for _, end in times) - min(start for start, _ in times)
+        latency = sum(end - start for start, end in times) / total
+        print(f"{writers:>8}{total / elapsed:>12.0f}{latency * 1e3:>10.1f}ms{total - stored:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark write latency in each durability mode.
+
+For each backend and durability mode, reports the mean time of a
+transaction adding one project, of a transaction adding a batch of
+projects, and of a full save.
+
+Usage:
+    uv run python benchmarks/bench_durability.py [--writes N] [--batch N] [--projects N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from agentflow import durability, storage
+from agentflow.models import Project
+from agentflow.sqlite_backend import close_connections
+from synthetic import make_database
+
+
+def mean_time(repeat: int, func) -> float:
+    """Run func repeat times and return the mean wall time in seconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=5_000, help="Projects stored beforehand")
+    parser.add_argument("--writes", type=int, default=50, help="Single-project transactions")
+    parser.add_argument("--batch", type=int, default=20, help="Projects per batch transaction")
+    parser.add_argument("--saves", type=int, default=3, help="Full saves")
+    args = parser.parse_args()
+
+    db = make_database(10, 100, args.projects)
+    organization_id = db.organizations[0].id
+    print(f"{len(db.projects)} projects stored beforehand")
+    print()
+    print(f"{'backend':<10}{'mode':<10}{'add':>10}{'batch':>10}{'save':>10}")
+
+    counter = iter(range(10**9))
+
+    def add() -> None:
+        n = next(counter)
+        storage.add_project(Project(organization_id=organization_id, name=f"B {n}", slug=f"b-{n}"))
+
+    def add_batch() -> None:
+        with storage.transaction():
+            for _ in range(args.batch):
+                add()
+
+    for backend in storage.BACKENDS:
+        for mode in durability.MODES:
+            with tempfile.TemporaryDirectory() as tmp:
+                os.environ[storage.BACKEND_ENV_VAR] = backend
+                os.environ[durability.ENV_VAR] = mode
+                storage.DATA_DIR = Path(tmp)
+                storage.DATA_FILE = storage.DATA_DIR / "data.json"
+                storage.clear_cache()
+                storage.save_database(db)
+
+                add_time = mean_time(args.writes, add)
+                batch_time = mean_time(max(1, args.writes // args.batch), add_batch)
+                save_time = mean_time(args.saves, lambda: storage.save_database(storage.load_database()))
+                close_connections()
+
+            print(
+                f"{backend:<10}{mode:<10}{add_time * 1e3:>8.1f}ms"
+                f"{batch_time * 1e3:>8.1f}ms{save_time * 1e3:>8.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
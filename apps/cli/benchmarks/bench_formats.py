@@ -0,0 +1,85 @@
+"""Benchmark the data.json on-disk formats.
+
+Reports, for each format: the file size; the time to serialize the
+database and to save it through the JSON backend (atomic write in the
+strict durability mode, validated snapshot cache included); the raw
+decode time of the serializer alone; and the load time of a new process
+with the snapshot cache removed (full Pydantic validation) and with it
+in place.
+
+Usage:
+    uv run python benchmarks/bench_formats.py [--projects N] [--organizations N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from agentflow import durability, serializers, snapshot_cache, storage
+from synthetic import make_database
+
+
+def best_of(repeat: int, func, setup=None) -> float:
+    """Run func repeat times and return the fastest wall time in seconds.
+
+    setup, if given, runs untimed before each call.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--organizations", type=int, default=1_000)
+    parser.add_argument("--projects", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    db = make_database(args.users, args.organizations, args.projects)
+    print(
+        f"{len(db.users)} users, {len(db.organizations)} organizations, "
+        f"{len(db.projects)} projects (best of {args.repeat})"
+    )
+    print()
+    print(
+        f"{'format':<14}{'size':>10}{'serialize':>11}{'save':>9}{'decode':>9}"
+        f"{'load':>9}{'cached':>9}"
+    )
+
+    os.environ[durability.ENV_VAR] = "strict"
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.DATA_DIR = Path(tmp)
+        storage.DATA_FILE = storage.DATA_DIR / "data.json"
+        backend = storage.JSONBackend()
+
+        for fmt in serializers.FORMATS:
+            os.environ[storage.FORMAT_ENV_VAR] = fmt
+            size = len(storage.serialize_database(db, fmt))
+            serialize = best_of(args.repeat, lambda: storage.serialize_database(db, fmt))
+            save = best_of(args.repeat, lambda: backend.save(db))
+            decode = best_of(args.repeat, lambda: serializers.loads(storage.DATA_FILE.read_bytes()))
+
+            def uncached():
+                storage.clear_cache()
+                snapshot_cache.remove(storage.DATA_FILE)
+
+            load = best_of(args.repeat, backend.load, setup=uncached)
+            # The uncached loads left a validated cache behind
+            cached = best_of(args.repeat, backend.load, setup=storage.clear_cache)
+            print(
+                f"{fmt:<14}{size / 1e6:>8.2f}MB{serialize * 1e3:>9.0f}ms{save * 1e3:>7.0f}ms"
+                f"{decode * 1e3:>7.0f}ms{load * 1e3:>7.0f}ms{cached * 1e3:>7.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Startup time of the CLI against a time budget.
+
+Runs each command in a fresh interpreter several times and reports the
+best wall-clock time, next to the cost of starting a bare interpreter.
+Exits with status 1 when a command goes over its budget.
+
+    PYTHONPATH=src python benchmarks/bench_startup.py
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Budgets in milliseconds, on top of a bare `python -c pass`
+BUDGETS = {
+    "version": 200,
+    "--help": 300,
+}
+
+
+def best_time(args: list[str], runs: int) -> float:
+    """Run a command several times and return its best wall-clock time in ms."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    env_args = [sys.executable, "-m", "agentflow"]
+    baseline = best_time([sys.executable, "-c", "pass"], args.runs)
+    print(f"{'python -c pass':<20} {baseline:8.1f} ms")
+
+    over = False
+    for command, budget in BUDGETS.items():
+        elapsed = best_time([*env_args, command], args.runs) - baseline
+        status = "ok" if elapsed <= budget else "OVER BUDGET"
+        over = over or elapsed > budget
+        print(f"{'agentflow ' + command:<20} {elapsed:8.1f} ms  (budget {budget} ms)  {status}")
+
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("COLUMNS", "80")
+    sys.exit(main())
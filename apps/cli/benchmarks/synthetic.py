@@ -0,0 +1,56 @@
+"""Synthetic databases for benchmarks."""
+
+import random
+from datetime import datetime, timedelta, UTC
+
+from agentflow.models import APIKey, Database, Organization, Project, User
+
+
+def make_database(
+    users: int = 100, organizations: int = 1_000, projects: int = 50_000, seed: int = 0
+) -> Database:
+    """Build a database of the given size with plausible field values.
+
+    Args:
+        users: Number of users (each with two API keys)
+        organizations: Number of organizations, spread across users
+        projects: Number of projects, spread across organizations
+        seed: Random seed
+
+    Returns:
+        Database
+    """
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+
+    db = Database()
+    for i in range(users):
+        user = User(email=f"user{i}@example.com", password_hash=f"{i:064x}", name=f"User {i}")
+        user.api_keys.append(APIKey(key=f"afk_{rng.getrandbits(128):032x}", name="Default Key"))
+        user.api_keys.append(APIKey(key=f"afk_{rng.getrandbits(128):032x}", name="CI"))
+        db.add_user(user)
+
+    for i in range(organizations):
+        db.add_organization(
+            Organization(
+                owner_id=db.users[i % users].id,
+                name=f"Organization {i}",
+                slug=f"org-{i}",
+                description=f"Synthetic organization number {i}" if i % 3 else None,
+                created_at=start + timedelta(minutes=i),
+            )
+        )
+
+    for i in range(projects):
+        db.add_project(
+            Project(
+                organization_id=db.organizations[i % organizations].id,
+                name=f"Project {i}",
+                slug=f"project-{i}",
+                description=f"Synthetic project {i} for benchmarks" if i % 2 else None,
+                github_url=f"https://github.com/example/project-{i}" if i % 4 == 0 else None,
+                is_active=i % 5 != 0,
+                created_at=start + timedelta(seconds=i),
+            )
+        )
+    return db
@@ -1,6 +1,66 @@
-"""Main entry point for running as module."""
+"""Main entry point for running as module (and of the agentflow script)."""
+
+import os
+import sys
+
+# Files read by the `agentflow prompt` fast path, the same as
+# agentflow.utils.config's CONFIG_FILE and get_context_file()
+CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".agentflow")
+CONFIG_FILE = os.path.join(CONFIG_DIR, "config.yaml")
+CONTEXT_FILE = os.path.join(CONFIG_DIR, "context")
+
+
+def read_context() -> str | None:
+    """Read the context file for `agentflow prompt`, importing nothing.
+
+    Follows agentflow.utils.config.read_context_file() with os alone,
+    as importing pathlib would take longer than the whole lookup.
+
+    Returns:
+        Context string, or None to let the prompt command work it out
+    """
+    try:
+        if os.stat(CONFIG_FILE).st_mtime_ns > os.stat(CONTEXT_FILE).st_mtime_ns:
+            return None
+        with open(CONTEXT_FILE) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def main() -> None:
+    """Run the CLI.
+
+    Shell completion of slugs and API key names is answered from the
+    completion cache, `agentflow prompt` from the context file, and
+    other commands by the daemon when one is running, all before the
+    CLI (and typer) is imported, so they stay fast; anything else goes
+    to agentflow.cli.main.
+    """
+    if sys.argv[1:] == ["prompt"]:
+        context = read_context()
+        if context is not None:
+            if context:
+                print(context)
+            return
+
+    if "_AGENTFLOW_COMPLETE" in os.environ:
+        from agentflow.completion import complete_from_cache
+
+        code = complete_from_cache(os.environ)
+        if code is not None:
+            sys.exit(code)
+    else:
+        from agentflow.daemon import forward_command
+
+        code = forward_command(sys.argv[1:])
+        if code is not None:
+            sys.exit(code)
+
+    from agentflow.cli import main as cli_main
+
+    cli_main(forward=False)
 
-from agentflow.cli import app
 
 if __name__ == "__main__":
-    app()
+    main()
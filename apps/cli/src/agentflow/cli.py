@@ -1,41 +1,167 @@
 """Main CLI application."""
 
+import importlib
+import os
+import sys
+import traceback
+from typing import Optional
+
 import typer
-from agentflow.commands import auth, org, project
-from agentflow.utils.config import get_context_string
-from agentflow.utils.output import info
+from typer.core import TyperGroup
+
+from agentflow.locking import ConflictError
+
+# Command groups: name -> (module defining `app`, short help).
+# Modules are imported only when their group is invoked, so commands
+# like `agentflow version` don't pay for pydantic, yaml or storage.
+COMMAND_GROUPS = {
+    "auth": ("agentflow.commands.auth", "Authentication commands"),
+    "org": ("agentflow.commands.org", "Organization commands"),
+    "project": ("agentflow.commands.project", "Project commands"),
+    "storage": ("agentflow.commands.storage", "Storage management commands"),
+    "daemon": ("agentflow.commands.daemon", "Resident daemon commands"),
+    "shell": ("agentflow.commands.shell", "Run commands interactively in one process"),
+    "batch": ("agentflow.commands.batch", "Run commands from a file or stdin in one transaction"),
+    "export": ("agentflow.commands.export", "Export data as JSONL or CSV"),
+    "search": ("agentflow.commands.search", "Search organizations and projects"),
+    "prompt": ("agentflow.commands.prompt", "Print the current context for a shell prompt"),
+}
+
+
+class LazyGroup(TyperGroup):
+    """Root command group that imports command groups on first use.
+
+    Each group in COMMAND_GROUPS starts as a placeholder carrying its
+    short help, which is all the root --help needs. Resolving the group
+    to run it replaces the placeholder with the real command.
+    """
+
+    def __init__(self, **attrs):
+        super().__init__(**attrs)
+        self.pending = set()
+        self.describing = False
+        for name, (_, help) in COMMAND_GROUPS.items():
+            if name not in self.commands:
+                self.commands[name] = TyperGroup(name=name, help=help)
+                self.pending.add(name)
+
+    def get_command(self, ctx, cmd_name: str):
+        """Get a command, importing its module unless only listing help."""
+        if cmd_name in self.pending and not self.describing:
+            module = importlib.import_module(COMMAND_GROUPS[cmd_name][0])
+            command = typer.main.get_command(module.app)
+            command.name = cmd_name
+            self.commands[cmd_name] = command
+            self.pending.discard(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_help(self, ctx, formatter) -> None:
+        """Format help from the placeholders, without importing groups."""
+        self.describing = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self.describing = False
+
 
 app = typer.Typer(
-    help="AgentFlow CLI - Phase 0 (Local Storage)\n\nManage organizations, projects, and development workflow."
+    cls=LazyGroup,
+    help="AgentFlow CLI - Phase 0 (Local Storage)\n\nManage organizations, projects, and development workflow.",
 )
 
-# Register command groups
-app.add_typer(auth.app, name="auth")
-app.add_typer(org.app, name="org")
-app.add_typer(project.app, name="project")
+
+@app.callback()
+def callback(
+    output: str = typer.Option(
+        "table",
+        "--output",
+        envvar="AGENTFLOW_OUTPUT",
+        help="Output format of lists: table, json, jsonl, csv or raw",
+    ),
+):
+    """Root callback; keeps `app` a group while its groups are lazy."""
+    from agentflow.utils.output import set_output_format
+
+    try:
+        set_output_format(output)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--output")
 
 
 @app.command()
 def version():
     """Show version information."""
+    from agentflow.paths import DATA_FILE
+    from agentflow.utils.config import CONFIG_FILE
+    from agentflow.utils.output import info
+
     info("AgentFlow CLI v0.0.1")
     info("Phase 0: Local Storage (JSON)")
     print()
     info("Data locations:")
-    from agentflow.storage import DATA_FILE
-    from agentflow.utils.config import CONFIG_FILE
-
     info(f"  Config: {CONFIG_FILE}")
     info(f"  Data:   {DATA_FILE}")
 
 
-def main():
-    """Main entry point for the CLI."""
-    # Get context for prompt prefix (if supported)
-    context = get_context_string()
+def _conflict(e: ConflictError) -> None:
+    """Report a write that lost a race with another process."""
+    from agentflow.utils.output import error
+
+    error(str(e))
+
+
+def run_command(args: list[str]) -> int:
+    """Run a CLI command in this process and return its exit code.
+
+    Used by the daemon and the shell, which run many commands without
+    exiting. Unexpected errors are printed instead of propagated.
+
+    Args:
+        args: Command-line arguments (without the program name)
+
+    Returns:
+        Exit code
+    """
+    try:
+        app(args, prog_name="agentflow")
+    except SystemExit as e:
+        if isinstance(e.code, str):
+            print(e.code, file=sys.stderr)
+            return 1
+        return e.code or 0
+    except ConflictError as e:
+        _conflict(e)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+def main(args: Optional[list[str]] = None, forward: bool = True):
+    """Main entry point for the CLI.
+
+    Forwards the command to the daemon when one is running (see
+    agentflow.daemon) and runs it in this process otherwise.
+
+    Args:
+        args: Command-line arguments (default: sys.argv[1:])
+        forward: Whether to try the daemon first; agentflow.__main__
+            already did before importing this module
+    """
+    argv = sys.argv[1:] if args is None else args
+    if forward and "_AGENTFLOW_COMPLETE" not in os.environ:
+        from agentflow import daemon
+
+        code = daemon.forward_command(argv)
+        if code is not None:
+            sys.exit(code)
 
-    # Run the app
-    app()
+    try:
+        app(args)
+    except ConflictError as e:
+        _conflict(e)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
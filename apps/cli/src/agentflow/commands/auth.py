@@ -5,15 +5,19 @@ import secrets
 import typer
 from typing import Optional
 
-from agentflow.models import User, APIKey, Database
-from agentflow.storage import load_database, save_database, find_user_by_email
+from agentflow.completion import complete_api_key_name
+from agentflow.models import User, APIKey
+from agentflow.storage import add_user, add_api_key, find_user_by_email, transaction
 from agentflow.utils.config import (
+    batch as config_batch,
     set_current_user_email,
     set_current_api_key,
     get_current_user_email,
+    get_current_organization,
+    get_current_project,
 )
 from agentflow.utils.validators import validate_email
-from agentflow.utils.output import success, error, warning, info, print_table
+from agentflow.utils.output import success, error, warning, info, is_table_output, print_table
 
 app = typer.Typer(help="Authentication commands")
 
@@ -47,39 +51,39 @@ def register(
         error(email_error)
         raise typer.Exit(1)
 
-    # Check if user already exists
-    existing_user = find_user_by_email(email)
-    if existing_user:
-        error("User already exists")
-        raise typer.Exit(1)
+    with transaction():
+        # Check if user already exists
+        existing_user = find_user_by_email(email)
+        if existing_user:
+            error("User already exists")
+            raise typer.Exit(1)
 
-    # Validate password length
-    if len(password) < 8:
-        error("Password must be at least 8 characters")
-        raise typer.Exit(1)
+        # Validate password length
+        if len(password) < 8:
+            error("Password must be at least 8 characters")
+            raise typer.Exit(1)
 
-    # Validate name length
-    if len(name) > 255:
-        error("Name must be 255 characters or less")
-        raise typer.Exit(1)
+        # Validate name length
+        if len(name) > 255:
+            error("Name must be 255 characters or less")
+            raise typer.Exit(1)
 
-    # Create user
-    user = User(
-        email=email, password_hash=hash_password(password), name=name, api_keys=[]
-    )
+        # Create user
+        user = User(
+            email=email, password_hash=hash_password(password), name=name, api_keys=[]
+        )
 
-    # Generate default API key
-    api_key = APIKey(key=generate_api_key(), name="Default Key")
-    user.api_keys.append(api_key)
+        # Generate default API key
+        api_key = APIKey(key=generate_api_key(), name="Default Key")
+        user.api_keys.append(api_key)
 
-    # Save to database
-    db = load_database()
-    db.users.append(user)
-    save_database(db)
+        # Save to database
+        add_user(user)
 
     # Set as current user
-    set_current_user_email(email)
-    set_current_api_key(api_key.key)
+    with config_batch():
+        set_current_user_email(email)
+        set_current_api_key(api_key.key)
 
     # Display success
     success("User registered successfully")
@@ -123,14 +127,13 @@ def login(
         raise typer.Exit(1)
 
     # Set as current user
-    set_current_user_email(email)
-    set_current_api_key(active_key.key)
+    with config_batch():
+        set_current_user_email(email)
+        set_current_api_key(active_key.key)
 
     # Display success
     success(f"Logged in successfully as {email}")
     print()
-    from agentflow.utils.config import get_current_organization, get_current_project
-
     org = get_current_organization()
     project = get_current_project()
 
@@ -153,7 +156,9 @@ def login(
 @app.command("api-keys")
 def api_keys_command(
     action: str = typer.Argument(..., help="Action: 'list' or 'create'"),
-    name: Optional[str] = typer.Option(None, "--name", "-n", help="API key name"),
+    name: Optional[str] = typer.Option(
+        None, "--name", "-n", help="API key name", autocompletion=complete_api_key_name
+    ),
 ):
     """Manage API keys."""
     if action == "list":
@@ -181,13 +186,24 @@ def api_keys_list():
         error("User not found")
         raise typer.Exit(1)
 
-    if not user.api_keys:
+    if not user.api_keys and is_table_output():
         info("No API keys found")
         return
 
-    # Format data for table
+    # Format data for table (the keys themselves are never listed)
     rows = []
+    records = []
     for key in user.api_keys:
+        records.append(
+            {
+                "id": key.id,
+                "name": key.name,
+                "last_used_at": key.last_used_at.isoformat() if key.last_used_at else None,
+                "created_at": key.created_at.isoformat(),
+                "is_active": key.is_active,
+            }
+        )
+
         last_used = key.last_used_at.strftime("%Y-%m-%d %H:%M") if key.last_used_at else "Never"
         created = key.created_at.strftime("%Y-%m-%d %H:%M")
         status = "✓" if key.is_active else "✗"
@@ -196,6 +212,8 @@ def api_keys_list():
     print_table(
         ["NAME", "LAST USED", "CREATED", "ACTIVE"],
         rows,
+        records,
+        name="api_keys",
     )
 
 
@@ -210,26 +228,18 @@ def api_keys_create(name: str):
         error("Name must be 255 characters or less")
         raise typer.Exit(1)
 
-    # Load database
-    db = load_database()
-
-    # Find user
-    user_index = None
-    for i, user in enumerate(db.users):
-        if user.email == email:
-            user_index = i
-            break
-
-    if user_index is None:
-        error("User not found")
-        raise typer.Exit(1)
+    with transaction():
+        # Find user
+        user = find_user_by_email(email)
+        if user is None:
+            error("User not found")
+            raise typer.Exit(1)
 
-    # Create new API key
-    api_key = APIKey(key=generate_api_key(), name=name)
+        # Create new API key
+        api_key = APIKey(key=generate_api_key(), name=name)
 
-    # Add to user
-    db.users[user_index].api_keys.append(api_key)
-    save_database(db)
+        # Add to user
+        add_api_key(user.id, api_key)
 
     # Update current API key
     set_current_api_key(api_key.key)
@@ -247,11 +257,6 @@ def api_keys_create(name: str):
 @app.command()
 def status():
     """Show current authentication status."""
-    from agentflow.utils.config import (
-        get_current_organization,
-        get_current_project,
-    )
-
     email = get_current_user_email()
 
     # Print header
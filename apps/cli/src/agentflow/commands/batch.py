@@ -0,0 +1,93 @@
+"""Batch command."""
+
+import io
+import json
+import shlex
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+import typer
+
+from agentflow import storage
+from agentflow.utils import output
+from agentflow.utils.config import batch as config_batch
+from agentflow.utils.output import error
+
+app = typer.Typer(help="Run commands from a file or stdin in one transaction")
+
+# Commands that can't run inside a batch
+EXCLUDED_COMMANDS = ("batch", "shell", "daemon")
+
+
+def run_captured(args: list[str]) -> tuple[int, str]:
+    """Run a CLI command in this process, capturing what it prints.
+
+    Args:
+        args: Command-line arguments (without the program name)
+
+    Returns:
+        Tuple of (exit code, combined stdout and stderr)
+    """
+    from agentflow.cli import run_command
+
+    captured = io.StringIO()
+    with redirect_stdout(captured), redirect_stderr(captured):
+        output.reset_console()
+        try:
+            code = run_command(args)
+        finally:
+            output.reset_console()
+    return code, captured.getvalue()
+
+
+@app.command()
+def batch(
+    source: str = typer.Argument(..., help="File with one command per line, or '-' for stdin"),
+    stop_on_error: bool = typer.Option(
+        False, "--stop-on-error", help="Stop at the first failing command"
+    ),
+):
+    """Run CLI commands, one per line, in a single transaction.
+
+    Commands are written without the "agentflow" prefix; blank lines and
+    "#" comments are skipped. Each command's result is printed as a JSON
+    line. Storage and config changes are written once, at the end.
+    Exits with status 1 if any command failed.
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        path = Path(source)
+        if not path.is_file():
+            error(f"File not found: {source}")
+            raise typer.Exit(1)
+        lines = path.read_text().splitlines()
+
+    failed = False
+    with storage.transaction(), config_batch():
+        for number, line in enumerate(lines, start=1):
+            try:
+                args = shlex.split(line, comments=True)
+            except ValueError as e:
+                code, text = 2, f"Invalid command: {e}"
+            else:
+                if args and args[0] == "agentflow":
+                    args = args[1:]
+                if not args:
+                    continue
+                if args[0] in EXCLUDED_COMMANDS:
+                    code, text = 2, f"'{args[0]}' can't run in a batch"
+                else:
+                    code, text = run_captured(args)
+
+            result = {"line": number, "command": line, "exit_code": code, "output": text.strip()}
+            print(json.dumps(result), flush=True)
+
+            if code != 0:
+                failed = True
+                if stop_on_error:
+                    break
+
+    if failed:
+        raise typer.Exit(1)
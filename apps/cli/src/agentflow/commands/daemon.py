@@ -0,0 +1,95 @@
+"""Daemon management commands."""
+
+import os
+import subprocess
+import sys
+import time
+
+import typer
+
+from agentflow.daemon import DAEMON_ENV_VAR, Daemon, get_socket_path, is_supported, request
+from agentflow.utils.output import success, error, info
+
+app = typer.Typer(help="Resident daemon commands")
+
+# How long start waits for the daemon to answer
+START_TIMEOUT_SECONDS = 10.0
+
+
+def check_supported() -> None:
+    """Exit with an error on platforms without Unix socket fd passing."""
+    if not is_supported():
+        error("The daemon requires Unix domain sockets")
+        raise typer.Exit(1)
+
+
+@app.command()
+def start():
+    """Start the daemon in the background."""
+    check_supported()
+
+    running = request({"op": "ping"})
+    if running:
+        info(f"Daemon already running (pid {running['pid']})")
+        return
+
+    subprocess.Popen(
+        [sys.executable, "-m", "agentflow", "daemon", "run"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        env={**os.environ, DAEMON_ENV_VAR: "off"},
+    )
+
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        running = request({"op": "ping"})
+        if running:
+            success(f"Daemon started (pid {running['pid']})")
+            info(f"  Socket: {get_socket_path()}")
+            return
+        time.sleep(0.05)
+
+    error("Daemon did not start")
+    raise typer.Exit(1)
+
+
+@app.command()
+def run():
+    """Run the daemon in the foreground."""
+    check_supported()
+
+    daemon = Daemon()
+    daemon.warm_up()
+    info(f"Daemon listening on {daemon.path} (pid {os.getpid()})")
+    try:
+        daemon.serve()
+    except RuntimeError as e:
+        error(str(e))
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def stop():
+    """Stop the running daemon."""
+    check_supported()
+
+    stopped = request({"op": "stop"})
+    if not stopped:
+        info("Daemon is not running")
+        return
+    success(f"Daemon stopped (pid {stopped['pid']})")
+
+
+@app.command()
+def status():
+    """Show whether the daemon is running."""
+    running = request({"op": "ping"})
+    if running:
+        info(f"Daemon: running (pid {running['pid']})")
+        info(f"Socket: {get_socket_path()}")
+    else:
+        info("Daemon: not running")
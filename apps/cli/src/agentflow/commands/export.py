@@ -0,0 +1,166 @@
+"""Export commands."""
+
+import os
+import sys
+from typing import Iterable, Iterator, Optional
+
+import typer
+
+from agentflow.completion import complete_org_slug
+from agentflow.models import Organization, User
+from agentflow.storage import (
+    find_organization_by_slug,
+    find_organizations_by_owner,
+    find_user_by_email,
+    iter_projects,
+)
+from agentflow.utils.config import get_current_user_email
+from agentflow.utils.output import error
+from agentflow.utils.records import RECORD_FORMATS, write_records
+
+app = typer.Typer(help="Export data as JSONL or CSV")
+
+USER_COLUMNS = ["id", "email", "name", "created_at", "api_key_count"]
+ORGANIZATION_COLUMNS = ["id", "owner_id", "name", "slug", "description", "created_at"]
+PROJECT_COLUMNS = [
+    "id",
+    "organization_id",
+    "org",
+    "name",
+    "slug",
+    "description",
+    "github_url",
+    "is_active",
+    "created_at",
+]
+
+FORMAT_HELP = f"Output format: {', '.join(RECORD_FORMATS)}"
+
+
+def check_authenticated() -> User:
+    """Check if user is authenticated.
+
+    Returns:
+        The current user
+
+    Raises:
+        typer.Exit if not authenticated
+    """
+    email = get_current_user_email()
+    if not email:
+        error("Not authenticated. Run: agentflow auth login")
+        raise typer.Exit(1)
+    user = find_user_by_email(email)
+    if not user:
+        error("User not found")
+        raise typer.Exit(1)
+    return user
+
+
+def check_format(fmt: str) -> str:
+    """Check that an output format is supported.
+
+    Raises:
+        typer.Exit if it isn't
+    """
+    if fmt not in RECORD_FORMATS:
+        error(f"Unknown format '{fmt}'. Use {' or '.join(RECORD_FORMATS)}")
+        raise typer.Exit(1)
+    return fmt
+
+
+def get_organizations(user: User, org_slug: Optional[str]) -> list[Organization]:
+    """Get the organizations of the current user to export.
+
+    Args:
+        user: Current user
+        org_slug: Only this organization, if given
+
+    Raises:
+        typer.Exit if the organization doesn't exist or isn't the user's
+    """
+    if org_slug is None:
+        return find_organizations_by_owner(user.id)
+
+    org = find_organization_by_slug(org_slug)
+    if not org:
+        error(f"Organization '{org_slug}' not found")
+        raise typer.Exit(1)
+    if org.owner_id != user.id:
+        error("Access denied")
+        raise typer.Exit(1)
+    return [org]
+
+
+def stream(fmt: str, columns: list[str], records: Iterable[dict]) -> None:
+    """Write records to stdout as they are produced.
+
+    A reader that stops early (e.g. `| head`) ends the export quietly.
+    """
+    try:
+        write_records(sys.stdout, fmt, columns, records)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Point stdout at /dev/null so the interpreter's final flush doesn't fail again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        raise typer.Exit(0)
+
+
+@app.command()
+def users(
+    fmt: str = typer.Option("jsonl", "--format", "-f", help=FORMAT_HELP),
+):
+    """Export the current user, without password hash or API keys."""
+    user = check_authenticated()
+    check_format(fmt)
+
+    data = user.model_dump(mode="json", exclude={"password_hash", "api_keys"})
+    data["api_key_count"] = len(user.api_keys)
+    stream(fmt, USER_COLUMNS, [data])
+
+
+@app.command()
+def orgs(
+    fmt: str = typer.Option("jsonl", "--format", "-f", help=FORMAT_HELP),
+    org: Optional[str] = typer.Option(
+        None, "--org", "-o", help="Only this organization (slug)", autocompletion=complete_org_slug
+    ),
+):
+    """Export your organizations."""
+    user = check_authenticated()
+    check_format(fmt)
+
+    organizations = get_organizations(user, org)
+    stream(fmt, ORGANIZATION_COLUMNS, (o.model_dump(mode="json") for o in organizations))
+
+
+@app.command()
+def projects(
+    fmt: str = typer.Option("jsonl", "--format", "-f", help=FORMAT_HELP),
+    org: Optional[str] = typer.Option(
+        None, "--org", "-o", help="Only projects of this organization (slug)", autocompletion=complete_org_slug
+    ),
+    active: Optional[bool] = typer.Option(
+        None, "--active/--inactive", help="Only active or only inactive projects"
+    ),
+):
+    """Export the projects of your organizations.
+
+    Each project carries its organization's slug in the "org" column, so
+    the output can be fed back to `agentflow project import`.
+    """
+    user = check_authenticated()
+    check_format(fmt)
+
+    organizations = get_organizations(user, org)
+
+    def records() -> Iterator[dict]:
+        for organization in organizations:
+            for project in iter_projects(organization.id):
+                if active is None or project.is_active == active:
+                    data = project.model_dump(mode="json")
+                    data["org"] = organization.slug
+                    yield data
+
+    stream(fmt, PROJECT_COLUMNS, records())
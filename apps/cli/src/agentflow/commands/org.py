@@ -1,27 +1,60 @@
 """Organization commands."""
 
+import itertools
+from datetime import datetime, UTC
+
 import typer
 from typing import Optional
 
-from agentflow.models import Organization, Database
+from agentflow.completion import complete_org_slug
+from agentflow.index import Filter
+from agentflow.models import Organization, ProjectCounts
+from agentflow.pagination import DEFAULT_PAGE_SIZE, SORT_ORDERS, Pager
 from agentflow.storage import (
-    load_database,
-    save_database,
+    add_organization,
+    count_projects,
+    find_user_by_email,
     find_organization_by_slug,
     find_organizations_by_owner,
     find_projects_by_organization,
+    page_organizations,
+    similar_slugs,
     slug_exists_in_organizations,
+    transaction,
+)
+from agentflow.utils.records import (
+    RECORD_FORMATS,
+    detect_format,
+    open_source,
+    read_records,
+    report_errors,
+    text_field,
 )
 from agentflow.utils.config import (
+    batch as config_batch,
     get_current_user_email,
     set_current_organization,
     get_current_organization,
 )
 from agentflow.utils.validators import validate_slug
-from agentflow.utils.output import success, error, info, print_table
+from agentflow.utils.output import (
+    did_you_mean,
+    success,
+    error,
+    info,
+    is_table_output,
+    print_pages,
+    print_table,
+)
 
 app = typer.Typer(help="Organization commands")
 
+# Default sort order of org list
+LIST_ORDER = "created_at"
+
+# Accepted --created-after values, read as UTC
+DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"]
+
 
 def check_authenticated() -> str:
     """Check if user is authenticated.
@@ -39,53 +72,107 @@ def check_authenticated() -> str:
     return email
 
 
+def org_row(org: Organization, counts: ProjectCounts) -> list[str]:
+    """Format an organization as a table row."""
+    # Format description
+    description = org.description or "-"
+    if len(description) > 50:
+        description = description[:47] + "..."
+
+    return [org.name, org.slug, description, str(counts.total), str(counts.active)]
+
+
+def org_record(org: Organization, counts: ProjectCounts) -> dict:
+    """Convert an organization to a record for machine-readable output."""
+    return {
+        "id": org.id,
+        "name": org.name,
+        "slug": org.slug,
+        "description": org.description,
+        "projects": counts.total,
+        "active_projects": counts.active,
+        "inactive_projects": counts.inactive,
+        "created_at": org.created_at.isoformat(),
+    }
+
+
 @app.command()
 def list(
     all_users: bool = typer.Option(False, "--all", "-a", help="Show all organizations (admin only)"),
+    limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Show at most this many organizations"),
+    cursor: Optional[str] = typer.Option(None, "--cursor", help="Continue after a previous --limit"),
+    page_size: int = typer.Option(
+        DEFAULT_PAGE_SIZE, "--page-size", min=1, help="Organizations read at a time"
+    ),
+    name_contains: Optional[str] = typer.Option(None, "--name-contains", help="Only names containing this text"),
+    created_after: Optional[datetime] = typer.Option(
+        None, "--created-after", formats=DATE_FORMATS, help="Only organizations created after this time (UTC)"
+    ),
+    sort: str = typer.Option(LIST_ORDER, "--sort", help=f"Sort by {', '.join(SORT_ORDERS)}"),
 ):
-    """List all organizations for current user."""
+    """List all organizations for current user.
+
+    Organizations are listed oldest first unless --sort says otherwise.
+    When --limit cuts the listing short, the cursor to continue from is
+    printed; repeat the same filters and --sort with it.
+    """
     email = check_authenticated()
 
-    # Load database and find user
-    db = load_database()
-    user_id = None
-    for user in db.users:
-        if user.email == email:
-            user_id = user.id
-            break
+    # Find user
+    user = find_user_by_email(email)
+    user_id = user.id if user else None
 
     if not user_id:
         error("User not found")
         raise typer.Exit(1)
 
+    where = Filter(
+        name_contains=name_contains,
+        created_after=created_after.replace(tzinfo=UTC) if created_after else None,
+    )
+
     # Filter by current user
-    user_orgs = [org for org in db.organizations if org.owner_id == user_id]
+    def fetch(after, size):
+        orgs, next_key = page_organizations(user_id, sort, after, size, where)
+        # Count projects of the whole page at once
+        counts = count_projects([org.id for org in orgs])
+        return [(org, counts[org.id]) for org in orgs], next_key
+
+    try:
+        pager = Pager(fetch, sort, limit, page_size, cursor)
+    except ValueError as e:
+        error(str(e))
+        raise typer.Exit(1)
 
-    if not user_orgs:
+    pages = pager.pages()
+    first = next(pages, None)
+
+    if first is None and is_table_output():
+        if cursor:
+            info("No more organizations")
+            return
+        if where != Filter():
+            info("No matching organizations")
+            return
         info("No organizations found")
         print()
         info("Create one:")
         info("  agentflow org create --name 'My Org' --slug 'my-org'")
         return
 
-    # Format data for table
-    rows = []
-    for org in user_orgs:
-        # Count projects
-        project_count = len(find_projects_by_organization(org.id))
-
-        # Format description
-        description = org.description or "-"
-        if len(description) > 50:
-            description = description[:47] + "..."
-
-        rows.append([org.name, org.slug, description, str(project_count)])
-
-    print_table(
-        ["NAME", "SLUG", "DESCRIPTION", "PROJECTS"],
-        rows,
+    print_pages(
+        ["NAME", "SLUG", "DESCRIPTION", "PROJECTS", "ACTIVE"],
+        itertools.chain([first] if first else [], pages),
+        lambda item: org_row(*item),
+        lambda item: org_record(*item),
+        name="organizations",
+        trailer=lambda: {"next_cursor": pager.next_cursor},
     )
 
+    if pager.next_cursor and is_table_output():
+        print()
+        info(f"More organizations: agentflow org list --cursor {pager.next_cursor}")
+
 
 @app.command()
 def create(
@@ -107,33 +194,27 @@ def create(
         error(slug_error)
         raise typer.Exit(1)
 
-    # Check if slug already exists
-    if slug_exists_in_organizations(slug):
-        error(f"Organization with slug '{slug}' already exists")
-        raise typer.Exit(1)
-
-    # Load database and find user
-    db = load_database()
+    with transaction():
+        # Check if slug already exists
+        if slug_exists_in_organizations(slug):
+            error(f"Organization with slug '{slug}' already exists")
+            raise typer.Exit(1)
 
-    # Find user by email to get their ID
-    user_id = None
-    for user in db.users:
-        if user.email == email:
-            user_id = user.id
-            break
+        # Find user by email to get their ID
+        user = find_user_by_email(email)
+        user_id = user.id if user else None
 
-    if not user_id:
-        error("User not found")
-        raise typer.Exit(1)
+        if not user_id:
+            error("User not found")
+            raise typer.Exit(1)
 
-    # Create organization
-    org = Organization(
-        owner_id=user_id, name=name, slug=slug, description=description
-    )
+        # Create organization
+        org = Organization(
+            owner_id=user_id, name=name, slug=slug, description=description
+        )
 
-    # Save to database
-    db.organizations.append(org)
-    save_database(db)
+        # Save to database
+        add_organization(org)
 
     # Display success
     success("Organization created")
@@ -148,7 +229,7 @@ def create(
 
 @app.command()
 def view(
-    slug: str = typer.Argument(..., help="Organization slug"),
+    slug: str = typer.Argument(..., help="Organization slug", autocompletion=complete_org_slug),
 ):
     """View organization details."""
     email = check_authenticated()
@@ -157,15 +238,12 @@ def view(
     org = find_organization_by_slug(slug)
     if not org:
         error(f"Organization '{slug}' not found")
+        did_you_mean(similar_slugs("organization", slug, owner_email=email))
         raise typer.Exit(1)
 
     # Check ownership (for Phase 0, allow viewing own orgs only)
-    db = load_database()
-    user_id = None
-    for user in db.users:
-        if user.email == email:
-            user_id = user.id
-            break
+    user = find_user_by_email(email)
+    user_id = user.id if user else None
 
     if org.owner_id != user_id:
         error("Access denied")
@@ -201,7 +279,7 @@ def view(
 
 @app.command()
 def use(
-    slug: str = typer.Argument(..., help="Organization slug"),
+    slug: str = typer.Argument(..., help="Organization slug", autocompletion=complete_org_slug),
 ):
     """Set active organization."""
     email = check_authenticated()
@@ -210,27 +288,24 @@ def use(
     org = find_organization_by_slug(slug)
     if not org:
         error(f"Organization '{slug}' not found")
+        did_you_mean(similar_slugs("organization", slug, owner_email=email))
         raise typer.Exit(1)
 
     # Check ownership
-    db = load_database()
-    user_id = None
-    for user in db.users:
-        if user.email == email:
-            user_id = user.id
-            break
+    user = find_user_by_email(email)
+    user_id = user.id if user else None
 
     if org.owner_id != user_id:
         error("Access denied")
         raise typer.Exit(1)
 
-    # Set as current organization
-    set_current_organization(slug)
-
-    # Clear current project (org change invalidates project context)
+    # Set as current organization and clear current project
+    # (org change invalidates project context)
     from agentflow.utils.config import clear_current_project
 
-    clear_current_project()
+    with config_batch():
+        set_current_organization(slug)
+        clear_current_project()
 
     # Display success
     success(f"Now using organization: {slug} ({org.name})")
@@ -238,3 +313,93 @@ def use(
     info("Next steps:")
     info("  agentflow project list")
     info("  agentflow project create --name 'My Project'")
+
+
+@app.command("import")
+def import_(
+    source: str = typer.Argument(..., help="CSV or JSONL file, or '-' for stdin"),
+    fmt: Optional[str] = typer.Option(
+        None, "--format", "-f", help=f"Input format: {', '.join(RECORD_FORMATS)} (default: from file extension)"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Validate without saving"),
+):
+    """Create organizations in bulk from a CSV or JSONL file.
+
+    Each record needs a name and slug, and may have a description. All
+    records are validated first; if any is invalid nothing is saved.
+    Otherwise they are all written at once.
+    """
+    email = check_authenticated()
+
+    record_format = detect_format(source, fmt)
+    if not record_format:
+        error(f"Unknown format. Use --format {' or '.join(RECORD_FORMATS)}")
+        raise typer.Exit(1)
+
+    with transaction():
+        user = find_user_by_email(email)
+        if not user:
+            error("User not found")
+            raise typer.Exit(1)
+
+        orgs = []
+        errors = []
+        seen = set()
+        try:
+            with open_source(source) as stream:
+                for line, record in read_records(stream, record_format):
+                    org, problem = _parse_org(record, user.id, seen)
+                    if problem:
+                        errors.append(f"Line {line}: {problem}")
+                    else:
+                        orgs.append(org)
+        except FileNotFoundError:
+            error(f"File not found: {source}")
+            raise typer.Exit(1)
+
+        if errors:
+            report_errors(errors)
+            raise typer.Exit(1)
+
+        if not dry_run:
+            for org in orgs:
+                add_organization(org)
+
+    if dry_run:
+        success(f"{len(orgs)} organizations are valid (dry run, nothing saved)")
+    else:
+        success(f"Imported {len(orgs)} organizations")
+
+
+def _parse_org(record: dict, owner_id: str, seen: set) -> tuple[Optional[Organization], Optional[str]]:
+    """Validate one import record and build its organization.
+
+    Args:
+        record: Record read from the import file
+        owner_id: ID of the user importing
+        seen: Slugs taken by earlier records (updated in place)
+
+    Returns:
+        Tuple of (organization, None) or (None, error message)
+    """
+    if "__error__" in record:
+        return None, record["__error__"]
+
+    name = text_field(record, "name")
+    slug = text_field(record, "slug")
+    if not name:
+        return None, "Name is required"
+    if len(name) > 255:
+        return None, "Name must be 255 characters or less"
+    slug_error = validate_slug(slug or "")
+    if slug_error:
+        return None, slug_error
+    if slug in seen or slug_exists_in_organizations(slug):
+        return None, f"Organization with slug '{slug}' already exists"
+    seen.add(slug)
+
+    org = Organization(
+        owner_id=owner_id, name=name, slug=slug, description=text_field(record, "description")
+    )
+    return org, None
+
@@ -1,28 +1,52 @@
 """Project commands."""
 
+import itertools
+from datetime import datetime, UTC
+
 import typer
 from typing import Optional
 
-from agentflow.models import Project, Database
+from agentflow.completion import complete_org_slug, complete_project_slug
+from agentflow.index import Filter
+from agentflow.models import Project
+from agentflow.pagination import DEFAULT_PAGE_SIZE, SORT_ORDERS, Pager
 from agentflow.storage import (
-    load_database,
-    save_database,
+    add_project,
     find_organization_by_slug,
     find_project_by_slug,
     find_projects_by_organization,
+    page_projects,
+    similar_slugs,
     slug_exists_in_projects,
+    transaction,
+)
+from agentflow.utils.records import (
+    RECORD_FORMATS,
+    bool_field,
+    detect_format,
+    open_source,
+    read_records,
+    report_errors,
+    text_field,
 )
 from agentflow.utils.config import (
+    batch as config_batch,
     get_current_user_email,
     get_current_organization,
     set_current_organization,
     set_current_project,
 )
 from agentflow.utils.validators import validate_slug
-from agentflow.utils.output import success, error, info, print_table
+from agentflow.utils.output import did_you_mean, success, error, info, is_table_output, print_pages
 
 app = typer.Typer(help="Project commands")
 
+# Default sort order of project list
+LIST_ORDER = "created_at"
+
+# Accepted --created-after values, read as UTC
+DATE_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S"]
+
 
 def check_authenticated() -> str:
     """Check if user is authenticated.
@@ -67,49 +91,110 @@ def get_org_context(org_slug: Optional[str] = None) -> tuple[str, str]:
     org = find_organization_by_slug(org_slug)
     if not org:
         error(f"Organization '{org_slug}' not found")
+        did_you_mean(similar_slugs("organization", org_slug, owner_email=get_current_user_email()))
         raise typer.Exit(1)
 
     return org_slug, org.id
 
 
+def project_row(project: Project) -> list[str]:
+    """Format a project as a table row."""
+    # Format GitHub URL
+    github = project.github_url or "-"
+    if github != "-" and len(github) > 40:
+        github = "..." + github[-37:]
+
+    status = "✓" if project.is_active else "✗"
+    return [project.name, project.slug, status, github]
+
+
+def project_record(project: Project) -> dict:
+    """Convert a project to a record for machine-readable output."""
+    return {
+        "id": project.id,
+        "name": project.name,
+        "slug": project.slug,
+        "description": project.description,
+        "github_url": project.github_url,
+        "is_active": project.is_active,
+        "created_at": project.created_at.isoformat(),
+    }
+
+
 @app.command()
 def list(
-    org: Optional[str] = typer.Option(None, "--org", "-o", help="Organization slug"),
+    org: Optional[str] = typer.Option(
+        None, "--org", "-o", help="Organization slug", autocompletion=complete_org_slug
+    ),
+    limit: Optional[int] = typer.Option(None, "--limit", min=1, help="Show at most this many projects"),
+    cursor: Optional[str] = typer.Option(None, "--cursor", help="Continue after a previous --limit"),
+    page_size: int = typer.Option(
+        DEFAULT_PAGE_SIZE, "--page-size", min=1, help="Projects read at a time"
+    ),
+    active: Optional[bool] = typer.Option(None, "--active/--inactive", help="Only active or only inactive projects"),
+    name_contains: Optional[str] = typer.Option(None, "--name-contains", help="Only names containing this text"),
+    has_github: bool = typer.Option(False, "--has-github", help="Only projects with a GitHub URL"),
+    created_after: Optional[datetime] = typer.Option(
+        None, "--created-after", formats=DATE_FORMATS, help="Only projects created after this time (UTC)"
+    ),
+    sort: str = typer.Option(LIST_ORDER, "--sort", help=f"Sort by {', '.join(SORT_ORDERS)}"),
 ):
-    """List all projects in current or specified organization."""
+    """List all projects in current or specified organization.
+
+    Projects are listed oldest first unless --sort says otherwise. When
+    --limit cuts the listing short, the cursor to continue from is
+    printed; repeat the same filters and --sort with it.
+    """
     email = check_authenticated()
 
     # Get organization context
     org_slug, org_id = get_org_context(org)
 
-    # Get projects
-    projects = find_projects_by_organization(org_id)
+    where = Filter(
+        is_active=active,
+        has_github=True if has_github else None,
+        name_contains=name_contains,
+        created_after=created_after.replace(tzinfo=UTC) if created_after else None,
+    )
+
+    def fetch(after, size):
+        return page_projects(org_id, sort, after, size, where)
+
+    try:
+        pager = Pager(fetch, sort, limit, page_size, cursor)
+    except ValueError as e:
+        error(str(e))
+        raise typer.Exit(1)
+
+    pages = pager.pages()
+    first = next(pages, None)
 
-    if not projects:
+    if first is None and is_table_output():
+        if cursor:
+            info(f"No more projects in {org_slug}")
+            return
+        if where != Filter():
+            info(f"No matching projects in {org_slug}")
+            return
         info(f"No projects found in {org_slug}")
         print()
         info("Create one:")
         info(f"  agentflow project create --name 'My Project' --slug 'my-project'")
         return
 
-    # Format data for table
-    rows = []
-    for project in projects:
-        # Format GitHub URL
-        github = project.github_url or "-"
-        if github != "-" and len(github) > 40:
-            github = "..." + github[-37:]
-
-        # Format description
-        status = "✓" if project.is_active else "✗"
-
-        rows.append([project.name, project.slug, status, github])
-
-    print_table(
+    print_pages(
         ["NAME", "SLUG", "ACTIVE", "GITHUB"],
-        rows,
+        itertools.chain([first] if first else [], pages),
+        project_row,
+        project_record,
+        name="projects",
+        trailer=lambda: {"next_cursor": pager.next_cursor},
     )
 
+    if pager.next_cursor and is_table_output():
+        print()
+        info(f"More projects: agentflow project list --org {org_slug} --cursor {pager.next_cursor}")
+
 
 @app.command()
 def create(
@@ -117,7 +202,9 @@ def create(
     slug: str = typer.Option(..., "--slug", "-s", help="URL-friendly slug"),
     description: Optional[str] = typer.Option(None, "--description", "-d", help="Project description"),
     github_url: Optional[str] = typer.Option(None, "--github-url", "-g", help="GitHub repository URL"),
-    org: Optional[str] = typer.Option(None, "--org", "-o", help="Organization slug"),
+    org: Optional[str] = typer.Option(
+        None, "--org", "-o", help="Organization slug", autocompletion=complete_org_slug
+    ),
 ):
     """Create a new project."""
     email = check_authenticated()
@@ -136,24 +223,23 @@ def create(
         error(slug_error)
         raise typer.Exit(1)
 
-    # Check if slug already exists in org
-    if slug_exists_in_projects(org_id, slug):
-        error(f"Project with slug '{slug}' already exists in this organization")
-        raise typer.Exit(1)
-
-    # Create project
-    project = Project(
-        organization_id=org_id,
-        name=name,
-        slug=slug,
-        description=description,
-        github_url=github_url,
-    )
+    with transaction():
+        # Check if slug already exists in org
+        if slug_exists_in_projects(org_id, slug):
+            error(f"Project with slug '{slug}' already exists in this organization")
+            raise typer.Exit(1)
+
+        # Create project
+        project = Project(
+            organization_id=org_id,
+            name=name,
+            slug=slug,
+            description=description,
+            github_url=github_url,
+        )
 
-    # Save to database
-    db = load_database()
-    db.projects.append(project)
-    save_database(db)
+        # Save to database
+        add_project(project)
 
     # Set as current project
     set_current_project(slug)
@@ -171,8 +257,10 @@ def create(
 
 @app.command()
 def view(
-    slug: str = typer.Argument(..., help="Project slug"),
-    org: Optional[str] = typer.Option(None, "--org", "-o", help="Organization slug"),
+    slug: str = typer.Argument(..., help="Project slug", autocompletion=complete_project_slug),
+    org: Optional[str] = typer.Option(
+        None, "--org", "-o", help="Organization slug", autocompletion=complete_org_slug
+    ),
 ):
     """View project details."""
     email = check_authenticated()
@@ -184,6 +272,7 @@ def view(
     project = find_project_by_slug(org_id, slug)
     if not project:
         error(f"Project '{slug}' not found in {org_slug}")
+        did_you_mean(similar_slugs("project", slug, org_slug=org_slug))
         raise typer.Exit(1)
 
     # Get organization name
@@ -207,8 +296,10 @@ def view(
 
 @app.command()
 def use(
-    slug: str = typer.Argument(..., help="Project slug"),
-    org: Optional[str] = typer.Option(None, "--org", "-o", help="Organization slug"),
+    slug: str = typer.Argument(..., help="Project slug", autocompletion=complete_project_slug),
+    org: Optional[str] = typer.Option(
+        None, "--org", "-o", help="Organization slug", autocompletion=complete_org_slug
+    ),
 ):
     """Set active project."""
     email = check_authenticated()
@@ -220,15 +311,15 @@ def use(
     project = find_project_by_slug(org_id, slug)
     if not project:
         error(f"Project '{slug}' not found in {org_slug}")
+        did_you_mean(similar_slugs("project", slug, org_slug=org_slug))
         raise typer.Exit(1)
 
-    # Set org if not already set
-    current_org = get_current_organization()
-    if current_org != org_slug:
-        set_current_organization(org_slug)
-
-    # Set as current project
-    set_current_project(slug)
+    # Set org (if not already set) and current project in one write
+    with config_batch():
+        current_org = get_current_organization()
+        if current_org != org_slug:
+            set_current_organization(org_slug)
+        set_current_project(slug)
 
     # Get organization name
     org_obj = find_organization_by_slug(org_slug)
@@ -241,3 +332,121 @@ def use(
     info("Coming in v2:")
     info("  - Create AI agents")
     info("  - Start work sessions")
+
+
+@app.command("import")
+def import_(
+    source: str = typer.Argument(..., help="CSV or JSONL file, or '-' for stdin"),
+    org: Optional[str] = typer.Option(
+        None,
+        "--org",
+        "-o",
+        help="Organization slug for records without one",
+        autocompletion=complete_org_slug,
+    ),
+    fmt: Optional[str] = typer.Option(
+        None, "--format", "-f", help=f"Input format: {', '.join(RECORD_FORMATS)} (default: from file extension)"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Validate without saving"),
+):
+    """Create projects in bulk from a CSV or JSONL file.
+
+    Each record needs a name and slug, and may have a description,
+    github_url, is_active and org (slug; defaults to --org or the current
+    organization). All records are validated first; if any is invalid
+    nothing is saved. Otherwise they are all written at once.
+    """
+    check_authenticated()
+
+    record_format = detect_format(source, fmt)
+    if not record_format:
+        error(f"Unknown format. Use --format {' or '.join(RECORD_FORMATS)}")
+        raise typer.Exit(1)
+
+    default_org = org or get_current_organization()
+
+    with transaction():
+        # Org slug -> (org ID, project slugs taken in it), filled as orgs come up
+        orgs: dict[str, Optional[tuple[str, set]]] = {}
+        projects = []
+        errors = []
+        try:
+            with open_source(source) as stream:
+                for line, record in read_records(stream, record_format):
+                    project, problem = _parse_project(record, default_org, orgs)
+                    if problem:
+                        errors.append(f"Line {line}: {problem}")
+                    else:
+                        projects.append(project)
+        except FileNotFoundError:
+            error(f"File not found: {source}")
+            raise typer.Exit(1)
+
+        if errors:
+            report_errors(errors)
+            raise typer.Exit(1)
+
+        if not dry_run:
+            for project in projects:
+                add_project(project)
+
+    if dry_run:
+        success(f"{len(projects)} projects are valid (dry run, nothing saved)")
+    else:
+        success(f"Imported {len(projects)} projects")
+
+
+def _parse_project(
+    record: dict, default_org: Optional[str], orgs: dict
+) -> tuple[Optional[Project], Optional[str]]:
+    """Validate one import record and build its project.
+
+    Args:
+        record: Record read from the import file
+        default_org: Org slug for records without one
+        orgs: Org slug -> (org ID, taken project slugs), or None for a
+            missing org (updated in place)
+
+    Returns:
+        Tuple of (project, None) or (None, error message)
+    """
+    if "__error__" in record:
+        return None, record["__error__"]
+
+    org_slug = text_field(record, "org") or default_org
+    if not org_slug:
+        return None, "No organization. Add an org column or use --org"
+    if org_slug not in orgs:
+        org = find_organization_by_slug(org_slug)
+        orgs[org_slug] = (
+            (org.id, {p.slug for p in find_projects_by_organization(org.id)}) if org else None
+        )
+    if orgs[org_slug] is None:
+        return None, f"Organization '{org_slug}' not found"
+    org_id, taken = orgs[org_slug]
+
+    name = text_field(record, "name")
+    slug = text_field(record, "slug")
+    if not name:
+        return None, "Name is required"
+    if len(name) > 255:
+        return None, "Name must be 255 characters or less"
+    slug_error = validate_slug(slug or "")
+    if slug_error:
+        return None, slug_error
+    if slug in taken:
+        return None, f"Project with slug '{slug}' already exists in {org_slug}"
+    is_active = bool_field(record, "is_active", True)
+    if is_active is None:
+        return None, "is_active must be true or false"
+    taken.add(slug)
+
+    project = Project(
+        organization_id=org_id,
+        name=name,
+        slug=slug,
+        description=text_field(record, "description"),
+        github_url=text_field(record, "github_url"),
+        is_active=is_active,
+    )
+    return project, None
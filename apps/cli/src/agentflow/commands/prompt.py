@@ -0,0 +1,102 @@
+"""Prompt command."""
+
+import shlex
+from typing import Optional
+
+import typer
+
+from agentflow.utils.config import (
+    get_config,
+    get_context_file,
+    get_context_string,
+    read_context_file,
+    write_context_file,
+)
+from agentflow.utils.output import error
+
+app = typer.Typer(help="Print the current context for a shell prompt")
+
+# Prompt hooks per shell. They read the context file directly and only
+# run `agentflow prompt` to create it when it's missing.
+HOOKS = {
+    "bash": """\
+# agentflow context in the prompt; add to ~/.bashrc
+_agentflow_prompt() {{
+    if [ ! -e {context} ] && [ -e {config} ]; then
+        agentflow prompt > /dev/null
+    fi
+    if [ -s {context} ]; then
+        printf '%s ' "$(< {context})"
+    fi
+}}
+PS1='$(_agentflow_prompt)'"$PS1"
+""",
+    "zsh": """\
+# agentflow context in the prompt; add to ~/.zshrc
+setopt prompt_subst
+_agentflow_prompt() {{
+    if [[ ! -e {context} && -e {config} ]]; then
+        agentflow prompt > /dev/null
+    fi
+    if [[ -s {context} ]]; then
+        printf '%s ' "$(< {context})"
+    fi
+}}
+PROMPT='$(_agentflow_prompt)'"$PROMPT"
+""",
+    "fish": """\
+# agentflow context in the prompt; add to ~/.config/fish/config.fish
+functions -c fish_prompt _agentflow_fish_prompt
+function fish_prompt
+    if not test -e {context}; and test -e {config}
+        agentflow prompt > /dev/null
+    end
+    if test -s {context}; and read -l context < {context}
+        printf '%s ' $context
+    end
+    _agentflow_fish_prompt
+end
+""",
+}
+
+
+def hook(shell: str) -> str:
+    """Get the prompt hook of a shell, pointing at the current files.
+
+    Args:
+        shell: "bash", "zsh" or "fish"
+
+    Returns:
+        Shell code to add to the shell's startup file
+    """
+    return HOOKS[shell].format(
+        context=shlex.quote(str(get_context_file())), config=shlex.quote(str(get_config().path))
+    )
+
+
+@app.command()
+def prompt(
+    shell: Optional[str] = typer.Option(
+        None, "--shell", help="Print the prompt hook for bash, zsh or fish instead"
+    ),
+):
+    """Print the current context, like "[org / project]", for a shell prompt.
+
+    The context is read from ~/.agentflow/context, a plain-text copy
+    kept up to date with the config file. It is recreated from the
+    config file when missing or out of date.
+    """
+    if shell is not None:
+        if shell not in HOOKS:
+            error(f"Unknown shell '{shell}'. Use one of: {', '.join(HOOKS)}")
+            raise typer.Exit(1)
+        print(hook(shell), end="")
+        return
+
+    context = read_context_file()
+    if context is None:
+        context = get_context_string()
+        if get_config().path.exists():
+            write_context_file(context)
+    if context:
+        print(context)
@@ -0,0 +1,69 @@
+"""Search command."""
+
+from typing import List, Optional
+
+import typer
+
+from agentflow import storage
+from agentflow.utils.config import get_current_user_email
+from agentflow.utils.output import error, info, is_table_output, print_table, success
+
+app = typer.Typer(help="Search organizations and projects")
+
+
+def check_authenticated() -> str:
+    """Check if user is authenticated.
+
+    Returns:
+        User email if authenticated
+
+    Raises:
+        typer.Exit if not authenticated
+    """
+    email = get_current_user_email()
+    if not email:
+        error("Not authenticated. Run: agentflow auth login")
+        raise typer.Exit(1)
+    return email
+
+
+@app.command()
+def search(
+    terms: Optional[List[str]] = typer.Argument(None, help="Words to look for"),
+    limit: int = typer.Option(20, "--limit", min=1, help="Show at most this many results"),
+    reindex: bool = typer.Option(
+        False, "--reindex", help="Bring the search index in line with the stored data first"
+    ),
+):
+    """Search your organizations and projects.
+
+    Matches names, slugs, descriptions and GitHub URLs. Every word must
+    match; the last one may be the start of a word. Results are ranked
+    by where the words were found (name first, description last).
+    """
+    email = check_authenticated()
+
+    if reindex:
+        changes = storage.reindex()
+        success(f"Search index updated ({changes} changes)")
+    if not terms:
+        if reindex:
+            return
+        error("Nothing to search for. Run: agentflow search <terms>")
+        raise typer.Exit(1)
+
+    results = storage.search(" ".join(terms), email, limit)
+
+    if not results and is_table_output():
+        info(f"No results for '{' '.join(terms)}'")
+        return
+
+    print_table(
+        ["TYPE", "NAME", "SLUG", "ORG", "SCORE"],
+        [[r.kind, r.name, r.slug, r.org or "-", str(r.score)] for r in results],
+        [
+            {"id": r.id, "type": r.kind, "name": r.name, "slug": r.slug, "org": r.org, "score": r.score}
+            for r in results
+        ],
+        name="results",
+    )
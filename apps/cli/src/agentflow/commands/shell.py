@@ -0,0 +1,106 @@
+"""Interactive shell command."""
+
+import shlex
+import sys
+from typing import Optional
+
+import typer
+
+from agentflow import paths
+from agentflow.utils.config import get_context_string
+from agentflow.utils.output import error
+
+app = typer.Typer(help="Run commands interactively in one process")
+
+HISTORY_FILE_NAME = "shell_history"
+EXIT_WORDS = ("exit", "quit")
+
+
+def get_prompt() -> str:
+    """Build the shell prompt from the current context."""
+    context = get_context_string()
+    return f"agentflow {context}> " if context else "agentflow> "
+
+
+def parse_line(line: str) -> Optional[list[str]]:
+    """Split a shell line into command arguments.
+
+    A leading "agentflow" is dropped, so commands can be pasted as-is.
+
+    Args:
+        line: Line typed by the user
+
+    Returns:
+        Arguments, or None if the line can't be parsed
+    """
+    try:
+        args = shlex.split(line, comments=True)
+    except ValueError as e:
+        error(f"Invalid command: {e}")
+        return None
+    if args and args[0] == "agentflow":
+        args = args[1:]
+    return args
+
+
+def setup_history() -> None:
+    """Enable line editing and persistent history, where readline exists."""
+    try:
+        import readline
+    except ImportError:
+        return
+
+    import atexit
+
+    history_file = paths.DATA_DIR / HISTORY_FILE_NAME
+    try:
+        readline.read_history_file(history_file)
+    except OSError:
+        pass
+    atexit.register(_save_history, readline, history_file)
+
+
+def _save_history(readline, history_file) -> None:
+    """Write the shell history, ignoring failures."""
+    try:
+        readline.write_history_file(history_file)
+    except OSError:
+        pass
+
+
+@app.command()
+def shell():
+    """Run commands interactively in one process.
+
+    Commands are typed without the "agentflow" prefix (e.g. "org list").
+    The loaded data and config stay in memory between commands and are
+    only re-read when their files change on disk. Type "exit" or press
+    Ctrl-D to leave.
+    """
+    from agentflow.cli import run_command
+
+    if sys.stdin.isatty():
+        setup_history()
+
+    while True:
+        try:
+            line = input(get_prompt())
+        except EOFError:
+            print()
+            break
+        except KeyboardInterrupt:
+            print()
+            continue
+
+        args = parse_line(line)
+        if not args:
+            continue
+        if args[0] in EXIT_WORDS:
+            break
+        if args[0] == "help":
+            args = [*args[1:], "--help"]
+        if args[0] == "shell":
+            error("Already in the shell")
+            continue
+
+        run_command(args)
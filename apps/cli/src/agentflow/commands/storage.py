@@ -0,0 +1,134 @@
+"""Storage management commands."""
+
+import os
+
+import typer
+from typing import Optional
+
+from agentflow.durability import MODES
+from agentflow.serializers import FORMATS
+from agentflow.storage import (
+    BACKENDS,
+    FORMAT_ENV_VAR,
+    JSONBackend,
+    get_backend,
+    get_backend_name,
+    get_durability,
+    get_format_name,
+    get_sqlite_file,
+)
+from agentflow.utils.config import set_storage_backend, set_storage_durability, set_storage_format
+from agentflow.utils.output import success, error, info
+
+app = typer.Typer(help="Storage management commands")
+
+
+@app.command()
+def migrate(
+    to: str = typer.Option("sqlite", "--to", "-t", help="Target backend: 'json', 'sqlite' or 'sharded'"),
+    source: Optional[str] = typer.Option(
+        None, "--from", "-f", help="Source backend (default: the backend in use)"
+    ),
+    activate: bool = typer.Option(
+        True, "--activate/--no-activate", help="Switch the config to the target backend"
+    ),
+):
+    """Copy all data from one backend into another.
+
+    Migrating from json imports the existing data.json.
+    """
+    source_name = source or get_backend_name()
+    for name in (to, source_name):
+        if name not in BACKENDS:
+            error(f"Unknown backend: {name}")
+            error(f"Use one of: {', '.join(BACKENDS)}")
+            raise typer.Exit(1)
+
+    if source_name == to:
+        error(f"Data is already stored in {to}. Use --from to pick another source")
+        raise typer.Exit(1)
+
+    db = get_backend(source_name).load()
+    get_backend(to).save(db)
+
+    if activate:
+        set_storage_backend(to)
+
+    success(f"Migrated data from {source_name} to {to}")
+    print()
+    info(f"  Users:         {len(db.users)}")
+    info(f"  Organizations: {len(db.organizations)}")
+    info(f"  Projects:      {len(db.projects)}")
+    if activate:
+        print()
+        info(f"Storage backend is now: {to}")
+
+
+@app.command()
+def compact():
+    """Fold pending journal writes into the data file and reclaim space."""
+    backend = get_backend()
+    backend.compact()
+    success(f"Compacted {backend.name} storage")
+
+
+@app.command()
+def convert(
+    fmt: str = typer.Option(..., "--format", "-f", help="Format: 'json' or 'json-compact'"),
+):
+    """Rewrite data.json (or the shard files) in another on-disk format and keep using it."""
+    if fmt not in FORMATS:
+        error(f"Unknown format: {fmt}")
+        error(f"Use one of: {', '.join(FORMATS)}")
+        raise typer.Exit(1)
+
+    override = os.environ.get(FORMAT_ENV_VAR)
+    if override and override != fmt:
+        error(f"{FORMAT_ENV_VAR}={override} overrides --format; unset it to convert to {fmt}")
+        raise typer.Exit(1)
+
+    set_storage_format(fmt)
+    backend = get_backend() if get_backend_name() == "sharded" else JSONBackend()
+    backend.save(backend.load())
+
+    success(f"Data file converted to {get_format_name()}")
+
+
+@app.command()
+def durability(
+    mode: str = typer.Argument(..., help="Mode: 'strict', 'relaxed' or 'batched'"),
+):
+    """Choose how writes are synced to disk.
+
+    strict syncs every write, relaxed leaves it to the OS and batched
+    syncs each file before moving it into place but the directories and
+    journal of a transaction together. A crashed process never leaves a
+    truncated file; strict and batched also hold up to a power loss.
+    """
+    if mode not in MODES:
+        error(f"Unknown durability mode: {mode}")
+        error(f"Use one of: {', '.join(MODES)}")
+        raise typer.Exit(1)
+
+    set_storage_durability(mode)
+    success(f"Durability mode is now: {mode}")
+
+
+@app.command()
+def status():
+    """Show the storage backend in use and its data location."""
+    from agentflow.storage import DATA_FILE
+
+    name = get_backend_name()
+    info(f"Storage backend: {name}")
+    if name == "sqlite":
+        info(f"Data:            {get_sqlite_file()}")
+    elif name == "sharded":
+        from agentflow.sharded_backend import get_shards_dir
+
+        info(f"Data:            {get_shards_dir()}")
+        info(f"Format:          {get_format_name()}")
+    else:
+        info(f"Data:            {DATA_FILE}")
+        info(f"Format:          {get_format_name()}")
+    info(f"Durability:      {get_durability()}")
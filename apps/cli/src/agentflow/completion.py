@@ -0,0 +1,408 @@
+"""Shell completion of organization slugs, project slugs and API key names.
+
+Pressing TAB runs ``agentflow`` with the _AGENTFLOW_COMPLETE variable
+set. A full completion imports typer and the storage layer, which alone
+takes longer than a completion should. So the names are also kept in a
+completion cache: a few tab-separated text files next to the data,
+rewritten when the database is saved and appended to as records are
+added (see storage.transaction). complete_from_cache() answers from it
+with nothing but the standard library, before the CLI is imported:
+
+    completion/users.tsv          user ID, email
+    completion/organizations.tsv  organization ID, owner ID, slug
+    completion/api_keys.tsv       user ID, key name
+    completion/projects/<organization ID>.txt  one project slug per line
+
+When the cache doesn't exist yet, the completion callbacks below take
+over through typer and build it.
+
+This module only imports the standard library at the top, so the fast
+path stays fast.
+"""
+
+import re
+import shlex
+import sys
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+CACHE_DIR_NAME = "completion"
+USERS_FILE = "users.tsv"
+ORGANIZATIONS_FILE = "organizations.tsv"
+API_KEYS_FILE = "api_keys.tsv"
+PROJECTS_DIR = "projects"
+
+# Variable set by the shell completion scripts
+COMPLETE_VAR = "_AGENTFLOW_COMPLETE"
+
+# Commands completed from the cache: (group, command) -> kind of name
+ARGUMENT_KINDS = {
+    ("org", "view"): "organization",
+    ("org", "use"): "organization",
+    ("project", "view"): "project",
+    ("project", "use"): "project",
+}
+OPTION_KINDS = {"--org": "organization", "-o": "organization", "--name": "api_key", "-n": "api_key"}
+
+# Root options that take a value, skipped when reading the command line
+ROOT_VALUE_OPTIONS = ("--output",)
+
+
+def _field(value: str) -> str:
+    """Make a value safe to store in a tab-separated line."""
+    return value.replace("\t", " ").replace("\n", " ")
+
+
+def _line(*values: str) -> str:
+    """Build a cache line."""
+    return "\t".join(_field(value) for value in values) + "\n"
+
+
+def _write(path: Path, lines: Iterable[str]) -> None:
+    """Replace a cache file with new content."""
+    from agentflow import durability
+
+    # Rebuilt from the data if lost, so it needn't be synced
+    durability.write_atomic(path, "".join(lines).encode(), "relaxed")
+
+
+def _append(path: Path, lines: list[str]) -> None:
+    """Add lines to a cache file."""
+    if lines:
+        with open(path, "a") as f:
+            f.write("".join(lines))
+
+
+def _starting_with(path: Path, prefix: str) -> list[str]:
+    """Get the lines of a cache file that start with a prefix.
+
+    Jumps between occurrences with str.find instead of reading every
+    line, so long project lists are searched in a few milliseconds.
+    """
+    try:
+        text = "\n" + path.read_text()
+    except FileNotFoundError:
+        return []
+    if not prefix:
+        return text.split()
+    needle = "\n" + prefix
+    lines = []
+    start = text.find(needle)
+    while start != -1:
+        end = text.find("\n", start + 1)
+        if end == -1:
+            end = len(text)
+        lines.append(text[start + 1 : end])
+        start = text.find(needle, end)
+    return lines
+
+
+def _find(path: Path, pattern: str) -> list[str]:
+    """Find the first group of a line pattern in a cache file."""
+    try:
+        text = path.read_text()
+    except FileNotFoundError:
+        return []
+    return re.findall(pattern, text, re.MULTILINE)
+
+
+def build_cache(cache_dir: Path, users: Iterable, organizations: Iterable, projects: Iterable) -> None:
+    """Write the whole completion cache.
+
+    Args:
+        cache_dir: Cache directory
+        users: All users
+        organizations: All organizations
+        projects: All projects
+    """
+    projects_dir = cache_dir / PROJECTS_DIR
+    projects_dir.mkdir(parents=True, exist_ok=True)
+
+    users = list(users)
+    _write(
+        cache_dir / API_KEYS_FILE,
+        (_line(user.id, key.name) for user in users for key in user.api_keys),
+    )
+    _write(
+        cache_dir / ORGANIZATIONS_FILE,
+        (_line(org.id, org.owner_id, org.slug) for org in organizations),
+    )
+
+    slugs: dict[str, list[str]] = {}
+    for project in projects:
+        slugs.setdefault(project.organization_id, []).append(_line(project.slug))
+    for organization_id, lines in slugs.items():
+        _write(projects_dir / f"{organization_id}.txt", lines)
+    for path in projects_dir.glob("*.txt"):
+        if path.stem not in slugs:
+            path.unlink()
+
+    # Written last: its presence marks the cache as complete
+    _write(cache_dir / USERS_FILE, (_line(user.id, user.email) for user in users))
+
+
+def update_cache(cache_dir: Path, changes: list) -> None:
+    """Add written records to the completion cache.
+
+    Args:
+        cache_dir: Cache directory
+        changes: Added users, organizations and projects, (user ID,
+            API key) pairs and saved Databases, in write order
+    """
+    from agentflow.models import Database, Organization, Project, User
+
+    lines: dict[Path, list[str]] = {}
+    for change in changes:
+        if isinstance(change, Database):
+            build_cache(cache_dir, change.users, change.organizations, change.projects)
+            lines = {}
+        elif isinstance(change, User):
+            lines.setdefault(cache_dir / USERS_FILE, []).append(_line(change.id, change.email))
+            for key in change.api_keys:
+                lines.setdefault(cache_dir / API_KEYS_FILE, []).append(_line(change.id, key.name))
+        elif isinstance(change, Organization):
+            lines.setdefault(cache_dir / ORGANIZATIONS_FILE, []).append(
+                _line(change.id, change.owner_id, change.slug)
+            )
+        elif isinstance(change, Project):
+            path = cache_dir / PROJECTS_DIR / f"{change.organization_id}.txt"
+            lines.setdefault(path, []).append(_line(change.slug))
+        else:
+            user_id, api_key = change
+            lines.setdefault(cache_dir / API_KEYS_FILE, []).append(_line(user_id, api_key.name))
+
+    (cache_dir / PROJECTS_DIR).mkdir(parents=True, exist_ok=True)
+    for path, new_lines in lines.items():
+        _append(path, new_lines)
+
+
+def cached_names(
+    cache_dir: Path,
+    kind: str,
+    incomplete: str,
+    email: Optional[str],
+    org_slug: Optional[str] = None,
+) -> Optional[list[str]]:
+    """Get the cached names starting with the typed text.
+
+    Args:
+        cache_dir: Cache directory
+        kind: "organization", "project" or "api_key"
+        incomplete: Text typed so far
+        email: Current user's email (organizations and API keys are the user's own)
+        org_slug: Organization of the projects
+
+    Returns:
+        Sorted names, or None if the cache doesn't exist
+    """
+    if not (cache_dir / USERS_FILE).exists():
+        return None
+
+    prefix = re.escape(incomplete)
+    if kind == "project":
+        pattern = rf"^([^\t]*)\t[^\t]*\t{re.escape(org_slug or '')}$"
+        names = []
+        for org_id in _find(cache_dir / ORGANIZATIONS_FILE, pattern)[:1]:
+            names = _starting_with(cache_dir / PROJECTS_DIR / f"{org_id}.txt", incomplete)
+    else:
+        names = []
+        for user_id in _find(cache_dir / USERS_FILE, rf"^([^\t]*)\t{re.escape(email or '')}$"):
+            if kind == "api_key":
+                pattern = rf"^{re.escape(user_id)}\t({prefix}.*)$"
+                names += _find(cache_dir / API_KEYS_FILE, pattern)
+            else:
+                pattern = rf"^[^\t]*\t{re.escape(user_id)}\t({prefix}.*)$"
+                names += _find(cache_dir / ORGANIZATIONS_FILE, pattern)
+
+    return sorted(set(names))
+
+
+def read_context(config_file: Path) -> dict[str, str]:
+    """Read the top-level "key: value" lines of the config file, without yaml.
+
+    Enough for the plain values the CLI writes (emails, slugs).
+    """
+    values = {}
+    try:
+        text = config_file.read_text()
+    except FileNotFoundError:
+        return values
+    for line in text.splitlines():
+        key, sep, value = line.partition(": ")
+        if sep and not line.startswith((" ", "-", "#")):
+            values[key] = value.strip().strip("'\"")
+    return values
+
+
+def completion_args(environ: dict) -> Optional[tuple[list[str], str]]:
+    """Get the words before the cursor and the word being typed.
+
+    Follows the variables set by the bash, zsh and fish completion
+    scripts of typer.
+
+    Returns:
+        Tuple of (arguments, incomplete word), or None if unsupported
+    """
+    shell = environ.get(COMPLETE_VAR)
+    try:
+        if shell == "complete_bash":
+            words = shlex.split(environ["COMP_WORDS"])
+            cword = int(environ["COMP_CWORD"])
+            return words[1:cword], words[cword] if cword < len(words) else ""
+        if shell in ("complete_zsh", "complete_fish"):
+            line = environ.get("_TYPER_COMPLETE_ARGS", "")
+            args = shlex.split(line)[1:]
+            if args and not line.endswith(" "):
+                return args[:-1], args[-1]
+            return args, ""
+    except (KeyError, ValueError):
+        return None
+    return None
+
+
+def completion_target(args: list[str]) -> Optional[tuple[str, Optional[str]]]:
+    """Find which kind of name is being typed.
+
+    Args:
+        args: Words before the one being typed (without the program name)
+
+    Returns:
+        Tuple of (kind, --org value), or None if not completed from the cache
+    """
+    words = []
+    org = None
+    skip = False
+    for i, arg in enumerate(args):
+        if skip:
+            skip = False
+        elif arg in ROOT_VALUE_OPTIONS and not words:
+            skip = True
+        elif arg in ("--org", "-o") and i + 1 < len(args):
+            org = args[i + 1]
+            skip = True
+        elif not arg.startswith("-"):
+            words.append(arg)
+
+    if args and args[-1] in OPTION_KINDS:
+        kind = OPTION_KINDS[args[-1]]
+        if kind == "api_key" and words[:2] != ["auth", "api-keys"]:
+            return None
+        return kind, org
+    if len(words) == 2 and tuple(words) in ARGUMENT_KINDS:
+        return ARGUMENT_KINDS[tuple(words)], org
+    return None
+
+
+def _zsh_escape(value: str) -> str:
+    """Escape a candidate like typer does for zsh."""
+    return (
+        value.replace('"', '""')
+        .replace("'", "''")
+        .replace("$", "\\$")
+        .replace("`", "\\`")
+        .replace(":", r"\\:")
+    )
+
+
+def format_candidates(shell: str, names: list[str]) -> str:
+    """Format candidates the way typer's completion scripts read them."""
+    if shell == "complete_zsh":
+        if not names:
+            return "_files"
+        quoted = "\n".join(f'"{_zsh_escape(name)}"' for name in names)
+        return f"_arguments '*: :(({quoted}))'"
+    return "\n".join(names)
+
+
+def complete_from_cache(
+    environ: dict, data_dir: Optional[Path] = None, config_file: Optional[Path] = None
+) -> Optional[int]:
+    """Answer a completion request from the cache, if it can.
+
+    Args:
+        environ: Environment of the completion request
+        data_dir: Data directory (defaults to ~/.agentflow)
+        config_file: Config file (defaults to ~/.agentflow/config.yaml)
+
+    Returns:
+        Exit status once the candidates are printed, or None to run the
+        full completion
+    """
+    from agentflow import paths
+    from agentflow.utils.config import CONFIG_FILE
+
+    parsed = completion_args(environ)
+    if parsed is None:
+        return None
+    args, incomplete = parsed
+    target = completion_target(args)
+    if target is None or incomplete.startswith("-"):
+        return None
+
+    context = read_context(config_file or CONFIG_FILE)
+    kind, org = target
+    names = cached_names(
+        (data_dir or paths.DATA_DIR) / CACHE_DIR_NAME,
+        kind,
+        incomplete,
+        context.get("current_user_email"),
+        org or context.get("current_organization"),
+    )
+    if names is None or (not names and incomplete and kind != "api_key"):
+        # No cache yet, or no slug starting with the text: the full
+        # completion builds the cache or offers the closest slugs
+        return None
+
+    shell = environ[COMPLETE_VAR]
+    if shell == "complete_fish" and environ.get("_TYPER_COMPLETE_FISH_ACTION") == "is-args":
+        return 0 if names else 1
+    sys.stdout.write(format_candidates(shell, names) + "\n")
+    return 0
+
+
+def _complete(kind: str, incomplete: str, org_slug: Optional[str] = None) -> list[str]:
+    """Complete a name from the cache, building the cache if missing.
+
+    When no organization or project slug starts with the typed text, the
+    closest slugs from the search index are offered instead.
+    """
+    from agentflow import storage
+    from agentflow.utils.config import get_current_user_email
+
+    email = get_current_user_email()
+    names = cached_names(storage.ensure_completion_cache(), kind, incomplete, email, org_slug)
+    if not names and incomplete and kind == "organization":
+        return storage.complete_slugs(kind, incomplete, owner_email=email)
+    if not names and incomplete and kind == "project":
+        return storage.complete_slugs(kind, incomplete, org_slug=org_slug)
+    return names or []
+
+
+def complete_org_slug(incomplete: str) -> List[str]:
+    """Complete the slug of one of the current user's organizations."""
+    try:
+        return _complete("organization", incomplete)
+    except Exception:
+        return []
+
+
+def complete_project_slug(ctx, incomplete: str) -> List[str]:
+    """Complete the slug of a project in the --org or current organization.
+
+    ctx is the typer.Context, left unannotated to keep typer unimported.
+    """
+    from agentflow.utils.config import get_current_organization
+
+    try:
+        org_slug = ctx.params.get("org") or get_current_organization()
+        return _complete("project", incomplete, org_slug) if org_slug else []
+    except Exception:
+        return []
+
+
+def complete_api_key_name(incomplete: str) -> List[str]:
+    """Complete the name of one of the current user's API keys."""
+    try:
+        return _complete("api_key", incomplete)
+    except Exception:
+        return []
@@ -0,0 +1,321 @@
+"""Resident daemon serving CLI commands over a Unix socket.
+
+``agentflow daemon start`` runs a process that keeps the imported
+command modules, the parsed config and the loaded Database in memory and
+listens on ``~/.agentflow/daemon.sock``. The ``agentflow`` entry point
+forwards each command to it when it is running, before importing the
+CLI, and runs the command itself otherwise, so the daemon is purely an
+optimization.
+
+The client passes its stdin, stdout and stderr file descriptors along
+with the request (SCM_RIGHTS), so commands read and write the caller's
+terminal or pipes directly. The request also carries the arguments, the
+working directory and the environment variables that affect commands;
+the response is the exit code. Requests are served one at a time, and
+the caches revalidate against the files on every command, so writes
+made without the daemon are picked up.
+
+Set ``AGENTFLOW_DAEMON=off`` to bypass a running daemon.
+
+This module only imports the standard library at the top, so forwarding
+adds little to the client's startup.
+"""
+
+import json
+import os
+import socket
+import struct
+import sys
+from pathlib import Path
+from typing import Optional
+
+from agentflow import paths
+
+SOCKET_NAME = "daemon.sock"
+DAEMON_ENV_VAR = "AGENTFLOW_DAEMON"
+
+# Environment variables sent with each command
+FORWARDED_ENV = ("COLUMNS", "LINES", "TERM", "NO_COLOR", "FORCE_COLOR")
+FORWARDED_ENV_PREFIX = "AGENTFLOW_"
+
+# Upper bound on a request or response line
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+# Commands always run in the invoking process, never forwarded to the daemon
+LOCAL_COMMANDS = ("daemon", "shell", "prompt")
+
+
+def get_socket_path() -> Path:
+    """Get the path of the daemon's socket."""
+    return paths.DATA_DIR / SOCKET_NAME
+
+
+def is_supported() -> bool:
+    """Check if the platform supports the daemon (Unix sockets with fd passing)."""
+    return hasattr(socket, "AF_UNIX") and hasattr(socket, "send_fds")
+
+
+def _forwarded_env(environ: dict) -> dict:
+    """Select the environment variables forwarded with a command."""
+    return {
+        key: value
+        for key, value in environ.items()
+        if key.startswith(FORWARDED_ENV_PREFIX) or key in FORWARDED_ENV
+    }
+
+
+def _connect(path: Path) -> Optional[socket.socket]:
+    """Connect to the daemon, or return None if it isn't running."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _send(sock: socket.socket, message: dict, fds: list[int] = ()) -> None:
+    """Send a message as one JSON line, with file descriptors attached."""
+    data = json.dumps(message).encode() + b"\n"
+    sent = socket.send_fds(sock, [data], list(fds)) if fds else 0
+    if sent < len(data):
+        # The peer may already have answered and closed once it has it all
+        sock.sendall(data[sent:])
+
+
+def _receive(sock: socket.socket, maxfds: int = 0) -> tuple[Optional[dict], list[int]]:
+    """Receive a JSON line and any file descriptors sent with it.
+
+    Returns:
+        Tuple of (message, or None if the peer closed first, file descriptors)
+    """
+    data = b""
+    fds: list[int] = []
+    while not data.endswith(b"\n"):
+        if maxfds and not fds:
+            chunk, received, _, _ = socket.recv_fds(sock, 65536, maxfds)
+            fds.extend(received)
+        else:
+            chunk = sock.recv(65536)
+        if not chunk:
+            return None, fds
+        data += chunk
+        if len(data) > MAX_MESSAGE_BYTES:
+            raise ValueError("Daemon message too large")
+    return json.loads(data), fds
+
+
+def request(message: dict, path: Optional[Path] = None) -> Optional[dict]:
+    """Send a control request to the daemon.
+
+    Args:
+        message: Request, e.g. {"op": "ping"}
+        path: Socket path (default: get_socket_path())
+
+    Returns:
+        Response, or None if the daemon isn't running
+    """
+    if not is_supported():
+        return None
+    sock = _connect(path or get_socket_path())
+    if sock is None:
+        return None
+    with sock:
+        _send(sock, message)
+        return _receive(sock)[0]
+
+
+def forward(
+    args: list[str], path: Optional[Path] = None, streams: tuple[int, int, int] = (0, 1, 2)
+) -> Optional[int]:
+    """Run a CLI command in the daemon, if one is running.
+
+    Args:
+        args: Command-line arguments (without the program name)
+        path: Socket path (default: get_socket_path())
+        streams: File descriptors to use as the command's stdin, stdout and stderr
+
+    Returns:
+        Exit code of the command, or None if it should run locally
+    """
+    if os.environ.get(DAEMON_ENV_VAR) == "off" or not is_supported():
+        return None
+    sock = _connect(path or get_socket_path())
+    if sock is None:
+        return None
+
+    with sock:
+        message = {
+            "op": "run",
+            "args": args,
+            "cwd": os.getcwd(),
+            "env": _forwarded_env(dict(os.environ)),
+        }
+        try:
+            _send(sock, message, streams)
+        except OSError:
+            # Nothing ran yet (e.g. a closed stdin can't be passed)
+            return None
+
+        response, _ = _receive(sock)
+        if response is None:
+            print("agentflow: lost connection to the daemon", file=sys.stderr)
+            return 1
+        return response["exit_code"]
+
+
+def command_name(argv: list[str]) -> Optional[str]:
+    """Get the command group an argument list runs, skipping root options.
+
+    Args:
+        argv: Command-line arguments (without the program name)
+
+    Returns:
+        First argument that isn't a root option or its value, or None
+    """
+    from agentflow.completion import ROOT_VALUE_OPTIONS
+
+    args = iter(argv)
+    for arg in args:
+        if arg in ROOT_VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def forward_command(args: list[str]) -> Optional[int]:
+    """Run a CLI command in the daemon, unless it must run locally.
+
+    Args:
+        args: Command-line arguments (without the program name)
+
+    Returns:
+        Exit code of the command, or None if it should run locally
+    """
+    if command_name(args) in LOCAL_COMMANDS:
+        return None
+    return forward(args)
+
+
+class Daemon:
+    """Server running CLI commands in a long-lived process."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or get_socket_path()
+        self.running = False
+
+    def warm_up(self) -> None:
+        """Import every command group and load the config and Database."""
+        import importlib
+
+        from agentflow import storage
+        from agentflow.cli import COMMAND_GROUPS
+        from agentflow.utils.config import load_config
+
+        for module, _ in COMMAND_GROUPS.values():
+            importlib.import_module(module)
+        load_config()
+        try:
+            storage.load_database()
+        except Exception:
+            # Commands report storage errors themselves
+            pass
+
+    def serve(self) -> None:
+        """Listen on the socket and serve requests until stopped."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            if request({"op": "ping"}, self.path) is not None:
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+            self.path.unlink()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(str(self.path))
+            os.chmod(self.path, 0o600)
+            server.listen()
+            self.running = True
+            while self.running:
+                conn, _ = server.accept()
+                with conn:
+                    self.handle(conn)
+        finally:
+            server.close()
+            self.path.unlink(missing_ok=True)
+
+    def _same_user(self, conn: socket.socket) -> bool:
+        """Check that the peer runs as the daemon's user, where the OS tells."""
+        if not hasattr(socket, "SO_PEERCRED"):
+            return True
+        ucred = struct.Struct("3i")
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, ucred.size)
+        return ucred.unpack(creds)[1] == os.getuid()
+
+    def handle(self, conn: socket.socket) -> None:
+        """Serve one request."""
+        fds: list[int] = []
+        try:
+            if not self._same_user(conn):
+                return
+            message, fds = _receive(conn, maxfds=3)
+            if message is None:
+                return
+
+            op = message.get("op")
+            if op == "ping":
+                _send(conn, {"pid": os.getpid()})
+            elif op == "stop":
+                self.running = False
+                _send(conn, {"pid": os.getpid()})
+            elif op == "run" and len(fds) == 3:
+                code = self.run(message, fds)
+                fds = []
+                _send(conn, {"exit_code": code})
+        except (OSError, ValueError):
+            # Client went away or sent garbage; keep serving others
+            pass
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def run(self, message: dict, fds: list[int]) -> int:
+        """Run a CLI command on the client's streams.
+
+        Args:
+            message: "run" request (args, cwd, env)
+            fds: Client's stdin, stdout and stderr (closed on return)
+
+        Returns:
+            Exit code
+        """
+        from agentflow.cli import run_command
+        from agentflow.utils import output
+
+        saved_streams = (sys.stdin, sys.stdout, sys.stderr)
+        saved_env = dict(os.environ)
+        saved_cwd = os.getcwd()
+
+        sys.stdin = open(fds[0], "r", closefd=True)
+        sys.stdout = open(fds[1], "w", closefd=True)
+        sys.stderr = open(fds[2], "w", closefd=True)
+        for key in _forwarded_env(saved_env):
+            del os.environ[key]
+        os.environ.update(message.get("env", {}))
+
+        try:
+            os.chdir(message.get("cwd", saved_cwd))
+            output.reset_console()
+            return run_command(message.get("args", []))
+        finally:
+            for stream in (sys.stdin, sys.stdout, sys.stderr):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+            sys.stdin, sys.stdout, sys.stderr = saved_streams
+            os.environ.clear()
+            os.environ.update(saved_env)
+            os.chdir(saved_cwd)
+            output.reset_console()
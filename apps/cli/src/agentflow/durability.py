@@ -0,0 +1,145 @@
+"""Atomic file writes with a selectable durability mode.
+
+Files are written to a temporary file next to them and moved into place
+with os.replace, so a concurrent reader, or a process that crashed
+mid-write, sees either the old or the new content, never a truncated
+file. The durability mode decides when the data is forced to disk, which
+is what protects it from a power loss or an OS crash:
+
+- ``strict``: every write fsyncs the file before the rename and its
+  directory after it. A completed write survives a power loss.
+- ``relaxed``: nothing is fsynced; the OS writes the data back when it
+  sees fit. On a power loss the last writes may be lost, and a file
+  renamed just before may even be left empty.
+- ``batched``: group commit within one storage transaction. Each file is
+  still fsynced before its rename, so it is never left truncated, but
+  the directories holding the new names and the files appended in place
+  (the journal) are fsynced once, together, when the group_commit()
+  block exits. A power loss before then may lose the transaction, whose
+  files keep their old content. Outside a block a write is synced like
+  in strict mode.
+
+The mode is selected with the AGENTFLOW_DURABILITY environment variable
+or the ``storage_durability`` config key, and defaults to strict.
+
+Only the standard library is imported, so the config module can use it.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+MODES = ("strict", "relaxed", "batched")
+DEFAULT_MODE = "strict"
+ENV_VAR = "AGENTFLOW_DURABILITY"
+
+# SQLite's equivalent of each mode (see the synchronous pragma)
+SQLITE_SYNCHRONOUS = {"strict": "FULL", "relaxed": "OFF", "batched": "NORMAL"}
+
+# Files and directories to fsync when the open group commit ends, or
+# None outside a group commit
+_pending: Optional[dict[Path, bool]] = None
+
+
+def get_mode(configured: Optional[str] = None) -> str:
+    """Get the durability mode.
+
+    Args:
+        configured: Mode from the config file, if any
+
+    Returns:
+        AGENTFLOW_DURABILITY if set, else the configured mode, else strict
+
+    Raises:
+        ValueError: If the selected mode is unknown
+    """
+    mode = os.environ.get(ENV_VAR) or configured or DEFAULT_MODE
+    if mode not in MODES:
+        raise ValueError(
+            f"Unknown durability mode '{mode}' (expected one of: {', '.join(MODES)})"
+        )
+    return mode
+
+
+def _fsync(path: Path, directory: bool = False) -> None:
+    """Force a file, or a directory's entries, to disk."""
+    fd = os.open(path, os.O_RDONLY | (os.O_DIRECTORY if directory else 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def sync(path: Path, mode: str, directory: bool = False) -> None:
+    """Make a file written in place (such as an appended journal) durable.
+
+    Args:
+        path: File path
+        mode: Durability mode
+        directory: Also sync the parent directory, for a new file
+    """
+    if mode == "relaxed":
+        return
+    if mode == "batched" and _pending is not None:
+        _pending[path] = _pending.get(path, False)
+        if directory:
+            _pending[path.parent] = True
+        return
+    _fsync(path)
+    if directory:
+        _fsync(path.parent, directory=True)
+
+
+def write_atomic(path: Path, data: bytes, mode: str) -> None:
+    """Replace a file's content atomically.
+
+    Args:
+        path: File path
+        data: New content
+        mode: Durability mode
+    """
+    temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp, "wb") as f:
+            f.write(data)
+            if mode != "relaxed":
+                # Even when batched: the new name must never point at unsynced data
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+    if mode == "batched" and _pending is not None:
+        _pending[path.parent] = True
+    elif mode != "relaxed":
+        _fsync(path.parent, directory=True)
+
+
+@contextmanager
+def group_commit() -> Iterator[None]:
+    """Sync the batched writes of a block together when it exits.
+
+    Each directory that got a new file name and each file appended in
+    place (see sync()) in the block is fsynced once. Nested blocks join
+    the outermost one. Writes in strict or relaxed mode are not affected.
+    """
+    global _pending
+
+    if _pending is not None:
+        yield
+        return
+
+    _pending = {}
+    try:
+        yield
+    finally:
+        pending, _pending = _pending, None
+        # Files first, then the directories holding their new names
+        for path, directory in sorted(pending.items(), key=lambda item: item[1]):
+            try:
+                _fsync(path, directory)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,234 @@
+"""In-memory hash indexes over a loaded Database."""
+
+from bisect import bisect_right, insort
+from datetime import datetime, UTC
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional
+
+from agentflow.models import ProjectCounts
+
+if TYPE_CHECKING:
+    from agentflow.models import Database, User, Organization, Project
+
+
+def timestamp_key(value: datetime) -> str:
+    """Format a timestamp as fixed-width UTC text, so text order is time order.
+
+    Naive datetimes are taken as UTC. The SQLite backend stores
+    timestamps in this form too.
+
+    Args:
+        value: Timestamp
+
+    Returns:
+        Text like "2025-01-01T00:00:00.000000+00:00"
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+# Sort keys of the ordered indexes, for organizations and projects alike.
+# The record ID comes last so that keys are unique and ties are stable.
+SORT_KEYS: dict[str, Callable[[Any], tuple]] = {
+    "created_at": lambda record: (timestamp_key(record.created_at), record.id),
+    "name": lambda record: (record.name, record.id),
+    "slug": lambda record: (record.slug, record.id),
+}
+
+
+class Filter(NamedTuple):
+    """Conditions on listed organizations or projects.
+
+    Fields left as None don't filter. is_active and has_github only
+    apply to projects.
+    """
+
+    is_active: Optional[bool] = None
+    has_github: Optional[bool] = None
+    name_contains: Optional[str] = None
+    created_after: Optional[datetime] = None
+
+    def matches(self, record) -> bool:
+        """Check whether a record passes every condition."""
+        if self.is_active is not None and record.is_active != self.is_active:
+            return False
+        if self.has_github is not None and bool(record.github_url) != self.has_github:
+            return False
+        if self.name_contains is not None and self.name_contains.lower() not in record.name.lower():
+            return False
+        if self.created_after is not None and record.created_at <= self.created_after:
+            return False
+        return True
+
+
+class DatabaseIndex:
+    """Hash maps for the lookups done by the storage layer.
+
+    Built once from a Database and kept up to date by the Database
+    mutation helpers (``add_user``, ``add_organization``, ``add_project``).
+    Lists keep the insertion order of the underlying collections. Project
+    counts per organization are kept as aggregates, so counting never
+    scans the projects; replaced records go through a rebuild.
+    """
+
+    def __init__(self, db: "Database"):
+        self.users_by_email: dict[str, "User"] = {}
+        self.users_by_id: dict[str, "User"] = {}
+        self.organizations_by_slug: dict[str, "Organization"] = {}
+        self.organizations_by_id: dict[str, "Organization"] = {}
+        self.organizations_by_owner: dict[str, list["Organization"]] = {}
+        self.projects_by_slug: dict[tuple[str, str], "Project"] = {}
+        self.projects_by_id: dict[str, "Project"] = {}
+        self.projects_by_organization: dict[str, list["Project"]] = {}
+        # Organization ID -> [active, inactive] project counts
+        self.project_counts: dict[str, list[int]] = {}
+        # (collection, owner or organization ID, order) -> sorted keys, built on first use
+        self.ordered: dict[tuple[str, str, str], list[tuple]] = {}
+        self._sizes = [0, 0, 0]
+
+        for user in db.users:
+            self.add_user(user)
+        for org in db.organizations:
+            self.add_organization(org)
+        for project in db.projects:
+            self.add_project(project)
+
+    def matches(self, db: "Database") -> bool:
+        """Check that the index still covers every record of the database.
+
+        Catches records appended to (or removed from) the collections
+        directly instead of through the Database helpers.
+        """
+        return self._sizes == [len(db.users), len(db.organizations), len(db.projects)]
+
+    def add_user(self, user: "User") -> None:
+        """Index a user."""
+        self.users_by_email.setdefault(user.email, user)
+        self.users_by_id[user.id] = user
+        self._sizes[0] += 1
+
+    def add_organization(self, org: "Organization") -> None:
+        """Index an organization."""
+        self.organizations_by_slug.setdefault(org.slug, org)
+        self.organizations_by_id[org.id] = org
+        self.organizations_by_owner.setdefault(org.owner_id, []).append(org)
+        self._insert_ordered("organizations", org.owner_id, org)
+        self._sizes[1] += 1
+
+    def add_project(self, project: "Project") -> None:
+        """Index a project."""
+        self.projects_by_slug.setdefault(
+            (project.organization_id, project.slug), project
+        )
+        self.projects_by_id[project.id] = project
+        self.projects_by_organization.setdefault(
+            project.organization_id, []
+        ).append(project)
+        counts = self.project_counts.setdefault(project.organization_id, [0, 0])
+        counts[0 if project.is_active else 1] += 1
+        self._insert_ordered("projects", project.organization_id, project)
+        self._sizes[2] += 1
+
+    def _insert_ordered(self, collection: str, group_id: str, record) -> None:
+        """Insert a record into the ordered indexes already built for its group."""
+        for order, sort_key in SORT_KEYS.items():
+            keys = self.ordered.get((collection, group_id, order))
+            if keys is None:
+                continue
+            key = sort_key(record)
+            if not keys or key > keys[-1]:
+                keys.append(key)
+            else:
+                insort(keys, key)
+
+    def user_by_email(self, email: str) -> Optional["User"]:
+        """Get user by email."""
+        return self.users_by_email.get(email)
+
+    def organization_by_slug(self, slug: str) -> Optional["Organization"]:
+        """Get organization by slug."""
+        return self.organizations_by_slug.get(slug)
+
+    def project_by_slug(self, organization_id: str, slug: str) -> Optional["Project"]:
+        """Get project by slug within organization."""
+        return self.projects_by_slug.get((organization_id, slug))
+
+    def projects_in_organization(self, organization_id: str) -> list["Project"]:
+        """Get projects of an organization, in insertion order."""
+        return list(self.projects_by_organization.get(organization_id, []))
+
+    def count_projects(self, organization_id: str) -> ProjectCounts:
+        """Get the number of active and inactive projects of an organization."""
+        return ProjectCounts(*self.project_counts.get(organization_id, (0, 0)))
+
+    def organizations_owned_by(self, owner_id: str) -> list["Organization"]:
+        """Get organizations owned by a user, in insertion order."""
+        return list(self.organizations_by_owner.get(owner_id, []))
+
+    def _ordered_keys(self, collection: str, group_id: str, order: str) -> list[tuple]:
+        """Get the sorted keys of a group, building them on first use."""
+        keys = self.ordered.get((collection, group_id, order))
+        if keys is None:
+            if collection == "projects":
+                records = self.projects_by_organization.get(group_id, [])
+            else:
+                records = self.organizations_by_owner.get(group_id, [])
+            sort_key = SORT_KEYS[order]
+            keys = self.ordered[(collection, group_id, order)] = sorted(sort_key(r) for r in records)
+        return keys
+
+    def page(
+        self,
+        collection: str,
+        group_id: str,
+        order: str,
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        where: Optional[Filter] = None,
+    ) -> tuple[list, Optional[tuple]]:
+        """Get one page of an organization's projects or an owner's organizations.
+
+        Records are read in sort key order from where the page starts, so
+        a page without filter costs about its size. With a created_after
+        filter in created_at order, the older records are skipped by
+        binary search instead of being tested.
+
+        Args:
+            collection: "projects" (grouped by organization) or
+                "organizations" (grouped by owner)
+            group_id: Organization or owner ID
+            order: Key of SORT_KEYS
+            after: Sort key of the last record of the previous page
+            limit: Maximum number of records (all if None)
+            where: Conditions the records must match
+
+        Returns:
+            Tuple of (records, sort key of the last record if more follow)
+        """
+        keys = self._ordered_keys(collection, group_id, order)
+        start = bisect_right(keys, after) if after is not None else 0
+        by_id = self.projects_by_id if collection == "projects" else self.organizations_by_id
+
+        if where is None or where == Filter():
+            end = len(keys) if limit is None else min(start + limit, len(keys))
+            records = [by_id[key[-1]] for key in keys[start:end]]
+            next_key = keys[end - 1] if end < len(keys) and end > start else None
+            return records, next_key
+
+        if where.created_after is not None and order == "created_at":
+            # Past every key of that instant: IDs sort before U+FFFF
+            bound = (timestamp_key(where.created_after), "\uffff")
+            start = max(start, bisect_right(keys, bound))
+
+        records = []
+        last_key = None
+        for i in range(start, len(keys)):
+            key = keys[i]
+            record = by_id[key[-1]]
+            if not where.matches(record):
+                continue
+            if limit is not None and len(records) == limit:
+                return records, last_key
+            records.append(record)
+            last_key = key
+        return records, None
@@ -0,0 +1,159 @@
+"""Append-only journal of database mutations.
+
+The JSON backend appends one line per mutation next to the data.json
+snapshot instead of rewriting the whole file. Reads replay the journal
+onto the snapshot and compaction folds it back in.
+
+Each line is a JSON object::
+
+    {"op": "insert", "collection": "projects", "record": {...}}
+    {"op": "insert", "collection": "api_keys", "user_id": "...", "record": {...}}
+    {"op": "update", "collection": "organizations", "record": {...}}
+    {"op": "delete", "collection": "projects", "id": "..."}
+    {"op": "batch", "entries": [...]}
+
+A batch holds every entry of one transaction on a single line. The
+line of a transaction also carries the database version it committed
+(``"version": 7``), which replaying sets on the database.
+
+Replaying is idempotent (inserts and updates upsert by id, deleting a
+missing record is a no-op), so a crash between writing a snapshot and
+removing the journal is harmless.
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+from agentflow.models import Database, User, APIKey, Organization, Project
+
+OPS = ("insert", "update", "delete")
+MODELS: dict[str, type[BaseModel]] = {
+    "users": User,
+    "api_keys": APIKey,
+    "organizations": Organization,
+    "projects": Project,
+}
+
+
+def make_entry(
+    op: str, collection: str, record: Optional[BaseModel] = None, **fields: str
+) -> dict:
+    """Build a journal entry.
+
+    Args:
+        op: "insert", "update" or "delete"
+        collection: Collection name (see MODELS)
+        record: Record for inserts and updates
+        **fields: Extra fields ("id" for deletes, "user_id" for API keys)
+
+    Returns:
+        Journal entry dictionary
+    """
+    if op not in OPS:
+        raise ValueError(f"Unknown journal op: {op}")
+    if collection not in MODELS:
+        raise ValueError(f"Unknown journal collection: {collection}")
+
+    entry = {"op": op, "collection": collection, **fields}
+    if record is not None:
+        entry["record"] = record.model_dump(mode="json")
+    return entry
+
+
+def apply_entry(db: Database, entry: dict) -> None:
+    """Apply a journal entry to a database in place.
+
+    Args:
+        db: Database to mutate
+        entry: Journal entry
+    """
+    if "version" in entry:
+        db.version = entry["version"]
+    op = entry["op"]
+    if op == "batch":
+        for item in entry["entries"]:
+            apply_entry(db, item)
+        return
+
+    collection = entry["collection"]
+
+    if collection == "api_keys":
+        user = db.index.users_by_id.get(entry["user_id"])
+        if user is None:
+            return
+        if op == "delete":
+            user.api_keys[:] = [k for k in user.api_keys if k.id != entry["id"]]
+            return
+        api_key = APIKey.model_validate(entry["record"])
+        for i, existing in enumerate(user.api_keys):
+            if existing.id == api_key.id:
+                user.api_keys[i] = api_key
+                return
+        user.api_keys.append(api_key)
+        return
+
+    if op == "delete":
+        db.remove_record(collection, entry["id"])
+    else:
+        db.upsert_record(collection, MODELS[collection].model_validate(entry["record"]))
+
+
+def append_entries(
+    path: Path, entries: list[dict], version: Optional[int] = None
+) -> tuple[int, int]:
+    """Append entries to a journal file as a single line.
+
+    Several entries are wrapped in one "batch" entry, so a write that is
+    cut short never leaves part of a transaction behind.
+
+    Args:
+        path: Journal file path
+        entries: Journal entries to append
+        version: Database version the entries commit
+
+    Returns:
+        Tuple of (offset the line starts at, offset just past it)
+    """
+    entry = entries[0] if len(entries) == 1 else {"op": "batch", "entries": entries}
+    if version is not None:
+        entry = {**entry, "version": version}
+    data = (json.dumps(entry) + "\n").encode()
+    with open(path, "a+b") as f:
+        start = f.tell()
+        # Terminate a line left unfinished by an interrupted write
+        if start > 0:
+            f.seek(-1, 2)
+            if f.read(1) != b"\n":
+                data = b"\n" + data
+        f.write(data)
+        return start, start + len(data)
+
+
+def read_entries(path: Path, offset: int = 0) -> tuple[list[dict], int]:
+    """Read complete journal entries starting at a byte offset.
+
+    A trailing line without a newline (a write that was cut short) is
+    left for a later read, and lines that don't parse are skipped.
+
+    Args:
+        path: Journal file path
+        offset: Byte offset to start reading at
+
+    Returns:
+        Tuple of (entries, offset just past the last complete line)
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+
+    end = data.rfind(b"\n") + 1
+    entries = []
+    for line in data[:end].splitlines():
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            continue
+    return entries, offset + end
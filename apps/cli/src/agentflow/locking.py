@@ -0,0 +1,115 @@
+"""Reader/writer locking between agentflow processes.
+
+Several agentflow processes may use the same data directory at once
+(CI jobs, the daemon, a shell). The JSON and sharded backends guard
+their files with an advisory lock on a separate lock file next to them,
+and the config file has its own::
+
+    ~/.agentflow/data.lock
+    ~/.agentflow/config.lock
+
+Reads hold it shared, so they run in parallel with each other; commits
+hold it exclusively, only for the short time it takes to check for
+concurrent changes and write. A transaction doesn't hold the lock while
+its block runs: it notes the version of the data it started from and,
+at commit, re-applies its changes if another process committed in the
+meantime (see storage.Transaction and
+sharded_backend.ShardedTransaction). Config writes re-read the file
+under the lock and apply their staged keys onto it.
+
+Locks are fcntl.flock locks; where fcntl doesn't exist (Windows), they
+are no-ops.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+_SHARED, _EXCLUSIVE, _UNLOCK = (
+    (fcntl.LOCK_SH, fcntl.LOCK_EX, fcntl.LOCK_UN) if fcntl is not None else (1, 2, 8)
+)
+
+
+class ConflictError(Exception):
+    """A write conflicts with changes another process committed first."""
+
+
+class FileLock:
+    """Shared/exclusive lock on a lock file, reentrant within the process.
+
+    A lock requested while one is already held is granted by the held
+    lock, except that an exclusive request under a shared lock upgrades
+    it until the exclusive block exits. A forked child reopens the lock
+    file, so it doesn't share its parent's lock.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.fd: Optional[int] = None
+        self.pid = 0
+        self.depth = 0
+        self.exclusive_depth = 0
+
+    def _flock(self, operation: int) -> None:
+        """Apply a flock operation, opening the lock file on first use."""
+        if fcntl is None:
+            return
+        if self.fd is None or self.pid != os.getpid():
+            if operation == fcntl.LOCK_UN:
+                return
+            if operation == fcntl.LOCK_SH and not self.path.parent.exists():
+                # Nothing to read yet, and reads don't create the data directory
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self.pid = os.getpid()
+        fcntl.flock(self.fd, operation)
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        """Hold the lock shared (for reading) within the block."""
+        if self.depth == 0:
+            self._flock(_SHARED)
+        self.depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self._flock(_UNLOCK)
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Hold the lock exclusively (for writing) within the block."""
+        if self.exclusive_depth == 0:
+            self._flock(_EXCLUSIVE)
+        self.depth += 1
+        self.exclusive_depth += 1
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            self.exclusive_depth -= 1
+            if self.depth == 0:
+                self._flock(_UNLOCK)
+            elif self.exclusive_depth == 0:
+                # Back to the shared lock held around this block
+                self._flock(_SHARED)
+
+
+# Locks per lock file, shared by everything in the process
+_locks: dict[Path, FileLock] = {}
+
+
+def get_lock(path: Path) -> FileLock:
+    """Get the process-wide lock of a lock file."""
+    lock = _locks.get(path)
+    if lock is None:
+        lock = _locks[path] = FileLock(path)
+    return lock
@@ -1,10 +1,13 @@
 """Data models for AgentFlow CLI."""
 
 from datetime import datetime, UTC
-from typing import Optional, List
-from pydantic import BaseModel, Field, EmailStr
+from typing import NamedTuple, Optional, List, TYPE_CHECKING
+from pydantic import BaseModel, Field, EmailStr, PrivateAttr
 import uuid
 
+if TYPE_CHECKING:
+    from agentflow.index import DatabaseIndex
+
 
 def generate_uuid() -> str:
     """Generate a random UUID string."""
@@ -62,9 +65,87 @@ class Project(BaseModel):
     created_at: datetime = Field(default_factory=now_utc)
 
 
+class ProjectCounts(NamedTuple):
+    """Number of projects in an organization."""
+
+    active: int = 0
+    inactive: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of projects, active or not."""
+        return self.active + self.inactive
+
+
+# Database collection name -> singular name used by the add_* helpers
+COLLECTION_ITEMS = {"users": "user", "organizations": "organization", "projects": "project"}
+
+
 class Database(BaseModel):
     """Database model containing all data."""
 
     users: List[User] = []
     organizations: List[Organization] = []
     projects: List[Project] = []
+    # Bumped by every write of the JSON backend, so a process can tell
+    # whether another one committed since it loaded the data
+    version: int = 0
+
+    _index: Optional["DatabaseIndex"] = PrivateAttr(default=None)
+
+    @property
+    def index(self) -> "DatabaseIndex":
+        """Hash indexes over this database, built on first use."""
+        if self._index is None or not self._index.matches(self):
+            from agentflow.index import DatabaseIndex
+
+            self._index = DatabaseIndex(self)
+        return self._index
+
+    def add_user(self, user: User) -> None:
+        """Append a user, keeping the index up to date."""
+        self.users.append(user)
+        if self._index is not None:
+            self._index.add_user(user)
+
+    def add_organization(self, org: Organization) -> None:
+        """Append an organization, keeping the index up to date."""
+        self.organizations.append(org)
+        if self._index is not None:
+            self._index.add_organization(org)
+
+    def add_project(self, project: Project) -> None:
+        """Append a project, keeping the index up to date."""
+        self.projects.append(project)
+        if self._index is not None:
+            self._index.add_project(project)
+
+    def upsert_record(self, collection: str, record: BaseModel) -> None:
+        """Insert a record, or replace the record with the same id.
+
+        Args:
+            collection: "users", "organizations" or "projects"
+            record: Record to store
+        """
+        existing = getattr(self.index, f"{collection}_by_id").get(record.id)
+        if existing is None:
+            getattr(self, f"add_{COLLECTION_ITEMS[collection]}")(record)
+            return
+
+        records = getattr(self, collection)
+        for i, item in enumerate(records):
+            if item is existing:
+                records[i] = record
+                break
+        self._index = None
+
+    def remove_record(self, collection: str, record_id: str) -> None:
+        """Remove the record with the given id, if present.
+
+        Args:
+            collection: "users", "organizations" or "projects"
+            record_id: Record ID
+        """
+        records = getattr(self, collection)
+        records[:] = [r for r in records if r.id != record_id]
+        self._index = None
@@ -0,0 +1,111 @@
+"""Cursor pagination for list commands.
+
+List commands read records a page at a time from the ordered indexes of
+the storage layer (see storage.page_projects). A cursor is an opaque
+token wrapping the sort order and the sort key of the last record shown,
+so the next page starts right after it even if records were added since.
+"""
+
+import base64
+import json
+from typing import Callable, Iterator, Optional
+
+from agentflow.index import SORT_KEYS
+
+DEFAULT_PAGE_SIZE = 100
+
+# Sort orders accepted by list commands
+SORT_ORDERS = tuple(SORT_KEYS)
+
+# Fetches a page: (after, limit) -> (records, sort key of the last record if more follow)
+FetchPage = Callable[[Optional[tuple], int], tuple[list, Optional[tuple]]]
+
+
+def encode_cursor(order: str, key: tuple) -> str:
+    """Build a cursor token.
+
+    Args:
+        order: Sort order of the listing
+        key: Sort key of the last record shown
+
+    Returns:
+        URL-safe token
+    """
+    data = json.dumps([order, *key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(token: str, order: str) -> tuple:
+    """Read a cursor token.
+
+    Args:
+        token: Token from encode_cursor()
+        order: Sort order of the listing it is used with
+
+    Returns:
+        Sort key of the last record shown
+
+    Raises:
+        ValueError: If the token is malformed or from another sort order
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    # Every sort key is a (value, record ID) pair of strings
+    if not isinstance(data, list) or len(data) != 3 or data[0] != order:
+        raise ValueError("Invalid cursor")
+    if not all(isinstance(value, str) for value in data[1:]):
+        raise ValueError("Invalid cursor")
+    return tuple(data[1:])
+
+
+class Pager:
+    """Walks the pages of a listing.
+
+    Args:
+        fetch: Function returning one page after a sort key
+        order: Sort order, recorded in the cursors
+        limit: Maximum number of records in total (all if None)
+        page_size: Number of records fetched at a time
+        cursor: Token to continue from
+
+    Raises:
+        ValueError: If the sort order or the cursor is invalid
+    """
+
+    def __init__(
+        self,
+        fetch: FetchPage,
+        order: str,
+        limit: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ):
+        if order not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order '{order}'. Use one of: {', '.join(SORT_ORDERS)}")
+        self.fetch = fetch
+        self.order = order
+        self.limit = limit
+        self.page_size = page_size
+        self.after = decode_cursor(cursor, order) if cursor else None
+        # Set once the pages are exhausted, if the limit stopped the listing early
+        self.next_cursor: Optional[str] = None
+
+    def pages(self) -> Iterator[list]:
+        """Yield non-empty pages until the listing or the limit runs out."""
+        after = self.after
+        remaining = self.limit
+        while True:
+            size = self.page_size if remaining is None else min(self.page_size, remaining)
+            records, next_key = self.fetch(after, size)
+            if records:
+                yield records
+            if next_key is None:
+                return
+            if remaining is not None:
+                remaining -= len(records)
+                if remaining <= 0:
+                    self.next_cursor = encode_cursor(self.order, next_key)
+                    return
+            after = next_key
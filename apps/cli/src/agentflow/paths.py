@@ -0,0 +1,10 @@
+"""Default locations of AgentFlow data files.
+
+Kept free of third-party imports so commands that only report paths
+(such as ``agentflow version``) don't load the storage layer.
+"""
+
+from pathlib import Path
+
+DATA_DIR = Path.home() / ".agentflow"
+DATA_FILE = DATA_DIR / "data.json"
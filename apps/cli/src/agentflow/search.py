@@ -0,0 +1,496 @@
+"""Full-text search over organizations and projects.
+
+Names, slugs, descriptions and GitHub URLs are split into lowercase
+alphanumeric tokens and kept in an inverted index (token -> documents)
+stored in a SQLite file next to the data, along with the user emails
+that searches are scoped by. Slugs are also indexed by trigram, to
+suggest the closest slugs when one is mistyped. The storage layer updates it
+incrementally as records are added or saved (see storage.transaction),
+so a search reads a handful of index rows instead of the whole database.
+"""
+
+import difflib
+import math
+import re
+import sqlite3
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Union
+
+from agentflow.models import Organization, Project, User
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS documents (
+    doc INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    id TEXT NOT NULL,
+    owner_id TEXT,
+    organization_id TEXT,
+    name TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    description TEXT,
+    github_url TEXT
+);
+
+CREATE TABLE IF NOT EXISTS terms (
+    token TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    weight INTEGER NOT NULL,
+    PRIMARY KEY (token, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_terms_doc ON terms (doc);
+CREATE INDEX IF NOT EXISTS idx_documents_slug ON documents (kind, slug);
+
+CREATE TABLE IF NOT EXISTS trigrams (
+    gram TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    PRIMARY KEY (gram, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_trigrams_doc ON trigrams (doc);
+"""
+
+# Indexed fields and the weight of a token found in each
+FIELD_WEIGHTS = {"name": 4, "slug": 3, "github_url": 2, "description": 1}
+
+# Columns of the documents table compared to detect changed records
+DOCUMENT_COLUMNS = ("kind", "id", "owner_id", "organization_id", "name", "slug", "description", "github_url")
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# A token found as typed scores this many times a prefix match
+EXACT_BONUS = 2
+
+# Share of trigrams a slug needs in common with a mistyped one to be suggested
+SIMILARITY_THRESHOLD = 0.4
+
+# Trigrams a single typo (such as two swapped letters) can change in a slug
+TYPO_TRIGRAMS = 4
+
+# difflib ratio a slug needs with a mistyped one to be suggested anyway,
+# for short slugs where one typo changes most trigrams
+CLOSE_MATCH_CUTOFF = 0.6
+
+# Postings counted per query token to pick the rarest one to start from
+ESTIMATE_LIMIT = 10000
+
+Record = Union[User, Organization, Project]
+
+# One connection per index file for the lifetime of the process
+_connections: dict[Path, sqlite3.Connection] = {}
+
+
+class SearchResult(NamedTuple):
+    """An organization or project matching a search."""
+
+    kind: str
+    id: str
+    name: str
+    slug: str
+    org: Optional[str]
+    score: int
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def trigrams(slug: str) -> set[str]:
+    """Get the trigrams of a slug, padded so its start and end weigh more."""
+    padded = f"  {slug} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def document_key(kind: str, record_id: str) -> str:
+    """Get the key of a record in the index."""
+    return f"{kind}:{record_id}"
+
+
+def document_row(record: Record) -> tuple:
+    """Get the documents row of a record, in DOCUMENT_COLUMNS order."""
+    if isinstance(record, Organization):
+        return (
+            "organization",
+            record.id,
+            record.owner_id,
+            None,
+            record.name,
+            record.slug,
+            record.description,
+            None,
+        )
+    return (
+        "project",
+        record.id,
+        None,
+        record.organization_id,
+        record.name,
+        record.slug,
+        record.description,
+        record.github_url,
+    )
+
+
+def document_terms(row: tuple) -> dict[str, int]:
+    """Get the tokens of a documents row with their weight.
+
+    A token found in several fields keeps its highest weight.
+    """
+    fields = dict(zip(DOCUMENT_COLUMNS, row))
+    terms: dict[str, int] = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(fields[field]):
+            if terms.get(token, 0) < weight:
+                terms[token] = weight
+    return terms
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open (or reuse) a connection to a search index, creating the schema.
+
+    Args:
+        path: Index file path
+
+    Returns:
+        SQLite connection
+    """
+    conn = _connections.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        has_trigrams = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'trigrams'"
+        ).fetchone()
+        conn.executescript(SCHEMA)
+        if not has_trigrams:
+            # Index slugs of documents written before trigrams existed
+            with conn:
+                conn.executemany(
+                    "INSERT INTO trigrams (gram, doc) VALUES (?, ?)",
+                    [
+                        (gram, doc)
+                        for doc, slug in conn.execute("SELECT doc, slug FROM documents").fetchall()
+                        for gram in trigrams(slug)
+                    ],
+                )
+        _connections[path] = conn
+    return conn
+
+
+def close_connections() -> None:
+    """Close every open search index connection."""
+    for conn in _connections.values():
+        conn.close()
+    _connections.clear()
+
+
+class SearchIndex:
+    """Inverted index over organizations and projects.
+
+    Args:
+        path: Index file path
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.conn = connect(path)
+
+    def _put(self, row: tuple) -> None:
+        """Replace a document and its terms, without committing."""
+        key = document_key(row[0], row[1])
+        found = self.conn.execute("SELECT doc FROM documents WHERE key = ?", (key,)).fetchone()
+        if found is None:
+            doc = self.conn.execute(
+                f"INSERT INTO documents (key, {', '.join(DOCUMENT_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(DOCUMENT_COLUMNS))})",
+                (key, *row),
+            ).lastrowid
+        else:
+            doc = found[0]
+            self.conn.execute("DELETE FROM terms WHERE doc = ?", (doc,))
+            self.conn.execute("DELETE FROM trigrams WHERE doc = ?", (doc,))
+            self.conn.execute(
+                f"UPDATE documents SET {', '.join(f'{c} = ?' for c in DOCUMENT_COLUMNS)} WHERE doc = ?",
+                (*row, doc),
+            )
+        self.conn.executemany(
+            "INSERT INTO terms (token, doc, weight) VALUES (?, ?, ?)",
+            [(token, doc, weight) for token, weight in document_terms(row).items()],
+        )
+        self.conn.executemany(
+            "INSERT INTO trigrams (gram, doc) VALUES (?, ?)", [(gram, doc) for gram in trigrams(row[5])]
+        )
+
+    def _remove(self, doc: int) -> None:
+        """Remove a document and its terms, without committing."""
+        self.conn.execute("DELETE FROM terms WHERE doc = ?", (doc,))
+        self.conn.execute("DELETE FROM trigrams WHERE doc = ?", (doc,))
+        self.conn.execute("DELETE FROM documents WHERE doc = ?", (doc,))
+
+    def add(self, records: Iterable[Record]) -> None:
+        """Index new or changed records.
+
+        Args:
+            records: Users, organizations and projects
+        """
+        with self.conn:
+            for record in records:
+                if isinstance(record, User):
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO users (id, email) VALUES (?, ?)", (record.id, record.email)
+                    )
+                else:
+                    self._put(document_row(record))
+
+    def sync(
+        self,
+        users: Iterable[User],
+        organizations: Iterable[Organization],
+        projects: Iterable[Project],
+    ) -> int:
+        """Bring the index in line with a whole database.
+
+        Only records whose indexed fields changed are re-tokenized, and
+        documents of records that no longer exist are dropped.
+
+        Args:
+            users: Every user
+            organizations: Every organization
+            projects: Every project
+
+        Returns:
+            Number of documents written or removed
+        """
+        indexed = {
+            row[0]: (row[1], tuple(row[2:]))
+            for row in self.conn.execute(f"SELECT key, doc, {', '.join(DOCUMENT_COLUMNS)} FROM documents")
+        }
+        changes = 0
+        with self.conn:
+            self.conn.execute("DELETE FROM users")
+            self.conn.executemany(
+                "INSERT INTO users (id, email) VALUES (?, ?)", ((user.id, user.email) for user in users)
+            )
+            for records in (organizations, projects):
+                for record in records:
+                    row = document_row(record)
+                    doc, indexed_row = indexed.pop(document_key(row[0], row[1]), (None, None))
+                    if indexed_row != row:
+                        self._put(row)
+                        changes += 1
+            for doc, _ in indexed.values():
+                self._remove(doc)
+                changes += 1
+        return changes
+
+    def clear(self) -> None:
+        """Remove every document."""
+        with self.conn:
+            self.conn.execute("DELETE FROM terms")
+            self.conn.execute("DELETE FROM trigrams")
+            self.conn.execute("DELETE FROM documents")
+            self.conn.execute("DELETE FROM users")
+
+    def search(self, query: str, owner_email: Optional[str] = None, limit: int = 20) -> list[SearchResult]:
+        """Find the records matching every token of a query, best first.
+
+        The last token also matches as a prefix, so partial words work
+        while typing. A record scores the weight of the field each token
+        was found in, doubled for whole-token matches.
+
+        Args:
+            query: Search terms
+            owner_email: Only organizations of this user and their projects
+            limit: Maximum number of results
+
+        Returns:
+            Matching records, highest score first
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        # (estimated postings, condition, parameters, score, score parameters) per token;
+        # conditions and scores are templates over a terms alias {t}
+        lookups = []
+        for i, token in enumerate(tokens):
+            if i == len(tokens) - 1:
+                lookup = (
+                    "{t}.token >= ? AND {t}.token < ?",
+                    [token, token + "\uffff"],
+                    "{t}.weight * CASE WHEN {t}.token = ? THEN ? ELSE 1 END",
+                    [token, EXACT_BONUS],
+                )
+            else:
+                lookup = ("{t}.token = ?", [token], "{t}.weight * ?", [EXACT_BONUS])
+            found = self.conn.execute(
+                f"SELECT COUNT(*) FROM (SELECT 1 FROM terms AS t WHERE {lookup[0].format(t='t')} LIMIT ?)",
+                (*lookup[1], ESTIMATE_LIMIT),
+            ).fetchone()[0]
+            if not found:
+                return []
+            lookups.append((found, *lookup))
+
+        # Walk the rarest token's postings and probe the others by (token, doc)
+        lookups.sort(key=lambda lookup: lookup[0])
+        _, first_condition, first_params, _, _ = lookups[0]
+        joins = ["terms AS t0"]
+        join_params: list = []
+        scores = []
+        score_params: list = []
+        for i, (_, condition, params, score, bonus) in enumerate(lookups):
+            alias = f"t{i}"
+            if i:
+                joins.append(
+                    f"CROSS JOIN terms AS {alias} ON {alias}.doc = t0.doc AND {condition.format(t=alias)}"
+                )
+                join_params += params
+            scores.append(score.format(t=alias))
+            score_params += bonus
+
+        sql = f"""
+            SELECT d.kind, d.id, d.name, d.slug, o.slug, m.score
+            FROM (
+                SELECT t0.doc AS doc, MAX({' + '.join(scores)}) AS score
+                FROM {' '.join(joins)}
+                WHERE {first_condition.format(t="t0")}
+                GROUP BY t0.doc
+            ) AS m
+            JOIN documents AS d ON d.doc = m.doc
+            LEFT JOIN documents AS o ON o.key = 'organization:' || d.organization_id
+        """
+        params = [*score_params, *join_params, *first_params]
+        if owner_email is not None:
+            sql += " WHERE COALESCE(o.owner_id, d.owner_id) = (SELECT id FROM users WHERE email = ?)"
+            params.append(owner_email)
+        sql += " ORDER BY m.score DESC, d.name, d.doc LIMIT ?"
+        params.append(limit)
+
+        return [SearchResult(*row) for row in self.conn.execute(sql, params)]
+
+    def _slug_scope(
+        self, kind: str, owner_email: Optional[str], org_slug: Optional[str]
+    ) -> tuple[str, list]:
+        """Build the conditions limiting slug lookups to one kind of document."""
+        conditions = ["d.kind = ?"]
+        params: list = [kind]
+        if org_slug is not None:
+            conditions.append(
+                "d.organization_id = (SELECT id FROM documents WHERE kind = 'organization' AND slug = ?)"
+            )
+            params.append(org_slug)
+        if owner_email is not None:
+            conditions.append("d.owner_id = (SELECT id FROM users WHERE email = ?)")
+            params.append(owner_email)
+        return " AND ".join(conditions), params
+
+    def similar_slugs(
+        self,
+        kind: str,
+        slug: str,
+        owner_email: Optional[str] = None,
+        org_slug: Optional[str] = None,
+        limit: int = 3,
+    ) -> list[str]:
+        """Find the slugs closest to a mistyped one.
+
+        Slugs are compared by the share of trigrams they have in common
+        (relative to the longer of the two). Short slugs share few
+        trigrams after a single typo, so slugs close by difflib's ratio
+        are suggested after those.
+
+        Args:
+            kind: "organization" or "project"
+            slug: Slug that wasn't found
+            owner_email: Only organizations of the user with this email
+            org_slug: Only projects of the organization with this slug
+            limit: Maximum number of slugs
+
+        Returns:
+            Similar slugs, closest first
+        """
+        grams = trigrams(slug.lower())
+        scope, params = self._slug_scope(kind, owner_email, org_slug)
+
+        # A similar slug shares at least `needed` trigrams, so it has one of
+        # the len(grams) - needed + 1 rarest: only those postings are read
+        # (CROSS JOIN keeps SQLite from walking every document of the kind instead).
+        # Short slugs may keep fewer trigrams than the threshold after one typo
+        needed = max(1, min(math.ceil(len(grams) * SIMILARITY_THRESHOLD), len(grams) - TYPO_TRIGRAMS))
+        sizes = sorted(
+            (
+                self.conn.execute(
+                    "SELECT COUNT(*) FROM (SELECT 1 FROM trigrams WHERE gram = ? LIMIT ?)",
+                    (gram, ESTIMATE_LIMIT),
+                ).fetchone()[0],
+                gram,
+            )
+            for gram in grams
+        )
+        rare = [gram for _, gram in sizes[: len(grams) - needed + 1]]
+        rows = self.conn.execute(
+            f"SELECT DISTINCT d.slug FROM trigrams AS t CROSS JOIN documents AS d ON d.doc = t.doc "
+            f"WHERE t.gram IN ({', '.join('?' * len(rare))}) AND {scope}",
+            [*rare, *params],
+        )
+
+        scored = []
+        others = []
+        for (candidate,) in rows:
+            if candidate == slug:
+                continue
+            candidate_grams = trigrams(candidate)
+            score = len(grams & candidate_grams) / max(len(grams), len(candidate_grams))
+            if score >= SIMILARITY_THRESHOLD:
+                scored.append((-score, candidate))
+            else:
+                others.append(candidate)
+        similar = [candidate for _, candidate in sorted(scored)[:limit]]
+        if len(similar) < limit:
+            similar += difflib.get_close_matches(
+                slug.lower(), sorted(others), limit - len(similar), CLOSE_MATCH_CUTOFF
+            )
+        return similar
+
+    def complete_slugs(
+        self,
+        kind: str,
+        incomplete: str,
+        owner_email: Optional[str] = None,
+        org_slug: Optional[str] = None,
+        limit: int = 50,
+    ) -> list[str]:
+        """Complete a partly typed slug.
+
+        Slugs starting with the typed text come first, in order; when
+        there are none, the closest slugs are offered instead.
+
+        Args:
+            kind: "organization" or "project"
+            incomplete: Text typed so far
+            owner_email: Only organizations of the user with this email
+            org_slug: Only projects of the organization with this slug
+            limit: Maximum number of slugs
+
+        Returns:
+            Candidate slugs
+        """
+        scope, params = self._slug_scope(kind, owner_email, org_slug)
+        slugs = [
+            row[0]
+            for row in self.conn.execute(
+                f"SELECT d.slug FROM documents AS d WHERE {scope} AND d.slug >= ? AND d.slug < ? "
+                f"ORDER BY d.slug LIMIT ?",
+                [*params, incomplete, incomplete + "\uffff", limit],
+            )
+        ]
+        if slugs or not incomplete:
+            return slugs
+        return self.similar_slugs(kind, incomplete, owner_email, org_slug, limit)
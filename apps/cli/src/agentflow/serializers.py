@@ -0,0 +1,88 @@
+"""On-disk formats for the database snapshot.
+
+Two formats are written, and loads() reads either:
+
+- ``json``: pretty-printed JSON (indent=2), the historical format
+- ``json-compact``: JSON without whitespace
+
+A format is an encoder in ENCODERS; dumps() picks it by name, so adding
+a format only takes registering its encoder (and teaching loads() and
+detect_format() to recognize it).
+"""
+
+import json
+from typing import Callable, Union
+
+from pydantic import BaseModel
+
+Document = Union[dict, BaseModel]
+
+
+def _dump_json(data: Document) -> bytes:
+    """Encode a document as pretty-printed JSON."""
+    if isinstance(data, BaseModel):
+        return data.model_dump_json(indent=2).encode()
+    return json.dumps(data, indent=2).encode()
+
+
+def _dump_compact(data: Document) -> bytes:
+    """Encode a document as JSON without whitespace."""
+    if isinstance(data, BaseModel):
+        return data.model_dump_json().encode()
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+# Format name -> encoder
+ENCODERS: dict[str, Callable[[Document], bytes]] = {
+    "json": _dump_json,
+    "json-compact": _dump_compact,
+}
+
+FORMATS = tuple(ENCODERS)
+DEFAULT_FORMAT = "json"
+
+
+def detect_format(raw: bytes) -> str:
+    """Detect the format of serialized data.
+
+    Args:
+        raw: Serialized data
+
+    Returns:
+        "json" or "json-compact"
+    """
+    return "json" if b"\n" in raw[:64] else "json-compact"
+
+
+def dumps(data: Document, fmt: str = DEFAULT_FORMAT) -> bytes:
+    """Serialize a document.
+
+    Pydantic models go through their native JSON encoder, which skips
+    building the intermediate dict.
+
+    Args:
+        data: Document (top-level dict or Pydantic model)
+        fmt: One of FORMATS
+
+    Returns:
+        Serialized data
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    encoder = ENCODERS.get(fmt)
+    if encoder is None:
+        raise ValueError(f"Unknown storage format '{fmt}' (expected one of: {', '.join(FORMATS)})")
+    return encoder(data)
+
+
+def loads(raw: bytes) -> dict:
+    """Deserialize data written by dumps().
+
+    Args:
+        raw: Serialized data
+
+    Returns:
+        Document (top-level dict)
+    """
+    return json.loads(raw)
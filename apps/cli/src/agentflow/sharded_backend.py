@@ -0,0 +1,434 @@
+"""Sharded storage backend.
+
+Splits the data into one file per collection, and projects into one file
+per organization::
+
+    ~/.agentflow/shards/users.json
+    ~/.agentflow/shards/organizations.json
+    ~/.agentflow/shards/projects/<organization_id>.json
+    ~/.agentflow/shards/project_counts.json
+
+project_counts.json holds the number of active and inactive projects of
+each organization, rewritten along with its project shard, so counting
+doesn't open the project shards.
+
+Lookups only open the shards they need and writes only rewrite the
+shards that changed. Selected with ``storage_backend: sharded`` in the
+config file or ``AGENTFLOW_STORAGE=sharded``. Shards use the same
+on-disk formats as data.json.
+
+Writes hold the same lock file as the JSON backend exclusively, and a
+transaction re-applies its changes onto the shards other processes
+rewrote since it read them (see ShardedTransaction).
+"""
+
+import json
+from pathlib import Path
+from typing import ContextManager, Iterator, Optional, Union
+
+from agentflow import durability, journal, snapshot_cache, storage
+from agentflow.index import Filter
+from agentflow.locking import ConflictError, get_lock
+from agentflow.models import Database, User, APIKey, Organization, Project, ProjectCounts
+from agentflow.storage import StorageBackend
+
+# Shard keys: "users", "organizations" or ("projects", organization_id)
+ShardKey = Union[str, tuple[str, str]]
+
+# (mtime, size, inode) of a shard file, or None if it doesn't exist
+Signature = Optional[tuple[int, int, int]]
+
+SHARDS_DIR_NAME = "shards"
+COUNTS_FILE_NAME = "project_counts.json"
+
+
+def get_shards_dir() -> Path:
+    """Get the directory holding the shard files."""
+    return storage.DATA_DIR / SHARDS_DIR_NAME
+
+
+def get_counts_file() -> Path:
+    """Get the file holding the project counts of every organization."""
+    return get_shards_dir() / COUNTS_FILE_NAME
+
+
+def shard_path(key: ShardKey) -> Path:
+    """Get the file path of a shard."""
+    if isinstance(key, tuple):
+        return get_shards_dir() / "projects" / f"{key[1]}.json"
+    return get_shards_dir() / f"{key}.json"
+
+
+class ShardedBackend(StorageBackend):
+    """Per-collection, per-organization sharded files backend."""
+
+    name = "sharded"
+
+    def _shard(self, key: ShardKey) -> Database:
+        """Load one shard, reusing the process cache while the file is unchanged."""
+        path = shard_path(key)
+        signature = storage._file_signature(path)
+        if signature is None:
+            return Database()
+
+        cached = storage._cache.get(path)
+        if cached is None or cached.snapshot != signature:
+            db = snapshot_cache.load(path, path.read_bytes())
+            cached = storage._cache[path] = storage._CachedDatabase(db, signature)
+        return cached.db
+
+    def _write(self, key: ShardKey, shard: Database, count: bool = True) -> None:
+        """Write one shard and cache it.
+
+        Args:
+            key: Shard key
+            shard: Shard content
+            count: Update the stored project counts of a project shard
+        """
+        path = shard_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = storage.serialize_database(shard, storage.get_format_name())
+        durability.write_atomic(path, data, storage.get_durability())
+        snapshot_cache.store(path, data, shard)
+        storage._cache[path] = storage._CachedDatabase(shard, storage._file_signature(path))
+        if count and isinstance(key, tuple):
+            counts = self._read_counts()
+            counts[key[1]] = [*shard.index.count_projects(key[1])]
+            self._write_counts(counts)
+
+    def _read_counts(self) -> dict[str, list[int]]:
+        """Read the stored project counts (empty if there are none yet)."""
+        try:
+            return json.loads(get_counts_file().read_bytes())
+        except (OSError, ValueError):
+            return {}
+
+    def _write_counts(self, counts: dict[str, list[int]]) -> None:
+        """Replace the stored project counts."""
+        data = json.dumps(counts, separators=(",", ":")).encode()
+        durability.write_atomic(get_counts_file(), data, storage.get_durability())
+
+    def _drop(self, key: ShardKey) -> None:
+        """Forget the cached copy of a shard."""
+        storage._cache.pop(shard_path(key), None)
+
+    def _peek(self, key: ShardKey) -> Database:
+        """Load one shard without adding it to the process cache."""
+        path = shard_path(key)
+        cached = storage._cache.get(path)
+        if cached is not None and cached.snapshot == storage._file_signature(path):
+            return cached.db
+        if not path.exists():
+            return Database()
+        return snapshot_cache.load(path, path.read_bytes())
+
+    def _project_shard_keys(self) -> list[tuple[str, str]]:
+        """List the project shards present on disk."""
+        projects_dir = get_shards_dir() / "projects"
+        if not projects_dir.exists():
+            return []
+        return [("projects", path.stem) for path in sorted(projects_dir.glob("*.json"))]
+
+    def _signature(self, key: ShardKey) -> Signature:
+        """Get the signature of the shard file the cached copy was read from."""
+        cached = storage._cache.get(shard_path(key))
+        return cached.snapshot if cached is not None else None
+
+    def lock(self) -> ContextManager[None]:
+        """Hold the lock file exclusively."""
+        return get_lock(storage.get_lock_file()).exclusive()
+
+    def load(self) -> Database:
+        """Assemble every shard into one Database.
+
+        Projects are grouped by organization, in organization order. The
+        lock file is held shared, so no shard is rewritten meanwhile.
+        """
+        with get_lock(storage.get_lock_file()).shared():
+            return self._load()
+
+    def _load(self) -> Database:
+        """Assemble every shard; see load()."""
+        organizations = self._shard("organizations").organizations
+        keys = [("projects", org.id) for org in organizations]
+        known = set(keys)
+        keys += [key for key in self._project_shard_keys() if key not in known]
+
+        return Database(
+            users=self._shard("users").users,
+            organizations=organizations,
+            projects=[project for key in keys for project in self._shard(key).projects],
+        )
+
+    def save(self, db: Database) -> None:
+        """Rewrite every shard from a Database and remove stale project shards."""
+        with self.lock():
+            self._save(db)
+
+    def _save(self, db: Database) -> None:
+        """Rewrite every shard; see save()."""
+        projects: dict[str, list[Project]] = {}
+        for project in db.projects:
+            projects.setdefault(project.organization_id, []).append(project)
+
+        self._write("users", Database(users=db.users))
+        self._write("organizations", Database(organizations=db.organizations))
+        for organization_id, items in projects.items():
+            self._write(("projects", organization_id), Database(projects=items), count=False)
+        for key in self._project_shard_keys():
+            if key[1] not in projects:
+                shard_path(key).unlink()
+                snapshot_cache.remove(shard_path(key))
+                self._drop(key)
+        self._write_counts({org_id: [*db.index.count_projects(org_id)] for org_id in projects})
+
+    def begin(self) -> "ShardedTransaction":
+        """Start a transaction that only rewrites the shards it touches."""
+        return ShardedTransaction(self)
+
+    def find_user_by_email(self, email: str) -> Optional[User]:
+        """Find user by email."""
+        return self._shard("users").index.user_by_email(email)
+
+    def find_organization_by_slug(self, slug: str) -> Optional[Organization]:
+        """Find organization by slug."""
+        return self._shard("organizations").index.organization_by_slug(slug)
+
+    def find_organizations_by_owner(self, owner_id: str) -> list[Organization]:
+        """Find all organizations owned by user."""
+        return self._shard("organizations").index.organizations_owned_by(owner_id)
+
+    def find_project_by_slug(self, organization_id: str, slug: str) -> Optional[Project]:
+        """Find project by slug within organization."""
+        shard = self._shard(("projects", organization_id))
+        return shard.index.project_by_slug(organization_id, slug)
+
+    def find_projects_by_organization(self, organization_id: str) -> list[Project]:
+        """Find all projects within organization."""
+        shard = self._shard(("projects", organization_id))
+        return shard.index.projects_in_organization(organization_id)
+
+    def count_projects(self, organization_ids: list[str]) -> dict[str, ProjectCounts]:
+        """Get project counts from project_counts.json.
+
+        Organizations missing from it (shards written before it existed)
+        are counted from their shard.
+        """
+        stored = self._read_counts()
+        return {
+            org_id: ProjectCounts(*stored[org_id])
+            if org_id in stored
+            else self._shard(("projects", org_id)).index.count_projects(org_id)
+            for org_id in organization_ids
+        }
+
+    def page_projects(
+        self,
+        organization_id: str,
+        order: str = "created_at",
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        where: Optional[Filter] = None,
+    ) -> tuple[list[Project], Optional[tuple]]:
+        """Get one page of an organization's matching projects from its shard."""
+        shard = self._shard(("projects", organization_id))
+        return shard.index.page("projects", organization_id, order, after, limit, where)
+
+    def page_organizations(
+        self,
+        owner_id: str,
+        order: str = "created_at",
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        where: Optional[Filter] = None,
+    ) -> tuple[list[Organization], Optional[tuple]]:
+        """Get one page of a user's matching organizations."""
+        index = self._shard("organizations").index
+        return index.page("organizations", owner_id, order, after, limit, where)
+
+    def iter_users(self) -> Iterator[User]:
+        """Iterate over every user."""
+        yield from self._shard("users").users
+
+    def iter_organizations(self) -> Iterator[Organization]:
+        """Iterate over every organization."""
+        yield from self._shard("organizations").organizations
+
+    def iter_projects(self, organization_id: Optional[str] = None) -> Iterator[Project]:
+        """Iterate over projects, one organization shard at a time.
+
+        Shards that aren't cached yet are read without being cached, so
+        only one of them is held in memory at a time.
+        """
+        if organization_id is not None:
+            yield from self.find_projects_by_organization(organization_id)
+            return
+
+        keys = [("projects", org.id) for org in self._shard("organizations").organizations]
+        known = set(keys)
+        keys += [key for key in self._project_shard_keys() if key not in known]
+        for key in keys:
+            yield from self._peek(key).projects
+
+
+class ShardedTransaction(ShardedBackend):
+    """Transaction over sharded files.
+
+    Touched shards are mutated in memory and rewritten on commit; the
+    other shards are never read or written. Each shard file is replaced
+    on its own, so a crash during commit can leave some shards written.
+
+    Other processes aren't locked out while the transaction runs. If one
+    of them rewrites a touched shard first, commit() re-applies the
+    transaction's changes, kept as journal entries, onto the latest
+    shard rather than overwriting it.
+    """
+
+    def __init__(self, backend: ShardedBackend):
+        self.backend = backend
+        self.dirty: dict[ShardKey, Database] = {}
+        self.entries: dict[ShardKey, list[dict]] = {}
+        # Signatures of the shards as this transaction first read them
+        self.signatures: dict[ShardKey, Signature] = {}
+        self.replacement: Optional[Database] = None
+
+    def _read(self, key: ShardKey) -> Database:
+        """Get a shard from the backend, noting the version read."""
+        shard = self.backend._shard(key)
+        self.signatures.setdefault(key, self.backend._signature(key))
+        return shard
+
+    def _shard(self, key: ShardKey) -> Database:
+        """Get a shard, including the changes pending in this transaction."""
+        if self.replacement is not None:
+            return self.replacement
+        if key not in self.dirty:
+            return self._read(key)
+        return self.dirty[key]
+
+    def _peek(self, key: ShardKey) -> Database:
+        """Get a shard, including pending changes, without caching it."""
+        if self.replacement is not None or key in self.dirty:
+            return self._shard(key)
+        return self.backend._peek(key)
+
+    def count_projects(self, organization_ids: list[str]) -> dict[str, ProjectCounts]:
+        """Get project counts, including pending changes."""
+        if self.replacement is not None:
+            index = self.replacement.index
+            return {org_id: index.count_projects(org_id) for org_id in organization_ids}
+
+        counts = self.backend.count_projects(
+            [org_id for org_id in organization_ids if ("projects", org_id) not in self.dirty]
+        )
+        for org_id in organization_ids:
+            if ("projects", org_id) in self.dirty:
+                counts[org_id] = self.dirty[("projects", org_id)].index.count_projects(org_id)
+        return {org_id: counts[org_id] for org_id in organization_ids}
+
+    def _touch(self, key: ShardKey, entry: dict) -> Database:
+        """Get a shard to mutate, mark it for rewriting and record the change."""
+        if self.replacement is not None:
+            return self.replacement
+        if key not in self.dirty:
+            self.dirty[key] = self._read(key)
+        self.entries.setdefault(key, []).append(entry)
+        return self.dirty[key]
+
+    def _project_shard_keys(self) -> list[tuple[str, str]]:
+        """List the project shards on disk or created in this transaction."""
+        keys = self.backend._project_shard_keys()
+        return keys + [key for key in self.dirty if isinstance(key, tuple) and key not in keys]
+
+    def _changed(self, key: ShardKey) -> bool:
+        """Check whether another process rewrote a shard since it was read."""
+        return storage._file_signature(shard_path(key)) != self.signatures.get(key)
+
+    def _refresh(self, key: ShardKey, shard: Database) -> Database:
+        """Re-apply the changes to a shard onto its latest version, if it changed.
+
+        Raises:
+            ConflictError: If the changes clash with the latest shard
+        """
+        if not self._changed(key):
+            return shard
+
+        self.backend._drop(key)
+        latest = self.backend._shard(key)
+        entries = self.entries.get(key, [])
+        for entry in entries:
+            unique = storage._unique_key(entry)
+            existing = storage._find_by_key(latest, unique) if unique else None
+            if existing is not None and existing.id != entry["record"]["id"]:
+                raise storage._conflict(unique)
+        storage._check_users(latest, entries)
+        for entry in entries:
+            journal.apply_entry(latest, entry)
+        return latest
+
+    def load(self) -> Database:
+        """Assemble every shard, including pending changes."""
+        if self.replacement is not None:
+            return self.replacement
+        return super()._load()
+
+    def save(self, db: Database) -> None:
+        """Replace the whole database when the transaction commits."""
+        self.rollback()
+        self.replacement = db
+        self.dirty = {}
+        self.entries = {}
+
+    def commit(self) -> None:
+        """Rewrite the shards touched by the transaction.
+
+        A replaced database is only written if none of the shards the
+        transaction read was rewritten since.
+
+        Raises:
+            ConflictError: If another process rewrote a shard first and
+                the transaction's changes can't be re-applied onto it
+        """
+        if self.replacement is None and not self.dirty:
+            return
+
+        with self.backend.lock():
+            try:
+                if self.replacement is not None:
+                    if any(self._changed(key) for key in self.signatures):
+                        raise ConflictError(
+                            "The data was changed by another process while it was being replaced"
+                        )
+                    self.backend._save(self.replacement)
+                    return
+                # Catch up on every shard before writing any
+                shards = {key: self._refresh(key, shard) for key, shard in self.dirty.items()}
+            except ConflictError:
+                self.rollback()
+                raise
+            for key, shard in shards.items():
+                self.backend._write(key, shard)
+
+    def rollback(self) -> None:
+        """Drop cached shards that may hold uncommitted changes."""
+        for key in self.dirty:
+            self.backend._drop(key)
+
+    def add_user(self, user: User) -> None:
+        """Store a new user (with its API keys)."""
+        self._touch("users", journal.make_entry("insert", "users", user)).add_user(user)
+
+    def add_api_key(self, user_id: str, api_key: APIKey) -> None:
+        """Store a new API key for an existing user."""
+        entry = journal.make_entry("insert", "api_keys", api_key, user_id=user_id)
+        self._touch("users", entry).index.users_by_id[user_id].api_keys.append(api_key)
+
+    def add_organization(self, org: Organization) -> None:
+        """Store a new organization."""
+        entry = journal.make_entry("insert", "organizations", org)
+        self._touch("organizations", entry).add_organization(org)
+
+    def add_project(self, project: Project) -> None:
+        """Store a new project."""
+        entry = journal.make_entry("insert", "projects", project)
+        self._touch(("projects", project.organization_id), entry).add_project(project)
@@ -0,0 +1,169 @@
+"""Validated snapshot cache.
+
+Building a Database from a data file validates every record, and the
+EmailStr check alone costs far more than parsing the file. Once a file
+has been validated (or written by the CLI), its records are pickled to
+a sidecar file keyed by the content hash of the data file::
+
+    ~/.agentflow/data.json
+    ~/.agentflow/data.json.validated
+
+Loading the same bytes again rebuilds the records without validation.
+Any other content, such as a data file edited by hand, misses the cache
+and goes through full validation.
+
+Records are stored per collection as rows of field values and rebuilt
+the way pickle restores a model, without running validators. The cache
+lives next to the data it describes and is trusted like it; an
+unreadable or outdated cache is ignored.
+"""
+
+import hashlib
+import pickle
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from pydantic import BaseModel
+
+from agentflow import durability, serializers
+from agentflow.models import COLLECTION_ITEMS, Database
+
+CACHE_SUFFIX = ".validated"
+VERSION = 2
+
+
+def get_cache_file(path: Path) -> Path:
+    """Get the cache file of a data file."""
+    return path.with_name(path.name + CACHE_SUFFIX)
+
+
+def content_hash(raw: bytes) -> str:
+    """Hash the content of a data file."""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _fields(model: type[BaseModel]) -> tuple[str, ...]:
+    """Get the field names of a model, in declaration order."""
+    return tuple(model.model_fields)
+
+
+def _rows(records: list[BaseModel], names: tuple[str, ...]) -> list[tuple]:
+    """Turn records into rows of field values.
+
+    Validated datetimes each carry their own tzinfo object; they are
+    swapped for one shared timezone per offset so pickle stores it once.
+    """
+    rows = [tuple(map(record.__dict__.__getitem__, names)) for record in records]
+    if not any(isinstance(value, datetime) for row in rows[:1] for value in row):
+        return rows
+
+    zones: dict = {}
+
+    def share(value):
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            offset = value.utcoffset()
+            zone = zones.get(offset)
+            if zone is None:
+                zone = zones[offset] = timezone(offset)
+            return value.replace(tzinfo=zone)
+        return value
+
+    return [tuple(map(share, row)) for row in rows]
+
+
+def _construct(model: type[BaseModel], names: tuple[str, ...], rows: list[tuple]) -> list:
+    """Rebuild records from rows of field values without validation.
+
+    Sets the same attributes as pickle does when it restores a model.
+    """
+    new = model.__new__
+    setattr_ = object.__setattr__
+    fields_set = set(names)
+    records = []
+    for row in rows:
+        record = new(model)
+        setattr_(record, "__dict__", dict(zip(names, row)))
+        setattr_(record, "__pydantic_fields_set__", fields_set.copy())
+        setattr_(record, "__pydantic_extra__", None)
+        setattr_(record, "__pydantic_private__", None)
+        records.append(record)
+    return records
+
+
+def store(path: Path, raw: bytes, db: Database) -> None:
+    """Cache the validated records of a data file.
+
+    Args:
+        path: Data file path
+        raw: Content of the data file
+        db: Database validated from (or serialized to) that content
+    """
+    collections = {}
+    for name in COLLECTION_ITEMS:
+        model = Database.model_fields[name].annotation.__args__[0]
+        names = _fields(model)
+        collections[name] = (names, _rows(getattr(db, name), names))
+
+    # The header is read on its own so a stale cache is rejected cheaply
+    data = pickle.dumps((VERSION, content_hash(raw)), pickle.HIGHEST_PROTOCOL) + pickle.dumps(
+        (db.version, collections), pickle.HIGHEST_PROTOCOL
+    )
+    try:
+        # Rebuilt from the data file if lost, so it needn't be synced
+        durability.write_atomic(get_cache_file(path), data, "relaxed")
+    except OSError:
+        pass
+
+
+def fetch(path: Path, raw: bytes) -> Optional[Database]:
+    """Get the cached Database of a data file, if it matches its content.
+
+    Args:
+        path: Data file path
+        raw: Content of the data file
+
+    Returns:
+        Database, or None if there is no usable cache for this content
+    """
+    try:
+        with open(get_cache_file(path), "rb") as f:
+            if pickle.load(f) != (VERSION, content_hash(raw)):
+                return None
+            version, collections = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # A truncated or otherwise unreadable cache just means a validated load
+        return None
+
+    fields = {}
+    for name in COLLECTION_ITEMS:
+        model = Database.model_fields[name].annotation.__args__[0]
+        names, rows = collections.get(name, ((), []))
+        if rows and names != _fields(model):
+            return None
+        fields[name] = _construct(model, names, rows)
+    return Database.model_construct(version=version, **fields)
+
+
+def load(path: Path, raw: bytes) -> Database:
+    """Build the Database of a data file, validating it unless cached.
+
+    Args:
+        path: Data file path
+        raw: Content of the data file
+
+    Returns:
+        Database
+    """
+    db = fetch(path, raw)
+    if db is None:
+        db = Database(**serializers.loads(raw))
+        store(path, raw, db)
+    return db
+
+
+def remove(path: Path) -> None:
+    """Remove the cache file of a data file."""
+    get_cache_file(path).unlink(missing_ok=True)
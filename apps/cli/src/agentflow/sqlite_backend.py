@@ -0,0 +1,529 @@
+"""SQLite storage backend.
+
+Stores users, API keys, organizations and projects in their own indexed
+tables so lookups and inserts don't depend on the size of the dataset.
+Selected with ``storage_backend: sqlite`` in the config file or
+``AGENTFLOW_STORAGE=sqlite``.
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from pydantic import TypeAdapter
+
+from agentflow.durability import DEFAULT_MODE, SQLITE_SYNCHRONOUS
+from agentflow.index import SORT_KEYS, Filter, timestamp_key
+from agentflow.models import Database, User, APIKey, Organization, Project, ProjectCounts
+from agentflow.storage import StorageBackend
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS api_keys (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES users (id),
+    key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    last_used_at TEXT,
+    is_active INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_api_keys_user_id ON api_keys (user_id);
+
+CREATE TABLE IF NOT EXISTS organizations (
+    id TEXT PRIMARY KEY,
+    owner_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    slug TEXT NOT NULL UNIQUE,
+    description TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_organizations_owner_id ON organizations (owner_id);
+CREATE INDEX IF NOT EXISTS idx_organizations_owner_created
+    ON organizations (owner_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_organizations_owner_slug ON organizations (owner_id, slug, id);
+CREATE INDEX IF NOT EXISTS idx_organizations_owner_name ON organizations (owner_id, name, id);
+
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    organization_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    description TEXT,
+    github_url TEXT,
+    is_active INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    UNIQUE (organization_id, slug)
+);
+CREATE INDEX IF NOT EXISTS idx_projects_organization_created
+    ON projects (organization_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_projects_organization_name ON projects (organization_id, name, id);
+
+CREATE TABLE IF NOT EXISTS project_counts (
+    organization_id TEXT PRIMARY KEY,
+    active INTEGER NOT NULL DEFAULT 0,
+    inactive INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_count_insert AFTER INSERT ON projects BEGIN
+    INSERT OR IGNORE INTO project_counts (organization_id) VALUES (NEW.organization_id);
+    UPDATE project_counts
+        SET active = active + NEW.is_active, inactive = inactive + 1 - NEW.is_active
+        WHERE organization_id = NEW.organization_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_count_delete AFTER DELETE ON projects BEGIN
+    UPDATE project_counts
+        SET active = active - OLD.is_active, inactive = inactive - 1 + OLD.is_active
+        WHERE organization_id = OLD.organization_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_projects_count_update
+AFTER UPDATE OF organization_id, is_active ON projects BEGIN
+    UPDATE project_counts
+        SET active = active - OLD.is_active, inactive = inactive - 1 + OLD.is_active
+        WHERE organization_id = OLD.organization_id;
+    INSERT OR IGNORE INTO project_counts (organization_id) VALUES (NEW.organization_id);
+    UPDATE project_counts
+        SET active = active + NEW.is_active, inactive = inactive + 1 - NEW.is_active
+        WHERE organization_id = NEW.organization_id;
+END;
+"""
+
+# Fills project_counts for databases created before it existed
+BACKFILL_PROJECT_COUNTS = """
+INSERT INTO project_counts (organization_id, active, inactive)
+SELECT organization_id, SUM(is_active), COUNT(*) - SUM(is_active)
+FROM projects GROUP BY organization_id
+"""
+
+USER_COLUMNS = ("id", "email", "password_hash", "name", "created_at")
+API_KEY_COLUMNS = ("id", "user_id", "key", "name", "created_at", "last_used_at", "is_active")
+ORGANIZATION_COLUMNS = ("id", "owner_id", "name", "slug", "description", "created_at")
+PROJECT_COLUMNS = (
+    "id",
+    "organization_id",
+    "name",
+    "slug",
+    "description",
+    "github_url",
+    "is_active",
+    "created_at",
+)
+
+# Columns stored as timestamp_key() text, so they sort and compare as time
+TIMESTAMP_COLUMNS = {
+    "users": ("created_at",),
+    "api_keys": ("created_at", "last_used_at"),
+    "organizations": ("created_at",),
+    "projects": ("created_at",),
+}
+
+# PRAGMA user_version of databases storing timestamps as timestamp_key() text
+SCHEMA_VERSION = 1
+
+_DATETIME = TypeAdapter(datetime)
+
+# One connection per database file for the lifetime of the process
+_connections: dict[Path, sqlite3.Connection] = {}
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open (or reuse) a connection to a SQLite database, creating the schema.
+
+    Args:
+        path: Database file path
+
+    Returns:
+        SQLite connection with rows returned as sqlite3.Row
+    """
+    conn = _connections.get(path)
+    if conn is None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        has_counts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'project_counts'"
+        ).fetchone()
+        conn.executescript(SCHEMA)
+        if not has_counts:
+            with conn:
+                conn.execute(BACKFILL_PROJECT_COUNTS)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            with conn:
+                _normalize_timestamps(conn)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        _connections[path] = conn
+    return conn
+
+
+def _normalize_timestamps(conn: sqlite3.Connection) -> None:
+    """Rewrite timestamps stored as JSON dumps ("Z", no fraction at whole seconds)."""
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            rows = conn.execute(f"SELECT rowid, {column} FROM {table} WHERE {column} IS NOT NULL")
+            updates = [
+                (timestamp_key(_DATETIME.validate_python(value)), rowid) for rowid, value in rows
+            ]
+            conn.executemany(f"UPDATE {table} SET {column} = ? WHERE rowid = ?", updates)
+
+
+def close_connections() -> None:
+    """Close every open SQLite connection."""
+    for conn in _connections.values():
+        conn.close()
+    _connections.clear()
+
+
+def _insert_sql(table: str, columns: tuple[str, ...]) -> str:
+    """Build an INSERT statement for a table."""
+    placeholders = ", ".join("?" for _ in columns)
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def _page_query(
+    table: str,
+    group_column: str,
+    group_id: str,
+    order: str,
+    after: Optional[tuple],
+    limit: Optional[int],
+    where: Optional[Filter],
+) -> tuple[str, list]:
+    """Build a keyset pagination query over (order column, id).
+
+    The order column comes from SORT_KEYS, never from user input.
+
+    Returns:
+        Tuple of (SQL, parameters)
+    """
+    if order not in SORT_KEYS:
+        raise ValueError(f"Unknown sort order: {order}")
+
+    conditions = [f"{group_column} = ?"]
+    params: list = [group_id]
+    if after is not None:
+        conditions.append(f"({order}, id) > (?, ?)")
+        params += after
+    if where is not None:
+        if where.is_active is not None:
+            conditions.append("is_active = ?")
+            params.append(int(where.is_active))
+        if where.has_github is not None:
+            conditions.append("COALESCE(github_url, '') " + ("!= ''" if where.has_github else "= ''"))
+        if where.name_contains is not None:
+            pattern = where.name_contains.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("name LIKE ? ESCAPE '\\'")
+            params.append(f"%{pattern}%")
+        if where.created_after is not None:
+            # Same text form as the stored timestamps
+            conditions.append("created_at > ?")
+            params.append(timestamp_key(where.created_after))
+
+    params.append(-1 if limit is None else limit + 1)
+    sql = f"SELECT * FROM {table} WHERE {' AND '.join(conditions)} ORDER BY {order}, id LIMIT ?"
+    return sql, params
+
+
+def _row_values(data: dict, columns: tuple[str, ...]) -> tuple:
+    """Pick column values out of a JSON-mode model dump."""
+    return tuple(data.get(column) for column in columns)
+
+
+def _dump(model, table: str) -> dict:
+    """Dump a model in JSON mode, with its timestamps as timestamp_key() text."""
+    data = model.model_dump(mode="json")
+    for column in TIMESTAMP_COLUMNS[table]:
+        value = getattr(model, column)
+        if value is not None:
+            data[column] = timestamp_key(value)
+    return data
+
+
+class SQLiteBackend(StorageBackend):
+    """SQLite database backend."""
+
+    name = "sqlite"
+
+    def __init__(self, path: Path, durability: str = DEFAULT_MODE):
+        self.path = path
+        self.durability = durability
+        self.conn = connect(path)
+        self.conn.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS[durability]}")
+
+    def _api_keys(self, user_id: str) -> list[APIKey]:
+        """Get API keys of a user."""
+        rows = self.conn.execute(
+            "SELECT * FROM api_keys WHERE user_id = ? ORDER BY rowid", (user_id,)
+        )
+        return [APIKey.model_validate(dict(row)) for row in rows]
+
+    def _user(self, row: Optional[sqlite3.Row]) -> Optional[User]:
+        """Build a User (with its API keys) from a users row."""
+        if row is None:
+            return None
+        return User.model_validate({**dict(row), "api_keys": self._api_keys(row["id"])})
+
+    def _insert_user(self, user: User) -> None:
+        """Insert a user row and its API keys."""
+        data = _dump(user, "users")
+        self.conn.execute(_insert_sql("users", USER_COLUMNS), _row_values(data, USER_COLUMNS))
+        for api_key in user.api_keys:
+            self._insert_api_key(user.id, api_key)
+
+    def _insert_api_key(self, user_id: str, api_key: APIKey) -> None:
+        """Insert an API key row."""
+        data = {**_dump(api_key, "api_keys"), "user_id": user_id}
+        self.conn.execute(
+            _insert_sql("api_keys", API_KEY_COLUMNS), _row_values(data, API_KEY_COLUMNS)
+        )
+
+    def _insert_organization(self, org: Organization) -> None:
+        """Insert an organization row."""
+        self.conn.execute(
+            _insert_sql("organizations", ORGANIZATION_COLUMNS),
+            _row_values(_dump(org, "organizations"), ORGANIZATION_COLUMNS),
+        )
+
+    def _insert_project(self, project: Project) -> None:
+        """Insert a project row."""
+        self.conn.execute(
+            _insert_sql("projects", PROJECT_COLUMNS),
+            _row_values(_dump(project, "projects"), PROJECT_COLUMNS),
+        )
+
+    def load(self) -> Database:
+        """Load every table into a Database."""
+        api_keys: dict[str, list[dict]] = {}
+        for row in self.conn.execute("SELECT * FROM api_keys ORDER BY rowid"):
+            api_keys.setdefault(row["user_id"], []).append(dict(row))
+
+        users = [
+            {**dict(row), "api_keys": api_keys.get(row["id"], [])}
+            for row in self.conn.execute("SELECT * FROM users ORDER BY rowid")
+        ]
+        organizations = [
+            dict(row) for row in self.conn.execute("SELECT * FROM organizations ORDER BY rowid")
+        ]
+        projects = [
+            dict(row) for row in self.conn.execute("SELECT * FROM projects ORDER BY rowid")
+        ]
+        return Database(users=users, organizations=organizations, projects=projects)
+
+    def _replace_all(self, db: Database) -> None:
+        """Replace the content of every table, without committing."""
+        for table in ("api_keys", "users", "organizations", "projects"):
+            self.conn.execute(f"DELETE FROM {table}")
+        for user in db.users:
+            self._insert_user(user)
+        for org in db.organizations:
+            self._insert_organization(org)
+        for project in db.projects:
+            self._insert_project(project)
+
+    def save(self, db: Database) -> None:
+        """Replace the content of every table with the given Database."""
+        with self.conn:
+            self._replace_all(db)
+
+    def begin(self) -> "SQLiteTransaction":
+        """Start a database transaction."""
+        return SQLiteTransaction(self.path, self.durability)
+
+    def compact(self) -> None:
+        """Rebuild the database file to reclaim free pages."""
+        self.conn.execute("VACUUM")
+
+    def find_user_by_email(self, email: str) -> Optional[User]:
+        """Find user by email."""
+        row = self.conn.execute("SELECT * FROM users WHERE email = ?", (email,)).fetchone()
+        return self._user(row)
+
+    def find_organization_by_slug(self, slug: str) -> Optional[Organization]:
+        """Find organization by slug."""
+        row = self.conn.execute(
+            "SELECT * FROM organizations WHERE slug = ?", (slug,)
+        ).fetchone()
+        return Organization.model_validate(dict(row)) if row else None
+
+    def find_project_by_slug(self, organization_id: str, slug: str) -> Optional[Project]:
+        """Find project by slug within organization."""
+        row = self.conn.execute(
+            "SELECT * FROM projects WHERE organization_id = ? AND slug = ?",
+            (organization_id, slug),
+        ).fetchone()
+        return Project.model_validate(dict(row)) if row else None
+
+    def find_projects_by_organization(self, organization_id: str) -> list[Project]:
+        """Find all projects within organization."""
+        rows = self.conn.execute(
+            "SELECT * FROM projects WHERE organization_id = ? ORDER BY rowid",
+            (organization_id,),
+        )
+        return [Project.model_validate(dict(row)) for row in rows]
+
+    def find_organizations_by_owner(self, owner_id: str) -> list[Organization]:
+        """Find all organizations owned by user."""
+        rows = self.conn.execute(
+            "SELECT * FROM organizations WHERE owner_id = ? ORDER BY rowid", (owner_id,)
+        )
+        return [Organization.model_validate(dict(row)) for row in rows]
+
+    def slug_exists_in_organizations(self, slug: str) -> bool:
+        """Check if organization slug exists."""
+        row = self.conn.execute("SELECT 1 FROM organizations WHERE slug = ?", (slug,))
+        return row.fetchone() is not None
+
+    def slug_exists_in_projects(self, organization_id: str, slug: str) -> bool:
+        """Check if project slug exists within organization."""
+        row = self.conn.execute(
+            "SELECT 1 FROM projects WHERE organization_id = ? AND slug = ?",
+            (organization_id, slug),
+        )
+        return row.fetchone() is not None
+
+    def _page(
+        self, table: str, group_column: str, group_id: str, order: str, after, limit, where
+    ) -> tuple[list[sqlite3.Row], Optional[tuple]]:
+        """Run a keyset pagination query, fetching one extra row to detect more."""
+        sql, params = _page_query(table, group_column, group_id, order, after, limit, where)
+        rows = self.conn.execute(sql, params).fetchall()
+        if limit is None or len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, (rows[-1][order], rows[-1]["id"])
+
+    def count_projects(self, organization_ids: list[str]) -> dict[str, ProjectCounts]:
+        """Get project counts from the trigger-maintained project_counts table."""
+        counts = {org_id: ProjectCounts() for org_id in organization_ids}
+        # Stay below SQLite's limit on query parameters
+        for start in range(0, len(organization_ids), 500):
+            chunk = organization_ids[start : start + 500]
+            rows = self.conn.execute(
+                "SELECT * FROM project_counts WHERE organization_id IN "
+                f"({', '.join('?' for _ in chunk)})",
+                chunk,
+            )
+            for row in rows:
+                counts[row["organization_id"]] = ProjectCounts(row["active"], row["inactive"])
+        return counts
+
+    def page_projects(
+        self,
+        organization_id: str,
+        order: str = "created_at",
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        where: Optional[Filter] = None,
+    ) -> tuple[list[Project], Optional[tuple]]:
+        """Get one page of an organization's matching projects through an index."""
+        rows, next_key = self._page(
+            "projects", "organization_id", organization_id, order, after, limit, where
+        )
+        return [Project.model_validate(dict(row)) for row in rows], next_key
+
+    def page_organizations(
+        self,
+        owner_id: str,
+        order: str = "created_at",
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        where: Optional[Filter] = None,
+    ) -> tuple[list[Organization], Optional[tuple]]:
+        """Get one page of a user's matching organizations through an index."""
+        if where is not None:
+            where = where._replace(is_active=None, has_github=None)
+        rows, next_key = self._page("organizations", "owner_id", owner_id, order, after, limit, where)
+        return [Organization.model_validate(dict(row)) for row in rows], next_key
+
+    def iter_users(self) -> Iterator[User]:
+        """Iterate over every user, reading rows from a cursor."""
+        for row in self.conn.execute("SELECT * FROM users ORDER BY rowid"):
+            yield self._user(row)
+
+    def iter_organizations(self) -> Iterator[Organization]:
+        """Iterate over every organization, reading rows from a cursor."""
+        for row in self.conn.execute("SELECT * FROM organizations ORDER BY rowid"):
+            yield Organization.model_validate(dict(row))
+
+    def iter_projects(self, organization_id: Optional[str] = None) -> Iterator[Project]:
+        """Iterate over projects, reading rows from a cursor."""
+        if organization_id is None:
+            rows = self.conn.execute("SELECT * FROM projects ORDER BY rowid")
+        else:
+            rows = self.conn.execute(
+                "SELECT * FROM projects WHERE organization_id = ? ORDER BY rowid",
+                (organization_id,),
+            )
+        for row in rows:
+            yield Project.model_validate(dict(row))
+
+    def add_user(self, user: User) -> None:
+        """Store a new user (with its API keys)."""
+        with self.conn:
+            self._insert_user(user)
+
+    def add_api_key(self, user_id: str, api_key: APIKey) -> None:
+        """Store a new API key for an existing user."""
+        with self.conn:
+            self._insert_api_key(user_id, api_key)
+
+    def add_organization(self, org: Organization) -> None:
+        """Store a new organization."""
+        with self.conn:
+            self._insert_organization(org)
+
+    def add_project(self, project: Project) -> None:
+        """Store a new project."""
+        with self.conn:
+            self._insert_project(project)
+
+
+class SQLiteTransaction(SQLiteBackend):
+    """SQLite transaction.
+
+    Holds the database write lock from the start (BEGIN IMMEDIATE) and
+    runs every statement on the shared connection, so lookups see the
+    pending inserts.
+    """
+
+    def __init__(self, path: Path, durability: str = DEFAULT_MODE):
+        super().__init__(path, durability)
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self) -> None:
+        """Commit the transaction."""
+        self.conn.commit()
+
+    def rollback(self) -> None:
+        """Roll the transaction back."""
+        self.conn.rollback()
+
+    def save(self, db: Database) -> None:
+        """Replace the content of every table when the transaction commits."""
+        self._replace_all(db)
+
+    def add_user(self, user: User) -> None:
+        """Store a new user (with its API keys)."""
+        self._insert_user(user)
+
+    def add_api_key(self, user_id: str, api_key: APIKey) -> None:
+        """Store a new API key for an existing user."""
+        self._insert_api_key(user_id, api_key)
+
+    def add_organization(self, org: Organization) -> None:
+        """Store a new organization."""
+        self._insert_organization(org)
+
+    def add_project(self, project: Project) -> None:
+        """Store a new project."""
+        self._insert_project(project)
@@ -1,14 +1,33 @@
 """Storage layer for AgentFlow CLI data."""
 
-import json
+import os
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import ContextManager, Iterator, Optional
 
-from agentflow.models import Database, User, Organization, Project
+from pydantic import BaseModel
+
+from agentflow import completion, durability, journal, paths, serializers, snapshot_cache
+from agentflow.index import Filter
+from agentflow.locking import ConflictError, get_lock
+from agentflow.models import Database, User, APIKey, Organization, Project, ProjectCounts
+from agentflow.search import SearchIndex, SearchResult
+from agentflow.utils.config import get_storage_backend, get_storage_durability, get_storage_format
 
 # File paths
-DATA_DIR = Path.home() / ".agentflow"
-DATA_FILE = DATA_DIR / "data.json"
+DATA_DIR = paths.DATA_DIR
+DATA_FILE = paths.DATA_FILE
+SQLITE_FILE_NAME = "data.db"
+SEARCH_FILE_NAME = "search.db"
+
+# Storage backends (selected by env var, then config, then default)
+BACKEND_ENV_VAR = "AGENTFLOW_STORAGE"
+BACKENDS = ("json", "sqlite", "sharded")
+DEFAULT_BACKEND = "json"
+FORMAT_ENV_VAR = "AGENTFLOW_STORAGE_FORMAT"
+
+# The journal is compacted once it is larger than both this and the snapshot
+JOURNAL_COMPACT_MIN_BYTES = 256 * 1024
 
 
 def ensure_data_dir() -> None:
@@ -16,26 +35,735 @@ def ensure_data_dir() -> None:
     DATA_DIR.mkdir(exist_ok=True)
 
 
-def load_database() -> Database:
-    """Load database from JSON file.
+def get_sqlite_file() -> Path:
+    """Get path of the SQLite database file."""
+    return DATA_DIR / SQLITE_FILE_NAME
+
+
+def get_search_file() -> Path:
+    """Get path of the search index file."""
+    return DATA_DIR / SEARCH_FILE_NAME
+
+
+def get_completion_dir() -> Path:
+    """Get path of the shell completion cache directory."""
+    return DATA_DIR / completion.CACHE_DIR_NAME
+
+
+def get_journal_file() -> Path:
+    """Get path of the JSON backend's mutation journal."""
+    return DATA_FILE.with_suffix(".journal")
+
+
+def get_lock_file() -> Path:
+    """Get path of the data lock file of the JSON and sharded backends (see agentflow.locking)."""
+    return DATA_FILE.with_suffix(".lock")
+
+
+def _file_signature(path: Path) -> Optional[tuple[int, int, int]]:
+    """Get (mtime, size, inode) of a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class _CachedDatabase:
+    """A parsed database and the on-disk state it reflects."""
+
+    def __init__(
+        self,
+        db: Database,
+        snapshot: Optional[tuple[int, int, int]],
+        journal_inode: Optional[int] = None,
+        journal_offset: int = 0,
+    ):
+        self.db = db
+        self.snapshot = snapshot
+        self.journal_inode = journal_inode
+        self.journal_offset = journal_offset
+
 
-    Returns an empty Database if the file doesn't exist.
+# Parsed databases per data file
+_cache: dict[Path, _CachedDatabase] = {}
+
+
+def clear_cache() -> None:
+    """Drop every cached database so the next load re-reads the file."""
+    _cache.clear()
+
+
+class StorageBackend:
+    """Base class for storage backends.
+
+    Subclasses must implement load() and save(). Lookups and inserts
+    default to working on the whole loaded Database through its index;
+    backends with native queries override them.
     """
-    if not DATA_FILE.exists():
-        return Database()
 
-    with open(DATA_FILE, "r") as f:
-        data = json.load(f)
+    name = ""
 
-    return Database(**data)
+    def load(self) -> Database:
+        """Load the whole database."""
+        raise NotImplementedError
 
+    def save(self, db: Database) -> None:
+        """Replace the whole database."""
+        raise NotImplementedError
+
+    def compact(self) -> None:
+        """Reclaim space and fold pending writes into the main store."""
+
+    def find_user_by_email(self, email: str) -> Optional[User]:
+        """Find user by email."""
+        return self.load().index.user_by_email(email)
+
+    def find_organization_by_slug(self, slug: str) -> Optional[Organization]:
+        """Find organization by slug."""
+        return self.load().index.organization_by_slug(slug)
+
+    def find_project_by_slug(self, organization_id: str, slug: str) -> Optional[Project]:
+        """Find project by slug within organization."""
+        return self.load().index.project_by_slug(organization_id, slug)
+
+    def find_projects_by_organization(self, organization_id: str) -> list[Project]:
+        """Find all projects within organization."""
+        return self.load().index.projects_in_organization(organization_id)
+
+    def find_organizations_by_owner(self, owner_id: str) -> list[Organization]:
+        """Find all organizations owned by user."""
+        return self.load().index.organizations_owned_by(owner_id)
+
+    def slug_exists_in_organizations(self, slug: str) -> bool:
+        """Check if organization slug exists."""
+        return self.find_organization_by_slug(slug) is not None
+
+    def count_projects(self, organization_ids: list[str]) -> dict[str, ProjectCounts]:
+        """Get the project counts of several organizations."""
+        index = self.load().index
+        return {org_id: index.count_projects(org_id) for org_id in organization_ids}
+
+    def page_projects(
+        self,
+        organization_id: str,
+        order: str = "created_at",
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        where: Optional[Filter] = None,
+    ) -> tuple[list[Project], Optional[tuple]]:
+        """Get one page of an organization's matching projects, in sort key order."""
+        return self.load().index.page("projects", organization_id, order, after, limit, where)
+
+    def page_organizations(
+        self,
+        owner_id: str,
+        order: str = "created_at",
+        after: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        where: Optional[Filter] = None,
+    ) -> tuple[list[Organization], Optional[tuple]]:
+        """Get one page of a user's matching organizations, in sort key order."""
+        return self.load().index.page("organizations", owner_id, order, after, limit, where)
+
+    def iter_users(self) -> Iterator[User]:
+        """Iterate over every user, in insertion order."""
+        yield from self.load().users
+
+    def iter_organizations(self) -> Iterator[Organization]:
+        """Iterate over every organization, in insertion order."""
+        yield from self.load().organizations
+
+    def iter_projects(self, organization_id: Optional[str] = None) -> Iterator[Project]:
+        """Iterate over projects, optionally of one organization only."""
+        if organization_id is None:
+            yield from self.load().projects
+        else:
+            yield from self.find_projects_by_organization(organization_id)
+
+    def slug_exists_in_projects(self, organization_id: str, slug: str) -> bool:
+        """Check if project slug exists within organization."""
+        return self.find_project_by_slug(organization_id, slug) is not None
+
+    def begin(self) -> "StorageBackend":
+        """Start a transaction on this backend."""
+        return Transaction(self)
+
+    def persist(self, db: Database, entries: list[dict]) -> None:
+        """Persist the changes of a committed transaction.
+
+        Args:
+            db: Database with the changes applied
+            entries: Journal entries describing the changes
+        """
+        self.save(db)
+
+    def discard(self) -> None:
+        """Discard in-memory state touched by a rolled back transaction."""
+
+    def lock(self) -> ContextManager[None]:
+        """Keep other processes from writing while a transaction commits."""
+        return nullcontext()
+
+    def refresh(self, db: Database, entries: list[dict]) -> Database:
+        """Catch up with what other processes committed since db was loaded.
+
+        Called with lock() held, before persisting a transaction.
+        Backends whose transactions lock their store from the start never
+        see concurrent writes.
+
+        Args:
+            db: Loaded Database, with the transaction's changes applied
+            entries: Journal entries describing those changes
+
+        Returns:
+            The Database to persist: the latest committed data with the
+            changes applied (db itself if nothing was committed meanwhile)
+
+        Raises:
+            ConflictError: If the changes clash with the latest data
+        """
+        return db
+
+    def add_user(self, user: User) -> None:
+        """Store a new user (with its API keys)."""
+        tx = self.begin()
+        tx.add_user(user)
+        tx.commit()
+
+    def add_api_key(self, user_id: str, api_key: APIKey) -> None:
+        """Store a new API key for an existing user."""
+        tx = self.begin()
+        tx.add_api_key(user_id, api_key)
+        tx.commit()
+
+    def add_organization(self, org: Organization) -> None:
+        """Store a new organization."""
+        tx = self.begin()
+        tx.add_organization(org)
+        tx.commit()
+
+    def add_project(self, project: Project) -> None:
+        """Store a new project."""
+        tx = self.begin()
+        tx.add_project(project)
+        tx.commit()
+
+
+class Transaction(StorageBackend):
+    """Unit of work over a backend's loaded Database.
+
+    Loads once, applies mutations in memory (so lookups see them) and
+    records them as journal entries. commit() hands everything to the
+    backend in a single write; rollback() discards it.
+
+    Other processes aren't locked out while the transaction runs. If one
+    of them commits first, commit() re-applies the journal entries onto
+    the latest data rather than overwriting its changes.
+    """
+
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+        self.name = backend.name
+        self.db = backend.load()
+        self.version = self.db.version
+        self.entries: list[dict] = []
+        self.replaced = False
+
+    def load(self) -> Database:
+        """Get the transaction's Database."""
+        return self.db
+
+    def save(self, db: Database) -> None:
+        """Replace the whole database when the transaction commits."""
+        self.db = db
+        self.entries = []
+        self.replaced = True
+
+    def commit(self) -> None:
+        """Write every change of the transaction at once.
+
+        A replaced database is only written if no other process
+        committed since the transaction loaded it.
+
+        Raises:
+            ConflictError: If another process committed first and the
+                transaction's changes can't be re-applied onto its data
+        """
+        if not self.replaced and not self.entries:
+            return
+
+        with self.backend.lock():
+            try:
+                if self.replaced:
+                    if self.backend.load().version != self.version:
+                        raise ConflictError(
+                            "The data was changed by another process while it was being replaced"
+                        )
+                    self.backend.save(self.db)
+                else:
+                    self.db = self.backend.refresh(self.db, self.entries)
+                    self.backend.persist(self.db, self.entries)
+            except ConflictError:
+                self.backend.discard()
+                raise
+
+    def rollback(self) -> None:
+        """Discard the changes of the transaction."""
+        self.backend.discard()
+
+    def add_user(self, user: User) -> None:
+        """Store a new user (with its API keys)."""
+        self.db.add_user(user)
+        self.entries.append(journal.make_entry("insert", "users", user))
+
+    def add_api_key(self, user_id: str, api_key: APIKey) -> None:
+        """Store a new API key for an existing user."""
+        self.db.index.users_by_id[user_id].api_keys.append(api_key)
+        self.entries.append(journal.make_entry("insert", "api_keys", api_key, user_id=user_id))
+
+    def add_organization(self, org: Organization) -> None:
+        """Store a new organization."""
+        self.db.add_organization(org)
+        self.entries.append(journal.make_entry("insert", "organizations", org))
+
+    def add_project(self, project: Project) -> None:
+        """Store a new project."""
+        self.db.add_project(project)
+        self.entries.append(journal.make_entry("insert", "projects", project))
+
+
+# Unique value each collection's inserts claim, for conflict messages
+_UNIQUE_NAMES = {"users": "Email", "organizations": "Organization slug", "projects": "Project slug"}
+
+
+def _unique_key(entry: dict) -> Optional[tuple]:
+    """Get the unique value a journal entry claims, such as a project slug.
+
+    Returns:
+        (collection, value...) for inserts of users, organizations and
+        projects, None otherwise
+    """
+    if entry["op"] != "insert" or entry["collection"] not in _UNIQUE_NAMES:
+        return None
+    record = entry["record"]
+    if entry["collection"] == "users":
+        return ("users", record["email"])
+    if entry["collection"] == "organizations":
+        return ("organizations", record["slug"])
+    return ("projects", record["organization_id"], record["slug"])
+
+
+def _find_by_key(db: Database, key: tuple) -> Optional[BaseModel]:
+    """Find the record holding a unique value (see _unique_key)."""
+    if key[0] == "users":
+        return db.index.user_by_email(key[1])
+    if key[0] == "organizations":
+        return db.index.organization_by_slug(key[1])
+    return db.index.project_by_slug(key[1], key[2])
+
+
+def _conflict(key: tuple) -> ConflictError:
+    """Build the error for a unique value taken by another process."""
+    return ConflictError(f"{_UNIQUE_NAMES[key[0]]} '{key[-1]}' was taken by another process")
+
+
+def _check_users(db: Database, entries: list[dict]) -> None:
+    """Check that the users of inserted API keys still exist."""
+    for entry in entries:
+        if entry["collection"] == "api_keys" and entry["user_id"] not in db.index.users_by_id:
+            raise ConflictError("The user was removed by another process")
+
+
+def _flatten(entries: list[dict]) -> Iterator[dict]:
+    """Iterate over journal entries, unwrapping batches."""
+    for entry in entries:
+        if entry["op"] == "batch":
+            yield from _flatten(entry["entries"])
+        else:
+            yield entry
+
+
+def _move_to_end(db: Database, entries: list[dict]) -> None:
+    """Move the records inserted by entries behind the other records.
+
+    A transaction applies its changes before catching up with the ones
+    other processes committed first; this restores the order replaying
+    the journal gives.
+    """
+    ids = {entry["record"]["id"] for entry in entries if entry["op"] == "insert"}
+    lists = [db.users, db.organizations, db.projects]
+    lists += [
+        db.index.users_by_id[entry["user_id"]].api_keys
+        for entry in entries
+        if entry["collection"] == "api_keys"
+    ]
+    for records in lists:
+        if any(record.id in ids for record in records):
+            records[:] = [r for r in records if r.id not in ids] + [r for r in records if r.id in ids]
+
+
+class JSONBackend(StorageBackend):
+    """Single JSON file backend (the default).
+
+    Committed transactions are appended to a journal next to data.json
+    instead of rewriting it; the journal is folded back into the snapshot
+    once it outgrows it (see compact).
+
+    Reads hold the lock file shared and writes exclusively, so processes
+    never see each other's files half-updated. Every write bumps the
+    database version, which transactions use to detect that another
+    process committed since they loaded the data (see Transaction).
+    """
+
+    name = "json"
+
+    def load(self) -> Database:
+        """Load database from the JSON snapshot and its journal.
+
+        The parsed Database is cached for the lifetime of the process and
+        reused as long as the snapshot's mtime, size and inode are
+        unchanged; entries appended to the journal since the last load
+        are replayed onto it. Across processes, a snapshot whose content
+        was already validated is rebuilt from the snapshot cache.
+
+        Callers that mutate the returned Database must save it (or call
+        clear_cache) so the cache never holds unsaved changes.
+
+        Returns an empty Database if nothing has been stored yet.
+        """
+        with get_lock(get_lock_file()).shared():
+            return self._load()
+
+    def _load(self) -> Database:
+        """Load the database; see load()."""
+        snapshot = _file_signature(DATA_FILE)
+        journal_state = _file_signature(get_journal_file())
+
+        cached = _cache.get(DATA_FILE)
+        if (
+            cached is None
+            or cached.snapshot != snapshot
+            or not self._can_resume(cached, journal_state)
+        ):
+            if snapshot is None:
+                db = Database()
+            else:
+                db = snapshot_cache.load(DATA_FILE, DATA_FILE.read_bytes())
+            cached = _CachedDatabase(db, snapshot)
+            _cache[DATA_FILE] = cached
+
+        if journal_state is not None and journal_state[1] > cached.journal_offset:
+            entries, cached.journal_offset = journal.read_entries(
+                get_journal_file(), cached.journal_offset
+            )
+            for entry in entries:
+                journal.apply_entry(cached.db, entry)
+            cached.journal_inode = journal_state[2]
+
+        return cached.db
+
+    @staticmethod
+    def _can_resume(
+        cached: _CachedDatabase, journal_state: Optional[tuple[int, int, int]]
+    ) -> bool:
+        """Check that a cached database only lacks journal entries appended since."""
+        if journal_state is None:
+            return cached.journal_offset == 0
+        if cached.journal_offset == 0:
+            return True
+        return (
+            journal_state[2] == cached.journal_inode
+            and journal_state[1] >= cached.journal_offset
+        )
+
+    def lock(self) -> ContextManager[None]:
+        """Hold the lock file exclusively."""
+        return get_lock(get_lock_file()).exclusive()
+
+    def refresh(self, db: Database, entries: list[dict]) -> Database:
+        """Catch up with what other processes committed since db was loaded.
+
+        When they only appended to the journal, their entries are replayed
+        onto db, and conflict if they claim a slug or email the
+        transaction's entries claim for another record. When the snapshot
+        was rewritten, the transaction's entries are re-applied onto a
+        fresh load instead.
+        """
+        cached = _cache.get(DATA_FILE)
+        journal_state = _file_signature(get_journal_file())
+        if (
+            cached is None
+            or cached.db is not db
+            or cached.snapshot != _file_signature(DATA_FILE)
+            or not self._can_resume(cached, journal_state)
+        ):
+            self.discard()
+            latest = self.load()
+            for entry in entries:
+                key = _unique_key(entry)
+                existing = _find_by_key(latest, key) if key else None
+                if existing is not None and existing.id != entry["record"]["id"]:
+                    raise _conflict(key)
+            _check_users(latest, entries)
+            for entry in entries:
+                journal.apply_entry(latest, entry)
+            return latest
+
+        if journal_state is None or journal_state[1] == cached.journal_offset:
+            return db
+
+        others, cached.journal_offset = journal.read_entries(
+            get_journal_file(), cached.journal_offset
+        )
+        cached.journal_inode = journal_state[2]
+        claimed = {_unique_key(entry): entry["record"]["id"] for entry in entries}
+        claimed.pop(None, None)
+        for entry in _flatten(others):
+            key = _unique_key(entry)
+            if key in claimed and claimed[key] != entry["record"]["id"]:
+                raise _conflict(key)
+        for entry in others:
+            journal.apply_entry(db, entry)
+        _check_users(db, entries)
+        _move_to_end(db, entries)
+        return db
+
+    def save(self, db: Database) -> None:
+        """Write a full snapshot, drop the journal and update the cache.
+
+        The snapshot is stamped with the version following the stored one.
+        """
+        with self.lock():
+            ensure_data_dir()
+            db.version = max(db.version, self.load().version) + 1
+
+            data = serialize_database(db, get_format_name())
+            durability.write_atomic(DATA_FILE, data, get_durability())
+            get_journal_file().unlink(missing_ok=True)
+            snapshot_cache.store(DATA_FILE, data, db)
+
+            _cache[DATA_FILE] = _CachedDatabase(db, _file_signature(DATA_FILE))
+
+    def compact(self) -> None:
+        """Fold the journal back into the snapshot."""
+        with self.lock():
+            if get_journal_file().exists():
+                self.save(self.load())
+
+    def persist(self, db: Database, entries: list[dict]) -> None:
+        """Append a transaction's entries to the journal as one line.
+
+        The line is stamped with the version following the database's.
+        The cached Database already has the changes applied, so it is
+        kept as long as no other process appended to the journal in
+        between. The journal is compacted once it outgrows the snapshot.
+        """
+        with self.lock():
+            ensure_data_dir()
+            db.version += 1
+            start, end = journal.append_entries(get_journal_file(), entries, db.version)
+            durability.sync(get_journal_file(), get_durability(), directory=start == 0)
+
+            cached = _cache.get(DATA_FILE)
+            if cached is not None and cached.db is db and cached.journal_offset == start:
+                cached.journal_offset = end
+                cached.journal_inode = get_journal_file().stat().st_ino
+            else:
+                _cache.pop(DATA_FILE, None)
+
+            snapshot = _file_signature(DATA_FILE)
+            if end > max(JOURNAL_COMPACT_MIN_BYTES, snapshot[1] if snapshot else 0):
+                self.compact()
+
+    def discard(self) -> None:
+        """Drop the cached Database, which may hold uncommitted changes."""
+        _cache.pop(DATA_FILE, None)
+
+
+def serialize_database(db: Database, fmt: str) -> bytes:
+    """Serialize a database snapshot in one of the serializers.FORMATS.
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    return serializers.dumps(db, fmt)
+
+
+def get_format_name() -> str:
+    """Get the on-disk format used when writing the JSON backend's snapshot.
+
+    The AGENTFLOW_STORAGE_FORMAT environment variable wins over the
+    ``storage_format`` config key; defaults to "json". Reads detect the
+    format by content, so it can be changed at any time.
+
+    Raises:
+        ValueError: If the selected format is unknown
+    """
+    fmt = os.environ.get(FORMAT_ENV_VAR) or get_storage_format() or serializers.DEFAULT_FORMAT
+    if fmt not in serializers.FORMATS:
+        raise ValueError(
+            f"Unknown storage format '{fmt}' "
+            f"(expected one of: {', '.join(serializers.FORMATS)})"
+        )
+    return fmt
+
+
+def get_durability() -> str:
+    """Get the durability mode of data writes (see agentflow.durability).
+
+    The AGENTFLOW_DURABILITY environment variable wins over the
+    ``storage_durability`` config key; defaults to "strict".
+
+    Raises:
+        ValueError: If the selected mode is unknown
+    """
+    return durability.get_mode(get_storage_durability())
+
+
+def get_backend_name() -> str:
+    """Get the selected storage backend name.
+
+    The AGENTFLOW_STORAGE environment variable wins over the
+    ``storage_backend`` config key; defaults to "json".
+
+    Raises:
+        ValueError: If the selected backend is unknown
+    """
+    name = os.environ.get(BACKEND_ENV_VAR) or get_storage_backend() or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown storage backend '{name}' (expected one of: {', '.join(BACKENDS)})"
+        )
+    return name
 
-def save_database(db: Database) -> None:
-    """Save database to JSON file."""
-    ensure_data_dir()
 
-    with open(DATA_FILE, "w") as f:
-        f.write(db.model_dump_json(indent=2))
+def get_backend(name: Optional[str] = None) -> StorageBackend:
+    """Get a storage backend.
+
+    Args:
+        name: Backend name (uses the selected backend if not provided)
+
+    Returns:
+        Storage backend instance
+    """
+    name = name or get_backend_name()
+    if name == "sqlite":
+        from agentflow.sqlite_backend import SQLiteBackend
+
+        return SQLiteBackend(get_sqlite_file(), get_durability())
+    if name == "sharded":
+        from agentflow.sharded_backend import ShardedBackend
+
+        return ShardedBackend()
+    return JSONBackend()
+
+
+# Transaction that module-level functions currently run in
+_active_transaction: Optional[StorageBackend] = None
+
+
+# Index updates waiting for the active transaction to commit
+_index_changes: list = []
+
+
+def _current() -> StorageBackend:
+    """Get the active transaction, or the selected backend outside one."""
+    return _active_transaction or get_backend()
+
+
+def _record_change(change) -> None:
+    """Queue a written record or a saved Database for the indexes.
+
+    Outside a transaction the indexes are updated right away.
+    """
+    if _active_transaction is not None:
+        _index_changes.append(change)
+    else:
+        _update_indexes([change])
+
+
+def _update_indexes(changes: list) -> None:
+    """Apply written changes to the search index and the completion cache.
+
+    Nothing is done for an index that doesn't exist yet: the first
+    search builds the search index, the first completion the cache
+    (see search() and ensure_completion_cache()).
+    """
+    if not changes:
+        return
+
+    if get_completion_dir().exists():
+        completion.update_cache(get_completion_dir(), changes)
+
+    if not get_search_file().exists():
+        return
+
+    index = SearchIndex(get_search_file())
+    records: list = []
+    for change in changes:
+        if isinstance(change, Database):
+            # The saved Database already holds the records added before it
+            records = []
+            index.sync(change.users, change.organizations, change.projects)
+        elif not isinstance(change, tuple):
+            records.append(change)
+    index.add(records)
+
+
+@contextmanager
+def transaction() -> Iterator[StorageBackend]:
+    """Group storage calls into a single unit of work.
+
+    The database is loaded once; every storage function called inside the
+    block (or method called on the yielded transaction) sees the pending
+    changes. On exit the changes are flushed in one write, or discarded if
+    the block raised. Nested transactions join the outermost one. In the
+    batched durability mode, the directories and journal written by the
+    commit are synced together as one group commit.
+
+    Records added and databases saved through the module functions are
+    passed to the search index and the completion cache once the
+    transaction has committed.
+
+    Yields:
+        The transaction, with the same methods as a storage backend
+    """
+    global _active_transaction
+
+    if _active_transaction is not None:
+        yield _active_transaction
+        return
+
+    tx = get_backend().begin()
+    _active_transaction = tx
+    try:
+        yield tx
+    except BaseException:
+        tx.rollback()
+        raise
+    else:
+        with durability.group_commit():
+            tx.commit()
+        _update_indexes(_index_changes)
+    finally:
+        _active_transaction = None
+        _index_changes.clear()
+
+
+def load_database() -> Database:
+    """Load the whole database from the selected backend.
+
+    Returns an empty Database if nothing has been stored yet.
+    """
+    return _current().load()
+
+
+def save_database(db: Database) -> None:
+    """Replace the whole database in the selected backend."""
+    with durability.group_commit():
+        _current().save(db)
+    _record_change(db)
 
 
 def find_user_by_email(email: str) -> Optional[User]:
@@ -47,11 +775,7 @@ def find_user_by_email(email: str) -> Optional[User]:
     Returns:
         User if found, None otherwise
     """
-    db = load_database()
-    for user in db.users:
-        if user.email == email:
-            return user
-    return None
+    return _current().find_user_by_email(email)
 
 
 def find_organization_by_slug(slug: str) -> Optional[Organization]:
@@ -63,11 +787,7 @@ def find_organization_by_slug(slug: str) -> Optional[Organization]:
     Returns:
         Organization if found, None otherwise
     """
-    db = load_database()
-    for org in db.organizations:
-        if org.slug == slug:
-            return org
-    return None
+    return _current().find_organization_by_slug(slug)
 
 
 def find_project_by_slug(organization_id: str, slug: str) -> Optional[Project]:
@@ -80,11 +800,7 @@ def find_project_by_slug(organization_id: str, slug: str) -> Optional[Project]:
     Returns:
         Project if found, None otherwise
     """
-    db = load_database()
-    for project in db.projects:
-        if project.organization_id == organization_id and project.slug == slug:
-            return project
-    return None
+    return _current().find_project_by_slug(organization_id, slug)
 
 
 def find_projects_by_organization(organization_id: str) -> list[Project]:
@@ -96,8 +812,7 @@ def find_projects_by_organization(organization_id: str) -> list[Project]:
     Returns:
         List of projects
     """
-    db = load_database()
-    return [p for p in db.projects if p.organization_id == organization_id]
+    return _current().find_projects_by_organization(organization_id)
 
 
 def find_organizations_by_owner(owner_id: str) -> list[Organization]:
@@ -109,8 +824,7 @@ def find_organizations_by_owner(owner_id: str) -> list[Organization]:
     Returns:
         List of organizations
     """
-    db = load_database()
-    return [org for org in db.organizations if org.owner_id == owner_id]
+    return _current().find_organizations_by_owner(owner_id)
 
 
 def slug_exists_in_organizations(slug: str) -> bool:
@@ -122,8 +836,7 @@ def slug_exists_in_organizations(slug: str) -> bool:
     Returns:
         True if slug exists, False otherwise
     """
-    db = load_database()
-    return any(org.slug == slug for org in db.organizations)
+    return _current().slug_exists_in_organizations(slug)
 
 
 def slug_exists_in_projects(organization_id: str, slug: str) -> bool:
@@ -136,7 +849,241 @@ def slug_exists_in_projects(organization_id: str, slug: str) -> bool:
     Returns:
         True if slug exists, False otherwise
     """
-    db = load_database()
-    return any(
-        p.organization_id == organization_id and p.slug == slug for p in db.projects
-    )
+    return _current().slug_exists_in_projects(organization_id, slug)
+
+
+def count_projects(organization_ids: list[str]) -> dict[str, ProjectCounts]:
+    """Get the number of active and inactive projects of organizations.
+
+    Counts are maintained as projects are added, so this doesn't read
+    the projects themselves.
+
+    Args:
+        organization_ids: Organization IDs
+
+    Returns:
+        Dict mapping each organization ID to its project counts
+    """
+    return _current().count_projects(organization_ids)
+
+
+def page_projects(
+    organization_id: str,
+    order: str = "created_at",
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None,
+    where: Optional[Filter] = None,
+) -> tuple[list[Project], Optional[tuple]]:
+    """Query one page of an organization's projects.
+
+    Sorting and filtering happen in the backend: on the ordered indexes
+    of the loaded database, or in SQL for SQLite.
+
+    Args:
+        organization_id: Organization ID
+        order: Sort order, a key of agentflow.index.SORT_KEYS
+        after: Sort key returned with the previous page
+        limit: Maximum number of projects (all if None)
+        where: Conditions the projects must match
+
+    Returns:
+        Tuple of (projects, sort key to pass as `after` for the next
+        page, or None if this is the last page)
+    """
+    return _current().page_projects(organization_id, order, after, limit, where)
+
+
+def page_organizations(
+    owner_id: str,
+    order: str = "created_at",
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None,
+    where: Optional[Filter] = None,
+) -> tuple[list[Organization], Optional[tuple]]:
+    """Query one page of a user's organizations.
+
+    Args:
+        owner_id: User ID
+        order: Sort order, a key of agentflow.index.SORT_KEYS
+        after: Sort key returned with the previous page
+        limit: Maximum number of organizations (all if None)
+        where: Conditions the organizations must match (is_active and
+            has_github don't apply)
+
+    Returns:
+        Tuple of (organizations, sort key to pass as `after` for the next
+        page, or None if this is the last page)
+    """
+    return _current().page_organizations(owner_id, order, after, limit, where)
+
+
+def iter_users() -> Iterator[User]:
+    """Iterate over every user.
+
+    Backends with native queries produce users one at a time instead of
+    building the whole list.
+
+    Yields:
+        Users, in insertion order
+    """
+    yield from _current().iter_users()
+
+
+def iter_organizations() -> Iterator[Organization]:
+    """Iterate over every organization.
+
+    Yields:
+        Organizations, in insertion order
+    """
+    yield from _current().iter_organizations()
+
+
+def iter_projects(organization_id: Optional[str] = None) -> Iterator[Project]:
+    """Iterate over projects.
+
+    Args:
+        organization_id: Only yield projects of this organization
+
+    Yields:
+        Projects, in insertion order
+    """
+    yield from _current().iter_projects(organization_id)
+
+
+def add_user(user: User) -> None:
+    """Store a new user (with its API keys).
+
+    Args:
+        user: User to store
+    """
+    _current().add_user(user)
+    _record_change(user)
+
+
+def add_api_key(user_id: str, api_key: APIKey) -> None:
+    """Store a new API key for an existing user.
+
+    Args:
+        user_id: User ID
+        api_key: API key to store
+    """
+    _current().add_api_key(user_id, api_key)
+    _record_change((user_id, api_key))
+
+
+def add_organization(org: Organization) -> None:
+    """Store a new organization.
+
+    Args:
+        org: Organization to store
+    """
+    _current().add_organization(org)
+    _record_change(org)
+
+
+def add_project(project: Project) -> None:
+    """Store a new project.
+
+    Args:
+        project: Project to store
+    """
+    _current().add_project(project)
+    _record_change(project)
+
+
+def search(query: str, owner_email: Optional[str] = None, limit: int = 20) -> list[SearchResult]:
+    """Search organizations and projects by name, slug, description and GitHub URL.
+
+    The search index is built from the stored data on first use and
+    kept up to date by the write functions afterwards, so searching
+    doesn't load the database.
+
+    Args:
+        query: Search terms
+        owner_email: Only organizations of the user with this email and
+            their projects
+        limit: Maximum number of results
+
+    Returns:
+        Matching records, best first
+    """
+    return _search_index().search(query, owner_email, limit)
+
+
+def similar_slugs(
+    kind: str,
+    slug: str,
+    owner_email: Optional[str] = None,
+    org_slug: Optional[str] = None,
+    limit: int = 3,
+) -> list[str]:
+    """Find the slugs closest to one that wasn't found, for "did you mean".
+
+    Uses the trigram index of the search index, so no data file is loaded.
+
+    Args:
+        kind: "organization" or "project"
+        slug: Slug that wasn't found
+        owner_email: Only organizations of the user with this email
+        org_slug: Only projects of the organization with this slug
+        limit: Maximum number of slugs
+
+    Returns:
+        Similar slugs, closest first
+    """
+    return _search_index().similar_slugs(kind, slug, owner_email, org_slug, limit)
+
+
+def complete_slugs(
+    kind: str,
+    incomplete: str,
+    owner_email: Optional[str] = None,
+    org_slug: Optional[str] = None,
+) -> list[str]:
+    """Complete a partly typed slug from the search index.
+
+    Slugs starting with the typed text come first; when there are none,
+    the closest slugs are offered instead.
+
+    Args:
+        kind: "organization" or "project"
+        incomplete: Text typed so far
+        owner_email: Only organizations of the user with this email
+        org_slug: Only projects of the organization with this slug
+
+    Returns:
+        Candidate slugs
+    """
+    return _search_index().complete_slugs(kind, incomplete, owner_email, org_slug)
+
+
+def ensure_completion_cache() -> Path:
+    """Get the shell completion cache directory, building the cache if missing.
+
+    Returns:
+        Cache directory
+    """
+    cache_dir = get_completion_dir()
+    if not (cache_dir / completion.USERS_FILE).exists():
+        completion.build_cache(cache_dir, iter_users(), iter_organizations(), iter_projects())
+    return cache_dir
+
+
+def _search_index() -> SearchIndex:
+    """Open the search index, building it from the stored data if missing."""
+    if not get_search_file().exists():
+        reindex()
+    return SearchIndex(get_search_file())
+
+
+def reindex() -> int:
+    """Bring the search index in line with the stored data, creating it if needed.
+
+    The completion cache, if there is one, is rewritten as well.
+
+    Returns:
+        Number of index documents written or removed
+    """
+    if get_completion_dir().exists():
+        completion.build_cache(get_completion_dir(), iter_users(), iter_organizations(), iter_projects())
+    return SearchIndex(get_search_file()).sync(iter_users(), iter_organizations(), iter_projects())
@@ -1,13 +1,191 @@
 """Configuration file management."""
 
-import yaml
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional
+
+from agentflow import durability
+from agentflow.locking import FileLock, get_lock
 
 # Config file path
 CONFIG_DIR = Path.home() / ".agentflow"
 CONFIG_FILE = CONFIG_DIR / "config.yaml"
 
+# Plain-text copy of the context string, next to the config file
+CONTEXT_FILE_NAME = "context"
+
+# Lock file serializing config writes between processes (see agentflow.locking)
+LOCK_FILE_NAME = "config.lock"
+
+
+# Marker for keys deleted in a batch
+_DELETED = object()
+
+
+class Config:
+    """Config file contents, loaded once per process.
+
+    The parsed file is reused until its mtime, size or inode change.
+    set() and delete() are written through immediately, unless a
+    batch() is open: then they are staged and flushed together in one
+    atomic write when the outermost batch exits.
+
+    Every write also refreshes the context file (see get_context_file()).
+
+    Writes hold the config lock file exclusively and re-read the file
+    first, so staged changes are applied onto what other processes wrote
+    meanwhile instead of reverting it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.values: dict = {}
+        self.signature: Optional[tuple[int, int, int]] = None
+        self.loaded = False
+        self.staged: dict = {}
+        self.depth = 0
+
+    def _signature(self) -> Optional[tuple[int, int, int]]:
+        """Get (mtime, size, inode) of the config file, or None if it doesn't exist."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _refresh(self) -> None:
+        """Re-read the config file if it changed since it was last read."""
+        signature = self._signature()
+        if self.loaded and signature == self.signature:
+            return
+
+        if signature is None:
+            self.values = {}
+        else:
+            import yaml
+
+            with open(self.path, "r") as f:
+                self.values = yaml.safe_load(f) or {}
+        self.signature = signature
+        self.loaded = True
+
+    def data(self) -> dict:
+        """Get a copy of the configuration, including staged changes."""
+        self._refresh()
+        values = {**self.values, **self.staged}
+        return {key: value for key, value in values.items() if value is not _DELETED}
+
+    def get(self, key: str) -> Any:
+        """Get a config value.
+
+        Args:
+            key: Config key
+
+        Returns:
+            Value if set, None otherwise
+        """
+        if key in self.staged:
+            value = self.staged[key]
+            return None if value is _DELETED else value
+        self._refresh()
+        return self.values.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        """Set a config value.
+
+        Args:
+            key: Config key
+            value: New value
+        """
+        self.staged[key] = value
+        if not self.depth:
+            self.flush()
+
+    def delete(self, key: str) -> None:
+        """Remove a config value, if present.
+
+        Args:
+            key: Config key
+        """
+        self.set(key, _DELETED)
+
+    def lock(self) -> FileLock:
+        """Get the lock serializing writes of the config file."""
+        return get_lock(self.path.with_name(LOCK_FILE_NAME))
+
+    def flush(self) -> None:
+        """Write staged changes onto the latest config file."""
+        if not self.staged:
+            return
+        with self.lock().exclusive():
+            values = self.data()
+            self.staged = {}
+            if values != self.values or self.signature is None:
+                self.write(values)
+
+    def write(self, values: dict) -> None:
+        """Replace the config file atomically, in the selected durability mode.
+
+        Args:
+            values: Configuration dictionary to save
+        """
+        import yaml
+
+        try:
+            mode = durability.get_mode(values.get("storage_durability"))
+        except ValueError:
+            mode = durability.DEFAULT_MODE
+
+        self.path.parent.mkdir(exist_ok=True)
+        data = yaml.dump(values, default_flow_style=False).encode()
+        with self.lock().exclusive():
+            durability.write_atomic(self.path, data, mode)
+            write_context_file(
+                format_context(values.get("current_organization"), values.get("current_project")),
+                self.path.with_name(CONTEXT_FILE_NAME),
+            )
+
+            self.values = dict(values)
+            self.signature = self._signature()
+            self.loaded = True
+
+
+# Config objects per config file
+_configs: dict[Path, Config] = {}
+
+
+def get_config() -> Config:
+    """Get the process-wide Config for the current config file."""
+    config = _configs.get(CONFIG_FILE)
+    if config is None:
+        config = _configs[CONFIG_FILE] = Config(CONFIG_FILE)
+    return config
+
+
+@contextmanager
+def batch() -> Iterator[Config]:
+    """Stage config changes and write them at once on exit.
+
+    Changes are discarded if the block raises. Nested batches join the
+    outermost one.
+
+    Yields:
+        The Config being changed
+    """
+    config = get_config()
+    config.depth += 1
+    try:
+        yield config
+    except BaseException:
+        if config.depth == 1:
+            config.staged = {}
+        raise
+    finally:
+        config.depth -= 1
+    if not config.depth:
+        config.flush()
+
 
 def load_config() -> dict:
     """Load configuration from YAML file.
@@ -15,11 +193,7 @@ def load_config() -> dict:
     Returns:
         Configuration dictionary (empty if file doesn't exist)
     """
-    if not CONFIG_FILE.exists():
-        return {}
-
-    with open(CONFIG_FILE, "r") as f:
-        return yaml.safe_load(f) or {}
+    return get_config().data()
 
 
 def save_config(config: dict) -> None:
@@ -28,10 +202,7 @@ def save_config(config: dict) -> None:
     Args:
         config: Configuration dictionary to save
     """
-    CONFIG_DIR.mkdir(exist_ok=True)
-
-    with open(CONFIG_FILE, "w") as f:
-        yaml.dump(config, f, default_flow_style=False)
+    get_config().write(config)
 
 
 def get_current_user_email() -> Optional[str]:
@@ -40,8 +211,7 @@ def get_current_user_email() -> Optional[str]:
     Returns:
         User email if set, None otherwise
     """
-    config = load_config()
-    return config.get("current_user_email")
+    return get_config().get("current_user_email")
 
 
 def set_current_user_email(email: str) -> None:
@@ -50,9 +220,7 @@ def set_current_user_email(email: str) -> None:
     Args:
         email: User email address
     """
-    config = load_config()
-    config["current_user_email"] = email
-    save_config(config)
+    get_config().set("current_user_email", email)
 
 
 def get_current_api_key() -> Optional[str]:
@@ -61,8 +229,7 @@ def get_current_api_key() -> Optional[str]:
     Returns:
         API key if set, None otherwise
     """
-    config = load_config()
-    return config.get("current_api_key")
+    return get_config().get("current_api_key")
 
 
 def set_current_api_key(api_key: str) -> None:
@@ -71,9 +238,7 @@ def set_current_api_key(api_key: str) -> None:
     Args:
         api_key: API key string
     """
-    config = load_config()
-    config["current_api_key"] = api_key
-    save_config(config)
+    get_config().set("current_api_key", api_key)
 
 
 def get_current_organization() -> Optional[str]:
@@ -82,8 +247,7 @@ def get_current_organization() -> Optional[str]:
     Returns:
         Organization slug if set, None otherwise
     """
-    config = load_config()
-    return config.get("current_organization")
+    return get_config().get("current_organization")
 
 
 def set_current_organization(slug: str) -> None:
@@ -92,9 +256,7 @@ def set_current_organization(slug: str) -> None:
     Args:
         slug: Organization slug
     """
-    config = load_config()
-    config["current_organization"] = slug
-    save_config(config)
+    get_config().set("current_organization", slug)
 
 
 def get_current_project() -> Optional[str]:
@@ -103,8 +265,7 @@ def get_current_project() -> Optional[str]:
     Returns:
         Project slug if set, None otherwise
     """
-    config = load_config()
-    return config.get("current_project")
+    return get_config().get("current_project")
 
 
 def set_current_project(slug: str) -> None:
@@ -113,31 +274,128 @@ def set_current_project(slug: str) -> None:
     Args:
         slug: Project slug
     """
-    config = load_config()
-    config["current_project"] = slug
-    save_config(config)
+    get_config().set("current_project", slug)
 
 
 def clear_current_project() -> None:
     """Clear current project from config."""
-    config = load_config()
-    if "current_project" in config:
-        del config["current_project"]
-    save_config(config)
+    get_config().delete("current_project")
 
 
-def get_context_string() -> str:
-    """Get formatted context string for prompt.
+def get_storage_backend() -> Optional[str]:
+    """Get storage backend name from config.
 
     Returns:
-        Context string like "[org]" or "[org / project]"
+        Backend name if set, None otherwise
+    """
+    return get_config().get("storage_backend")
+
+
+def set_storage_backend(name: str) -> None:
+    """Set storage backend in config.
+
+    Args:
+        name: Backend name ("json", "sqlite" or "sharded")
+    """
+    get_config().set("storage_backend", name)
+
+
+def get_storage_format() -> Optional[str]:
+    """Get data file format from config.
+
+    Returns:
+        Format name if set, None otherwise
+    """
+    return get_config().get("storage_format")
+
+
+def set_storage_format(fmt: str) -> None:
+    """Set data file format in config.
+
+    Args:
+        fmt: Format name ("json" or "json-compact")
+    """
+    get_config().set("storage_format", fmt)
+
+
+def get_storage_durability() -> Optional[str]:
+    """Get durability mode of data writes from config.
+
+    Returns:
+        Mode name if set, None otherwise
     """
-    org = get_current_organization()
-    project = get_current_project()
+    return get_config().get("storage_durability")
+
+
+def set_storage_durability(mode: str) -> None:
+    """Set durability mode of data writes in config.
+
+    Args:
+        mode: Mode name ("strict", "relaxed" or "batched")
+    """
+    get_config().set("storage_durability", mode)
+
+
+def format_context(org: Optional[str], project: Optional[str]) -> str:
+    """Format the context string for a prompt.
 
+    Args:
+        org: Organization slug
+        project: Project slug
+
+    Returns:
+        Context string like "[org]" or "[org / project]"
+    """
     if org and project:
         return f"[{org} / {project}]"
     elif org:
         return f"[{org}]"
     else:
         return ""
+
+
+def get_context_string() -> str:
+    """Get formatted context string for prompt.
+
+    Returns:
+        Context string like "[org]" or "[org / project]"
+    """
+    return format_context(get_current_organization(), get_current_project())
+
+
+def get_context_file() -> Path:
+    """Get path of the context file.
+
+    The file holds the context string as plain text, so shell prompts
+    can show it without running Python.
+    """
+    return CONFIG_FILE.with_name(CONTEXT_FILE_NAME)
+
+
+def write_context_file(context: str, path: Optional[Path] = None) -> None:
+    """Replace the context file atomically.
+
+    Args:
+        context: Context string
+        path: Context file (defaults to get_context_file())
+    """
+    path = path or get_context_file()
+    path.parent.mkdir(exist_ok=True)
+    # Derived from the config file, so it needn't be synced
+    durability.write_atomic(path, context.encode(), "relaxed")
+
+
+def read_context_file() -> Optional[str]:
+    """Read the context string from the context file, without parsing the config.
+
+    Returns:
+        Context string, or None if either file is missing or the context
+        file is older than the config file (which was then changed by
+        other means)
+    """
+    try:
+        if os.stat(CONFIG_FILE).st_mtime_ns > os.stat(get_context_file()).st_mtime_ns:
+            return None
+        return get_context_file().read_text()
+    except FileNotFoundError:
+        return None
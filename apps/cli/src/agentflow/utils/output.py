@@ -1,10 +1,73 @@
-"""Output formatting utilities."""
+"""Output formatting utilities.
 
-from rich.console import Console
-from rich.table import Table
-from typing import List, Any
+The default "table" output renders messages and tables with rich. The
+machine-readable outputs (json, jsonl, csv, raw) write table rows straight
+to stdout without importing rich, and send messages to stderr as plain
+text so stdout only carries data.
+"""
 
-console = Console()
+import itertools
+import json
+import sys
+from typing import Any, Callable, Iterable, List, Optional
+
+OUTPUT_FORMATS = ("table", "json", "jsonl", "csv", "raw")
+
+_console = None
+_output_format = "table"
+
+
+def get_console():
+    """Get the rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+def reset_console() -> None:
+    """Recreate the console for the current sys.stdout.
+
+    The console detects terminal features once, when it is created, so a
+    process that swaps sys.stdout (such as the daemon) recreates it.
+    """
+    global _console
+    _console = None
+
+
+def set_output_format(fmt: str) -> None:
+    """Select how messages and tables are written.
+
+    Args:
+        fmt: One of OUTPUT_FORMATS
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    global _output_format
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{fmt}'. Use one of: {', '.join(OUTPUT_FORMATS)}")
+    _output_format = fmt
+
+
+def get_output_format() -> str:
+    """Get the selected output format."""
+    return _output_format
+
+
+def is_table_output() -> bool:
+    """Check whether output is rendered for humans (the default)."""
+    return _output_format == "table"
+
+
+def _message(markup: str, plain: str, style: Optional[str] = None) -> None:
+    """Print a message with rich, or as plain text on stderr."""
+    if is_table_output():
+        get_console().print(markup, style=style)
+    else:
+        print(plain, file=sys.stderr)
 
 
 def success(message: str) -> None:
@@ -13,7 +76,7 @@ def success(message: str) -> None:
     Args:
         message: Message to print
     """
-    console.print(f"[green]√[/] {message}", style="bold")
+    _message(f"[green]√[/] {message}", f"√ {message}", style="bold")
 
 
 def error(message: str) -> None:
@@ -22,7 +85,7 @@ def error(message: str) -> None:
     Args:
         message: Message to print
     """
-    console.print(f"[red]✗[/] {message}", style="bold")
+    _message(f"[red]✗[/] {message}", f"✗ {message}", style="bold")
 
 
 def warning(message: str) -> None:
@@ -31,7 +94,7 @@ def warning(message: str) -> None:
     Args:
         message: Message to print
     """
-    console.print(f"[yellow]![/] {message}", style="bold")
+    _message(f"[yellow]![/] {message}", f"! {message}", style="bold")
 
 
 def info(message: str) -> None:
@@ -40,21 +103,146 @@ def info(message: str) -> None:
     Args:
         message: Message to print
     """
-    console.print(f"[blue]i[/] {message}")
+    _message(f"[blue]i[/] {message}", message)
+
+
+def did_you_mean(candidates: List[str]) -> None:
+    """Print suggestions after a "not found" error, if there are any.
+
+    Args:
+        candidates: Similar names, closest first
+    """
+    if candidates:
+        info(f"Did you mean: {', '.join(candidates)}?")
 
 
-def print_table(columns: List[str], rows: List[List[str]]) -> None:
-    """Print a rich table.
+def print_table(
+    columns: List[str],
+    rows: List[List[str]],
+    records: Optional[Iterable[dict[str, Any]]] = None,
+    name: str = "items",
+) -> None:
+    """Print a table, in the selected output format.
+
+    With the default table output the rows are rendered as a rich table.
+    Otherwise the records are written to stdout: as one JSON document
+    (``{"success": true, "data": {name: [...], "total": n}}``), as JSON
+    lines, as CSV with a header line, or, for raw, as the first field of
+    each record (its ID) per line.
 
     Args:
         columns: List of column headers
         rows: List of rows (each row is a list of strings)
+        records: Unformatted records for the machine-readable outputs
+            (defaults to the rows keyed by column header)
+        name: Name of the collection in the JSON document
     """
-    table = Table(show_header=True, header_style="bold magenta")
-    for col in columns:
-        table.add_column(col)
+    if is_table_output():
+        from rich.table import Table
+
+        table = Table(show_header=True, header_style="bold magenta")
+        for col in columns:
+            table.add_column(col)
+
+        for row in rows:
+            table.add_row(*row)
+
+        get_console().print(table)
+        return
+
+    keys = [column.lower().replace(" ", "_") for column in columns]
+    if records is None:
+        records = (dict(zip(keys, row)) for row in rows)
+
+    # Take the field names from the first record
+    records = iter(records)
+    first = next(records, None)
+    if first is None:
+        write_output(keys, [], name)
+    else:
+        write_output([*first], itertools.chain([first], records), name)
+
+
+def print_pages(
+    columns: List[str],
+    pages: Iterable[list],
+    row: Callable[[Any], List[str]],
+    record: Callable[[Any], dict[str, Any]],
+    name: str = "items",
+    trailer: Optional[Callable[[], dict[str, Any]]] = None,
+) -> None:
+    """Print items read a page at a time, in the selected output format.
+
+    With the default table output every page goes into one table,
+    rendered once the pages are exhausted. The other formats stream
+    every item as one listing.
 
-    for row in rows:
-        table.add_row(*row)
+    Args:
+        columns: List of column headers
+        pages: Lists of items
+        row: Formats an item as a table row
+        record: Converts an item to an unformatted record
+        name: Name of the collection in the JSON document
+        trailer: Called once the pages are exhausted, for extra fields
+            of the JSON document (e.g. the next-page cursor)
+    """
+    if is_table_output():
+        print_table(columns, [row(item) for page in pages for item in page])
+        return
+
+    keys = [column.lower().replace(" ", "_") for column in columns]
+    records = (record(item) for page in pages for item in page)
+    first = next(records, None)
+    if first is None:
+        write_output(keys, [], name, trailer)
+    else:
+        write_output([*first], itertools.chain([first], records), name, trailer)
+
+
+def write_output(
+    fields: List[str],
+    records: Iterable[dict[str, Any]],
+    name: str = "items",
+    trailer: Optional[Callable[[], dict[str, Any]]] = None,
+) -> None:
+    """Write records to stdout in the selected machine-readable format.
+
+    Records are written one at a time, so an iterator is never held in
+    memory as a whole.
 
-    console.print(table)
+    Args:
+        fields: Fields to write, in order
+        records: JSON-compatible records
+        name: Name of the collection in the JSON document
+        trailer: Called after the last record for extra fields, added to
+            the JSON document or, for line formats, printed to stderr
+            as "key: value" lines when not None
+    """
+    from agentflow.utils.records import write_records
+
+    fmt = _output_format
+    out = sys.stdout
+    if fmt in ("jsonl", "csv"):
+        write_records(out, fmt, fields, records)
+    elif fmt == "raw":
+        for record in records:
+            out.write(f"{record.get(fields[0], '')}\n")
+    else:
+        total = 0
+        out.write(f'{{"success": true, "data": {{{json.dumps(name)}: [')
+        for record in records:
+            out.write(", " if total else "")
+            out.write(json.dumps({field: record.get(field) for field in fields}, default=str))
+            total += 1
+        out.write(f'], "total": {total}')
+
+    extra = trailer() if trailer else {}
+    if fmt == "json":
+        out.write("".join(f", {json.dumps(key)}: {json.dumps(value)}" for key, value in extra.items()))
+        out.write("}}\n")
+    out.flush()
+
+    if fmt != "json":
+        for key, value in extra.items():
+            if value is not None:
+                print(f"{key}: {value}", file=sys.stderr)
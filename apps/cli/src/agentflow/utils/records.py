@@ -0,0 +1,181 @@
+"""Reading and writing records as CSV and JSONL."""
+
+import csv
+import json
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Optional
+
+from agentflow.utils.output import error, warning
+
+RECORD_FORMATS = ("csv", "jsonl")
+
+TRUE_VALUES = ("1", "true", "yes", "y")
+FALSE_VALUES = ("0", "false", "no", "n")
+
+
+def detect_format(source: str, fmt: Optional[str] = None) -> Optional[str]:
+    """Pick the record format of a source.
+
+    Args:
+        source: File path, or "-" for stdin
+        fmt: Explicit format, if given
+
+    Returns:
+        "csv" or "jsonl", or None if it can't be told from the file name
+    """
+    if fmt:
+        return fmt if fmt in RECORD_FORMATS else None
+    suffix = Path(source).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    return None
+
+
+@contextmanager
+def open_source(source: str) -> Iterator[IO[str]]:
+    """Open a file for reading, or stdin for "-".
+
+    Args:
+        source: File path, or "-" for stdin
+
+    Yields:
+        Text stream
+    """
+    if source == "-":
+        yield sys.stdin
+        return
+    with open(source, newline="", encoding="utf-8") as f:
+        yield f
+
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[tuple[int, dict]]:
+    """Read records one at a time.
+
+    CSV rows use the header line as keys. JSONL lines must be objects;
+    blank lines are skipped. A line that doesn't parse yields the error
+    message under the "__error__" key instead of stopping the read.
+
+    Args:
+        stream: Text stream
+        fmt: "csv" or "jsonl"
+
+    Yields:
+        Tuples of (line number, record)
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {k: v for k, v in row.items() if k is not None}
+        return
+
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, {"__error__": f"Invalid JSON: {e}"}
+            continue
+        if not isinstance(record, dict):
+            yield number, {"__error__": "Expected a JSON object"}
+            continue
+        yield number, record
+
+
+def write_records(stream: IO[str], fmt: str, columns: list[str], records: Iterable[dict]) -> int:
+    """Write records one at a time.
+
+    CSV output starts with a header line of the column names; missing
+    values are written empty and booleans as "true"/"false", so the
+    output can be read back by read_records().
+
+    Args:
+        stream: Text stream
+        fmt: "csv" or "jsonl"
+        columns: Fields to write, in order
+        records: JSON-compatible records
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+        for record in records:
+            writer.writerow([_csv_value(record.get(column)) for column in columns])
+            count += 1
+        return count
+
+    for record in records:
+        stream.write(json.dumps({column: record.get(column) for column in columns}) + "\n")
+        count += 1
+    return count
+
+
+def _csv_value(value) -> str:
+    """Format a JSON-compatible value for a CSV cell."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def text_field(record: dict, key: str) -> Optional[str]:
+    """Get an optional text field, treating empty values as missing.
+
+    Args:
+        record: Record read by read_records()
+        key: Field name
+
+    Returns:
+        Stripped text, or None
+    """
+    value = record.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def bool_field(record: dict, key: str, default: bool) -> Optional[bool]:
+    """Get an optional boolean field.
+
+    Args:
+        record: Record read by read_records()
+        key: Field name
+        default: Value when the field is missing or empty
+
+    Returns:
+        Boolean, or None if the value isn't a recognized boolean
+    """
+    value = record.get(key)
+    if isinstance(value, bool):
+        return value
+    text = text_field(record, key)
+    if text is None:
+        return default
+    if text.lower() in TRUE_VALUES:
+        return True
+    if text.lower() in FALSE_VALUES:
+        return False
+    return None
+
+
+def report_errors(errors: list[str], limit: int = 20) -> None:
+    """Print validation errors from an import, up to a limit.
+
+    Args:
+        errors: Error messages, one per invalid record
+        limit: Maximum number of messages to print
+    """
+    for message in errors[:limit]:
+        error(message)
+    if len(errors) > limit:
+        error(f"... and {len(errors) - limit} more")
+    warning(f"{len(errors)} invalid records, nothing imported")
@@ -0,0 +1,110 @@
+"""Tests for batch command."""
+
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow import storage
+from agentflow.cli import app
+
+runner = CliRunner()
+
+SETUP = [
+    "auth register --email test@example.com --name Test --password secretpw1",
+    "org create --name 'My Org' --slug my-org",
+    "org use my-org",
+]
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield data_dir
+
+
+def run_batch(lines: list[str], *options: str):
+    """Run a batch from stdin and return the result and parsed JSON lines."""
+    result = runner.invoke(app, ["batch", "-", *options], input="\n".join(lines) + "\n")
+    results = [json.loads(line) for line in result.stdout.splitlines()]
+    return result, results
+
+
+class TestBatch:
+    """Tests for batch command."""
+
+    def test_runs_commands_and_reports_jsonl(self, temp_dirs):
+        """Test that each command gets a JSON result line."""
+        result, results = run_batch([*SETUP, "# a comment", "", "project create --name Web --slug web"])
+
+        assert result.exit_code == 0
+        assert [r["line"] for r in results] == [1, 2, 3, 6]
+        assert all(r["exit_code"] == 0 for r in results)
+        assert "Project created" in results[-1]["output"]
+        assert storage.find_project_by_slug(storage.find_organization_by_slug("my-org").id, "web")
+
+    def test_writes_storage_and_config_once(self, temp_dirs):
+        """Test that the batch ends with a single storage and config write."""
+        from agentflow.utils.config import Config, get_current_project
+
+        with patch.object(Config, "write", autospec=True, side_effect=Config.write) as write:
+            with patch.object(
+                storage.JSONBackend, "persist", autospec=True, side_effect=storage.JSONBackend.persist
+            ) as persist:
+                result, _ = run_batch([*SETUP, "project create --name Web --slug web"])
+
+        assert result.exit_code == 0
+        write.assert_called_once()
+        persist.assert_called_once()
+        assert get_current_project() == "web"
+
+    def test_reports_failures_and_keeps_going(self, temp_dirs):
+        """Test that failing commands are reported and the rest still run."""
+        lines = [*SETUP, "project view missing", "project create --name Web --slug web"]
+
+        result, results = run_batch(lines)
+
+        assert result.exit_code == 1
+        assert results[3]["exit_code"] == 1
+        assert "not found" in results[3]["output"]
+        assert results[4]["exit_code"] == 0
+
+    def test_stop_on_error(self, temp_dirs):
+        """Test that --stop-on-error skips the remaining commands."""
+        lines = [*SETUP, "nope", "project create --name Web --slug web"]
+
+        result, results = run_batch(lines, "--stop-on-error")
+
+        assert result.exit_code == 1
+        assert len(results) == 4
+        assert results[-1]["exit_code"] == 2
+
+    def test_rejects_nested_batch(self, temp_dirs):
+        """Test that batch, shell and daemon can't run inside a batch."""
+        _, results = run_batch(["batch -", "shell"])
+
+        assert [r["exit_code"] for r in results] == [2, 2]
+
+    def test_reads_file(self, temp_dirs, tmp_path: Path):
+        """Test that commands can be read from a file."""
+        script = tmp_path / "commands.txt"
+        script.write_text("version\n")
+
+        result = runner.invoke(app, ["batch", str(script)])
+
+        assert result.exit_code == 0
+        assert json.loads(result.stdout)["exit_code"] == 0
+
+    def test_missing_file(self, temp_dirs):
+        """Test that a missing file is an error."""
+        result = runner.invoke(app, ["batch", "missing.txt"])
+
+        assert result.exit_code == 1
+        assert "File not found" in result.stdout
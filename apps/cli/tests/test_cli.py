@@ -0,0 +1,97 @@
+"""Tests for the root CLI application."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+import agentflow
+from agentflow.cli import app
+
+runner = CliRunner()
+
+SRC_DIR = str(Path(agentflow.__file__).parent.parent)
+
+# Modules that commands not touching storage must not import
+HEAVY_MODULES = ("pydantic", "email_validator", "yaml", "agentflow.storage", "agentflow.commands")
+
+
+def imported_modules(*args: str) -> set[str]:
+    """Run the CLI in a fresh interpreter and return the modules it imported."""
+    code = (
+        "import sys\n"
+        "from agentflow.cli import app\n"
+        "try:\n"
+        f"    app({list(args)!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('\\n'.join(sys.modules), file=sys.stderr)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": SRC_DIR}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True
+    )
+    return set(result.stderr.split())
+
+
+def heavy(modules: set[str]) -> set[str]:
+    """Filter the heavy modules out of a set of module names."""
+    return {m for m in modules if m.startswith(HEAVY_MODULES)}
+
+
+class TestLazyCommandGroups:
+    """Tests for command groups imported on first use."""
+
+    def test_version_skips_heavy_imports(self):
+        """Test that version doesn't import storage, pydantic or yaml."""
+        assert heavy(imported_modules("version")) == set()
+
+    def test_help_skips_command_modules(self):
+        """Test that the root --help lists groups without importing them."""
+        assert heavy(imported_modules("--help")) == set()
+
+    def test_group_imports_only_its_module(self):
+        """Test that running a group imports its own module only."""
+        modules = imported_modules("org", "--help")
+
+        assert "agentflow.commands.org" in modules
+        assert "agentflow.commands.project" not in modules
+        assert "agentflow.commands.auth" not in modules
+
+    def test_help_lists_groups(self):
+        """Test that the root help lists every command group."""
+        result = runner.invoke(app, ["--help"])
+
+        assert result.exit_code == 0
+        for name in ("version", "auth", "org", "project", "storage"):
+            assert name in result.stdout
+        assert "Organization commands" in result.stdout
+
+    def test_dispatches_to_group(self):
+        """Test that group commands run through the root app."""
+        result = runner.invoke(app, ["storage", "--help"])
+
+        assert result.exit_code == 0
+        assert "migrate" in result.stdout
+
+    def test_suggests_group_names(self):
+        """Test that mistyped group names get a suggestion."""
+        result = runner.invoke(app, ["prject"])
+
+        assert result.exit_code == 2
+        assert "project" in result.output
+
+
+class TestVersionCommand:
+    """Tests for version command."""
+
+    def test_shows_version_and_paths(self):
+        """Test that version shows the version and data locations."""
+        result = runner.invoke(app, ["version"])
+
+        assert result.exit_code == 0
+        assert "AgentFlow CLI v0.0.1" in result.stdout
+        assert "config.yaml" in result.stdout
+        assert "data.json" in result.stdout
@@ -0,0 +1,270 @@
+"""Tests for shell completion."""
+
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow import completion, search, storage
+from agentflow.cli import app
+from agentflow.completion import build_cache, cached_names, complete_from_cache, completion_target
+from agentflow.models import APIKey, Database, Organization, Project, User
+from agentflow.sqlite_backend import close_connections
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield data_dir
+    search.close_connections()
+    close_connections()
+
+
+@pytest.fixture
+def with_org(temp_dirs):
+    """Register a user and create and select an organization with a project."""
+    runner.invoke(
+        app, ["auth", "register", "--email", "test@example.com", "--name", "Test", "--password", "secretpw1"]
+    )
+    runner.invoke(app, ["org", "create", "--name", "Acme", "--slug", "acme"])
+    runner.invoke(app, ["org", "use", "acme"])
+    runner.invoke(app, ["project", "create", "--name", "Web", "--slug", "web"])
+    return temp_dirs
+
+
+def sample_records() -> tuple[list[User], list[Organization], list[Project]]:
+    """Build two users with one organization each and a few projects."""
+    users = [
+        User(
+            id="user-1",
+            email="a@example.com",
+            name="A",
+            password_hash="x",
+            api_keys=[APIKey(key="k1", name="Default Key"), APIKey(key="k2", name="CI")],
+        ),
+        User(id="user-2", email="b@example.com", name="B", password_hash="x"),
+    ]
+    organizations = [
+        Organization(id="org-1", owner_id="user-1", name="Acme", slug="acme"),
+        Organization(id="org-2", owner_id="user-2", name="Globex", slug="globex"),
+    ]
+    projects = [
+        Project(id="p-web", organization_id="org-1", name="Web", slug="web"),
+        Project(id="p-api", organization_id="org-1", name="API", slug="rocket-api"),
+        Project(id="p-other", organization_id="org-2", name="Rocket", slug="rocket"),
+    ]
+    return users, organizations, projects
+
+
+class TestCompletionCache:
+    """Tests for building and reading the completion cache."""
+
+    def test_cached_names(self, tmp_path: Path):
+        """Test that names are scoped to the user or organization and match by prefix."""
+        build_cache(tmp_path, *sample_records())
+
+        assert cached_names(tmp_path, "organization", "", "a@example.com") == ["acme"]
+        assert cached_names(tmp_path, "organization", "g", "a@example.com") == []
+        assert cached_names(tmp_path, "organization", "", "b@example.com") == ["globex"]
+        assert cached_names(tmp_path, "project", "", None, "acme") == ["rocket-api", "web"]
+        assert cached_names(tmp_path, "project", "ro", None, "acme") == ["rocket-api"]
+        assert cached_names(tmp_path, "project", "ro", None, "globex") == ["rocket"]
+        assert cached_names(tmp_path, "project", "", None, "nope") == []
+        assert cached_names(tmp_path, "api_key", "", "a@example.com") == ["CI", "Default Key"]
+        assert cached_names(tmp_path, "api_key", "", "b@example.com") == []
+
+    def test_missing_cache(self, tmp_path: Path):
+        """Test that a missing cache is told apart from no matches."""
+        assert cached_names(tmp_path, "organization", "", "a@example.com") is None
+
+    def test_rebuild_removes_stale_projects(self, tmp_path: Path):
+        """Test that rebuilding drops the project list of a removed organization."""
+        users, organizations, projects = sample_records()
+        build_cache(tmp_path, users, organizations, projects)
+        build_cache(tmp_path, users, organizations[:1], projects[:2])
+
+        assert cached_names(tmp_path, "project", "", None, "globex") == []
+        assert not (tmp_path / "projects" / "org-2.txt").exists()
+
+    def test_update_cache(self, tmp_path: Path):
+        """Test that added records and API keys are appended."""
+        users, organizations, projects = sample_records()
+        build_cache(tmp_path, users, organizations, projects)
+
+        completion.update_cache(
+            tmp_path,
+            [
+                Organization(id="org-3", owner_id="user-1", name="Beta", slug="beta"),
+                Project(id="p-new", organization_id="org-3", name="New", slug="new"),
+                Project(id="p-www", organization_id="org-1", name="WWW", slug="www"),
+                ("user-2", APIKey(key="k3", name="Deploy")),
+            ],
+        )
+
+        assert cached_names(tmp_path, "organization", "", "a@example.com") == ["acme", "beta"]
+        assert cached_names(tmp_path, "project", "w", None, "acme") == ["web", "www"]
+        assert cached_names(tmp_path, "project", "", None, "beta") == ["new"]
+        assert cached_names(tmp_path, "api_key", "", "b@example.com") == ["Deploy"]
+
+    def test_update_with_database(self, tmp_path: Path):
+        """Test that a saved Database rewrites the cache."""
+        users, organizations, projects = sample_records()
+        build_cache(tmp_path, users, organizations, projects)
+
+        completion.update_cache(tmp_path, [Database(users=users, organizations=organizations, projects=[])])
+
+        assert cached_names(tmp_path, "project", "", None, "acme") == []
+
+
+class TestCacheUpdates:
+    """Tests for keeping the cache up to date from the storage layer."""
+
+    def test_not_created_by_writes(self, with_org):
+        """Test that writes don't create the cache before the first completion."""
+        assert not storage.get_completion_dir().exists()
+
+    def test_writes_update_cache(self, with_org):
+        """Test that added records and API keys reach an existing cache."""
+        cache_dir = storage.ensure_completion_cache()
+
+        runner.invoke(app, ["project", "create", "--name", "API", "--slug", "api"])
+        runner.invoke(app, ["org", "create", "--name", "Beta", "--slug", "beta"])
+        runner.invoke(app, ["auth", "api-keys", "create", "--name", "CI"])
+
+        assert cached_names(cache_dir, "project", "", None, "acme") == ["api", "web"]
+        assert cached_names(cache_dir, "organization", "", "test@example.com") == ["acme", "beta"]
+        assert cached_names(cache_dir, "api_key", "", "test@example.com") == ["CI", "Default Key"]
+
+    def test_save_database_rewrites_cache(self, with_org):
+        """Test that saving the database rewrites the cache."""
+        cache_dir = storage.ensure_completion_cache()
+
+        db = storage.load_database()
+        db.projects = []
+        storage.save_database(db)
+
+        assert cached_names(cache_dir, "project", "", None, "acme") == []
+
+    def test_rolled_back_writes(self, with_org):
+        """Test that writes of a failed transaction stay out of the cache."""
+        cache_dir = storage.ensure_completion_cache()
+        org = storage.find_organization_by_slug("acme")
+
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                storage.add_project(Project(organization_id=org.id, name="Lost", slug="lost"))
+                raise RuntimeError("boom")
+
+        assert cached_names(cache_dir, "project", "", None, "acme") == ["web"]
+
+    def test_callbacks(self, with_org):
+        """Test the typer completion callbacks, which build the cache."""
+        assert completion.complete_org_slug("a") == ["acme"]
+        assert completion.complete_api_key_name("D") == ["Default Key"]
+        assert storage.get_completion_dir().exists()
+
+    def test_callbacks_suggest_closest_slugs(self, with_org):
+        """Test that the callbacks offer the closest slugs when none starts with the text."""
+        assert completion.complete_org_slug("acm3") == ["acme"]
+        assert completion.complete_project_slug(SimpleNamespace(params={}), "webb") == ["web"]
+        assert completion.complete_project_slug(SimpleNamespace(params={}), "zzz") == []
+        assert completion.complete_api_key_name("X") == []
+
+
+class TestCompleteFromCache:
+    """Tests for answering completion requests without loading the CLI."""
+
+    @pytest.fixture
+    def cache(self, tmp_path: Path):
+        """Build a cache and a config selecting user-1 and acme."""
+        build_cache(tmp_path / "completion", *sample_records())
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("current_organization: acme\ncurrent_user_email: a@example.com\n")
+        return tmp_path, config_file
+
+    @pytest.mark.parametrize(
+        "args,target",
+        [
+            (["org", "use"], ("organization", None)),
+            (["--output", "json", "org", "view"], ("organization", None)),
+            (["project", "use"], ("project", None)),
+            (["project", "view", "--org", "globex"], ("project", "globex")),
+            (["project", "list", "-o"], ("organization", None)),
+            (["auth", "api-keys", "list", "--name"], ("api_key", None)),
+            (["org", "create", "--name"], None),
+            (["project", "use", "web"], None),
+            (["search"], None),
+        ],
+    )
+    def test_completion_target(self, args, target):
+        """Test which kind of name is completed at the cursor."""
+        assert completion_target(args) == target
+
+    def test_bash(self, cache, capsys):
+        """Test bash completion of project slugs of the current organization."""
+        data_dir, config_file = cache
+        environ = {
+            "_AGENTFLOW_COMPLETE": "complete_bash",
+            "COMP_WORDS": "agentflow project use ",
+            "COMP_CWORD": "3",
+        }
+
+        assert complete_from_cache(environ, data_dir, config_file) == 0
+        assert capsys.readouterr().out == "rocket-api\nweb\n"
+
+    def test_zsh(self, cache, capsys):
+        """Test zsh completion of API key names."""
+        data_dir, config_file = cache
+        environ = {
+            "_AGENTFLOW_COMPLETE": "complete_zsh",
+            "_TYPER_COMPLETE_ARGS": "agentflow auth api-keys list --name D",
+        }
+
+        assert complete_from_cache(environ, data_dir, config_file) == 0
+        assert capsys.readouterr().out == "_arguments '*: :((\"Default Key\"))'\n"
+
+    def test_fish(self, cache, capsys):
+        """Test fish completion of --org values, and its is-args check."""
+        data_dir, config_file = cache
+        environ = {
+            "_AGENTFLOW_COMPLETE": "complete_fish",
+            "_TYPER_COMPLETE_FISH_ACTION": "get-args",
+            "_TYPER_COMPLETE_ARGS": "agentflow project list --org ",
+        }
+
+        assert complete_from_cache(environ, data_dir, config_file) == 0
+        assert capsys.readouterr().out == "acme\n"
+
+        environ["_TYPER_COMPLETE_FISH_ACTION"] = "is-args"
+        environ["_TYPER_COMPLETE_ARGS"] = "agentflow project list --org a"
+        assert complete_from_cache(environ, data_dir, config_file) == 0
+
+        environ["_TYPER_COMPLETE_ARGS"] = "agentflow auth api-keys list --name X"
+        assert complete_from_cache(environ, data_dir, config_file) == 1
+
+    def test_falls_back_to_cli(self, cache, tmp_path: Path):
+        """Test that other completions, and a missing cache, are left to the CLI."""
+        data_dir, config_file = cache
+        environ = {"_AGENTFLOW_COMPLETE": "complete_bash", "COMP_WORDS": "agentflow pro", "COMP_CWORD": "1"}
+
+        assert complete_from_cache(environ, data_dir, config_file) is None
+
+        environ["COMP_WORDS"] = "agentflow org use "
+        environ["COMP_CWORD"] = "3"
+        assert complete_from_cache(environ, tmp_path / "empty", config_file) is None
+
+    def test_no_prefix_match_falls_back_to_cli(self, cache):
+        """Test that a slug no cached name starts with is left to the CLI."""
+        data_dir, config_file = cache
+        environ = {"_AGENTFLOW_COMPLETE": "complete_bash", "COMP_WORDS": "agentflow project use webb", "COMP_CWORD": "3"}
+
+        assert complete_from_cache(environ, data_dir, config_file) is None
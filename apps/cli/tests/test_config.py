@@ -17,6 +17,9 @@ from agentflow.utils.config import (
     set_current_project,
     clear_current_project,
     get_context_string,
+    get_context_file,
+    read_context_file,
+    batch,
     CONFIG_DIR,
     CONFIG_FILE,
 )
@@ -180,3 +183,139 @@ class TestGetContextString:
         # Since org is not set, it should return empty or just the project
         # Current implementation returns empty when org is not set
         assert result == ""
+
+
+class TestContextFile:
+    """Tests for the plain-text context file."""
+
+    def test_follows_context_changes(self, temp_config_dir):
+        """Test that setting and clearing the context rewrites the file."""
+        set_current_organization("my-org")
+        assert get_context_file().read_text() == "[my-org]"
+
+        set_current_project("my-project")
+        assert get_context_file().read_text() == "[my-org / my-project]"
+
+        clear_current_project()
+        assert get_context_file().read_text() == "[my-org]"
+
+    def test_written_once_per_batch(self, temp_config_dir):
+        """Test that a batch writes the file with its final context."""
+        with batch():
+            set_current_organization("my-org")
+            set_current_project("my-project")
+            assert not get_context_file().exists()
+
+        assert read_context_file() == "[my-org / my-project]"
+
+    def test_read_missing(self, temp_config_dir):
+        """Test that nothing is read before the config file exists."""
+        assert read_context_file() is None
+
+    def test_read_outdated(self, temp_config_dir):
+        """Test that a context file older than the config file is not read."""
+        import os
+        import agentflow.utils.config
+
+        set_current_organization("my-org")
+        mtime = os.stat(agentflow.utils.config.CONFIG_FILE).st_mtime_ns
+        os.utime(get_context_file(), ns=(mtime - 10**9, mtime - 10**9))
+
+        assert read_context_file() is None
+
+
+class TestConfigCache:
+    """Tests for the process-wide config object."""
+
+    def test_parses_file_once(self, temp_config_dir):
+        """Test that repeated reads of an unchanged file parse it once."""
+        import yaml
+
+        set_current_organization("my-org")
+        set_current_project("my-project")
+
+        with patch.object(yaml, "safe_load", wraps=yaml.safe_load) as safe_load:
+            get_context_string()
+            get_context_string()
+
+        safe_load.assert_not_called()
+
+    def test_reloads_when_file_changes(self, temp_config_dir):
+        """Test that edits made outside the process are picked up."""
+        import agentflow.utils.config
+        import yaml
+
+        set_current_organization("my-org")
+        with open(agentflow.utils.config.CONFIG_FILE, "w") as f:
+            yaml.dump({"current_organization": "edited-org"}, f)
+
+        assert get_current_organization() == "edited-org"
+
+    def test_set_keeps_other_keys(self, temp_config_dir):
+        """Test that a set only changes its own key."""
+        save_config({"current_user_email": "test@example.com", "custom": 1})
+
+        set_current_project("my-project")
+
+        assert load_config() == {
+            "current_user_email": "test@example.com",
+            "custom": 1,
+            "current_project": "my-project",
+        }
+
+
+class TestBatch:
+    """Tests for batched config writes."""
+
+    def test_flushes_once(self, temp_config_dir):
+        """Test that staged changes are written in a single write."""
+        from agentflow.utils.config import Config, batch
+
+        set_current_project("old-project")
+
+        with patch.object(Config, "write", autospec=True, side_effect=Config.write) as write:
+            with batch():
+                set_current_organization("my-org")
+                clear_current_project()
+                assert get_current_organization() == "my-org"
+                assert get_current_project() is None
+                write.assert_not_called()
+
+        write.assert_called_once()
+        assert load_config() == {"current_organization": "my-org"}
+
+    def test_nested_batches_join(self, temp_config_dir):
+        """Test that only the outermost batch writes."""
+        import agentflow.utils.config
+        from agentflow.utils.config import batch
+
+        with batch():
+            with batch():
+                set_current_organization("my-org")
+            assert not agentflow.utils.config.CONFIG_FILE.exists()
+
+        assert get_current_organization() == "my-org"
+
+    def test_discards_on_exception(self, temp_config_dir):
+        """Test that a failing batch writes nothing."""
+        from agentflow.utils.config import batch
+
+        set_current_organization("my-org")
+
+        with pytest.raises(RuntimeError):
+            with batch():
+                set_current_organization("other-org")
+                raise RuntimeError("boom")
+
+        assert get_current_organization() == "my-org"
+
+    def test_skips_unchanged_write(self, temp_config_dir):
+        """Test that setting the current values again doesn't rewrite the file."""
+        import agentflow.utils.config
+
+        set_current_organization("my-org")
+        before = agentflow.utils.config.CONFIG_FILE.stat().st_ino
+
+        set_current_organization("my-org")
+
+        assert agentflow.utils.config.CONFIG_FILE.stat().st_ino == before
@@ -0,0 +1,178 @@
+"""Tests for the resident daemon."""
+
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from agentflow import daemon
+from agentflow.cli import main
+from agentflow.daemon import Daemon, command_name
+
+pytestmark = pytest.mark.skipif(not daemon.is_supported(), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield data_dir
+
+
+@pytest.fixture
+def server(temp_dirs, monkeypatch):
+    """Run a daemon on a temporary socket in a background thread."""
+    monkeypatch.delenv(daemon.DAEMON_ENV_VAR, raising=False)
+    path = temp_dirs / "daemon.sock"
+    instance = Daemon(path)
+    thread = threading.Thread(target=instance.serve, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon.request({"op": "ping"}, path):
+            break
+        threading.Event().wait(0.01)
+
+    yield path
+
+    daemon.request({"op": "stop"}, path)
+    thread.join(timeout=5)
+
+
+def run_forwarded(path: Path, tmp_path: Path, args: list[str]) -> tuple[int, str, str]:
+    """Forward a command with files as its streams and return (code, stdout, stderr)."""
+    stdout, stderr = tmp_path / "stdout", tmp_path / "stderr"
+    with open(os.devnull) as stdin, open(stdout, "w") as out, open(stderr, "w") as err:
+        code = daemon.forward(args, path, streams=(stdin.fileno(), out.fileno(), err.fileno()))
+    return code, stdout.read_text(), stderr.read_text()
+
+
+class TestControlRequests:
+    """Tests for ping and stop requests."""
+
+    def test_ping(self, server):
+        """Test that a running daemon answers pings with its pid."""
+        assert daemon.request({"op": "ping"}, server) == {"pid": os.getpid()}
+
+    def test_not_running(self, tmp_path: Path):
+        """Test that requests to a missing daemon return None."""
+        assert daemon.request({"op": "ping"}, tmp_path / "missing.sock") is None
+
+    def test_stop_removes_socket(self, temp_dirs):
+        """Test that stopping the daemon removes its socket."""
+        path = temp_dirs / "daemon.sock"
+        instance = Daemon(path)
+        thread = threading.Thread(target=instance.serve, daemon=True)
+        thread.start()
+        while not daemon.request({"op": "ping"}, path):
+            threading.Event().wait(0.01)
+
+        daemon.request({"op": "stop"}, path)
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert not path.exists()
+
+
+class TestForward:
+    """Tests for forwarding commands to the daemon."""
+
+    def test_runs_command_on_client_streams(self, server, tmp_path: Path):
+        """Test that output goes to the client's stdout."""
+        code, stdout, _ = run_forwarded(server, tmp_path, ["version"])
+
+        assert code == 0
+        assert "AgentFlow CLI v0.0.1" in stdout
+
+    def test_returns_exit_code(self, server, tmp_path: Path):
+        """Test that usage errors keep their exit code."""
+        code, stdout, stderr = run_forwarded(server, tmp_path, ["nope"])
+
+        assert code == 2
+        assert "No such command" in stdout + stderr
+
+    def test_uses_client_environment(self, server, tmp_path: Path, monkeypatch):
+        """Test that AGENTFLOW_* variables of the client apply to the command."""
+        monkeypatch.setenv("AGENTFLOW_STORAGE", "nope")
+
+        code, _, stderr = run_forwarded(server, tmp_path, ["storage", "status"])
+
+        assert code == 1
+        assert "nope" in stderr
+        assert os.environ["AGENTFLOW_STORAGE"] == "nope"
+
+    def test_falls_back_without_daemon(self, tmp_path: Path):
+        """Test that forward returns None when no daemon is running."""
+        assert daemon.forward(["version"], tmp_path / "missing.sock") is None
+
+    def test_can_be_disabled(self, server, monkeypatch):
+        """Test that AGENTFLOW_DAEMON=off bypasses a running daemon."""
+        monkeypatch.setenv(daemon.DAEMON_ENV_VAR, "off")
+
+        assert daemon.forward(["version"], server) is None
+
+
+class TestLocalCommands:
+    """Tests for commands that must never be forwarded to the daemon."""
+
+    @pytest.mark.parametrize(
+        "argv,name",
+        [
+            (["daemon", "stop"], "daemon"),
+            (["--output", "json", "daemon", "stop"], "daemon"),
+            (["--output=json", "shell"], "shell"),
+            (["--output", "json"], None),
+        ],
+    )
+    def test_command_name(self, argv, name):
+        """Test that root options and their values are skipped."""
+        assert command_name(argv) == name
+
+    def test_stop_after_root_option(self, server, temp_dirs):
+        """Test that `--output json daemon stop` runs locally and stops the daemon."""
+
+        def run():
+            try:
+                main(["--output", "json", "daemon", "stop"])
+            except SystemExit:
+                pass
+
+        with patch("agentflow.paths.DATA_DIR", temp_dirs):
+            thread = threading.Thread(target=run, daemon=True)
+            thread.start()
+            thread.join(timeout=10)
+
+        assert not thread.is_alive()
+        for _ in range(500):
+            if not server.exists():
+                break
+            threading.Event().wait(0.01)
+        assert not server.exists()
+
+    def test_forwarded_before_cli_import(self):
+        """Test that the entry point forwards commands without importing the CLI or typer."""
+        script = (
+            "import sys\n"
+            "from agentflow import daemon\n"
+            "from agentflow.__main__ import main\n"
+            "daemon.forward = lambda args: 7\n"
+            "sys.argv = ['agentflow', 'org', 'list']\n"
+            "try:\n"
+            "    main()\n"
+            "except SystemExit as e:\n"
+            "    print(e.code, 'agentflow.cli' in sys.modules, 'typer' in sys.modules)\n"
+        )
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+        env.pop("_AGENTFLOW_COMPLETE", None)
+
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env)
+
+        assert result.stdout.split() == ["7", "False", "False"]
@@ -0,0 +1,229 @@
+"""Tests for atomic writes and durability modes."""
+
+import os
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow import durability, storage
+from agentflow.cli import app
+from agentflow.durability import get_mode, group_commit, sync, write_atomic
+from agentflow.models import Database, Organization, Project, User
+from agentflow.sqlite_backend import SQLiteBackend, close_connections
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path, monkeypatch):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+    monkeypatch.delenv(durability.ENV_VAR, raising=False)
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield data_dir
+    storage.clear_cache()
+    close_connections()
+
+
+@pytest.fixture
+def fsyncs():
+    """Record the paths passed to fsync."""
+    synced = []
+    opened = {}
+    real_open = os.open
+
+    def fake_fsync(fd):
+        # Descriptors are reused once closed, so each one is looked up once
+        synced.append(opened.pop(fd, "temp"))
+
+    def fake_open(path, flags, *args):
+        fd = real_open(path, flags, *args)
+        opened[fd] = Path(path)
+        return fd
+
+    with patch("agentflow.durability.os.fsync", fake_fsync):
+        with patch("agentflow.durability.os.open", fake_open):
+            yield synced
+
+
+class TestGetMode:
+    """Tests for selecting the durability mode."""
+
+    def test_default(self, monkeypatch):
+        """Test that writes are strict unless configured otherwise."""
+        monkeypatch.delenv(durability.ENV_VAR, raising=False)
+        assert get_mode() == "strict"
+        assert get_mode("batched") == "batched"
+
+    def test_env_wins(self, monkeypatch):
+        """Test that the environment variable wins over the config."""
+        monkeypatch.setenv(durability.ENV_VAR, "relaxed")
+        assert get_mode("batched") == "relaxed"
+
+    def test_unknown(self, monkeypatch):
+        """Test that an unknown mode is rejected."""
+        monkeypatch.delenv(durability.ENV_VAR, raising=False)
+        with pytest.raises(ValueError, match="Unknown durability mode 'fast'"):
+            get_mode("fast")
+
+
+class TestWriteAtomic:
+    """Tests for write_atomic."""
+
+    def test_replaces_content(self, tmp_path: Path):
+        """Test that the file is replaced and no temporary file is left."""
+        path = tmp_path / "data.json"
+        path.write_bytes(b"old")
+
+        write_atomic(path, b"new", "strict")
+
+        assert path.read_bytes() == b"new"
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_failed_write_keeps_old_content(self, tmp_path: Path):
+        """Test that a write cut short leaves the old file intact."""
+        path = tmp_path / "data.json"
+        path.write_bytes(b"old")
+
+        with patch("agentflow.durability.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                write_atomic(path, b"new", "relaxed")
+
+        assert path.read_bytes() == b"old"
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_strict_syncs_file_and_directory(self, tmp_path: Path, fsyncs):
+        """Test that strict writes sync the file and then its directory."""
+        write_atomic(tmp_path / "data.json", b"new", "strict")
+
+        assert fsyncs == ["temp", tmp_path]
+
+    def test_relaxed_does_not_sync(self, tmp_path: Path, fsyncs):
+        """Test that relaxed writes leave syncing to the OS."""
+        write_atomic(tmp_path / "data.json", b"new", "relaxed")
+        sync(tmp_path / "data.json", "relaxed", directory=True)
+
+        assert fsyncs == []
+
+    def test_batched_group_commit(self, tmp_path: Path, fsyncs):
+        """Test that batched writes sync their data before the rename, and the rest once."""
+        (tmp_path / "journal.jsonl").write_bytes(b"")
+
+        with group_commit():
+            write_atomic(tmp_path / "a.json", b"1", "batched")
+            write_atomic(tmp_path / "a.json", b"2", "batched")
+            write_atomic(tmp_path / "b.json", b"3", "batched")
+            with group_commit():
+                sync(tmp_path / "journal.jsonl", "batched")
+            assert fsyncs == ["temp", "temp", "temp"]
+            assert (tmp_path / "a.json").read_bytes() == b"2"
+
+        assert fsyncs[3:] == [tmp_path / "journal.jsonl", tmp_path]
+
+    def test_batched_synced_before_rename(self, tmp_path: Path):
+        """Test that a batched write's data is on disk before its new name is."""
+        path = tmp_path / "data.json"
+        synced = []
+        real_replace = os.replace
+
+        def fake_replace(src, dst):
+            synced.append("replace")
+            real_replace(src, dst)
+
+        with patch("agentflow.durability.os.fsync", lambda fd: synced.append("fsync")):
+            with patch("agentflow.durability.os.replace", fake_replace):
+                with group_commit():
+                    write_atomic(path, b"new", "batched")
+                    assert synced == ["fsync", "replace"]
+
+        assert synced == ["fsync", "replace", "fsync"]
+
+    def test_batched_outside_group(self, tmp_path: Path, fsyncs):
+        """Test that a batched write outside a group is synced right away."""
+        write_atomic(tmp_path / "data.json", b"new", "batched")
+
+        assert fsyncs == ["temp", tmp_path]
+
+
+class TestStorageDurability:
+    """Tests for durable writes in the storage backends."""
+
+    def sample(self) -> Database:
+        """Build a database with one organization and project."""
+        db = Database()
+        user = User(email="a@example.com", name="A", password_hash="x")
+        db.add_user(user)
+        org = Organization(owner_id=user.id, name="Acme", slug="acme")
+        db.add_organization(org)
+        db.add_project(Project(organization_id=org.id, name="Web", slug="web"))
+        return db
+
+    def test_json_save_is_atomic(self, temp_dirs):
+        """Test that saving a snapshot that fails leaves the old one."""
+        storage.save_database(self.sample())
+        before = storage.DATA_FILE.read_bytes()
+
+        with patch("agentflow.durability.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                storage.save_database(Database())
+
+        assert storage.DATA_FILE.read_bytes() == before
+        assert not list(temp_dirs.glob(".*.tmp"))
+
+    def test_journal_append_synced(self, temp_dirs, fsyncs):
+        """Test that strict mode syncs the journal after a transaction."""
+        db = self.sample()
+        storage.save_database(db)
+        fsyncs.clear()
+
+        storage.add_project(Project(organization_id=db.organizations[0].id, name="API", slug="api"))
+
+        assert storage.get_journal_file() in fsyncs
+
+    def test_mode_from_config(self, temp_dirs, fsyncs):
+        """Test that the configured mode applies to data writes."""
+        result = runner.invoke(app, ["storage", "durability", "relaxed"])
+        assert result.exit_code == 0
+        fsyncs.clear()
+
+        storage.save_database(self.sample())
+
+        assert storage.get_durability() == "relaxed"
+        assert fsyncs == []
+
+    def test_batched_transaction(self, temp_dirs, fsyncs, monkeypatch):
+        """Test that the directories of a transaction's shards are synced once each."""
+        monkeypatch.setenv(storage.BACKEND_ENV_VAR, "sharded")
+        monkeypatch.setenv(durability.ENV_VAR, "batched")
+        db = self.sample()
+        storage.save_database(db)
+        fsyncs.clear()
+
+        with storage.transaction():
+            for slug in ("api", "docs"):
+                project = Project(organization_id=db.organizations[0].id, name=slug, slug=slug)
+                storage.add_project(project)
+
+        directories = [path for path in fsyncs if path != "temp"]
+        assert "temp" in fsyncs
+        assert directories and len(directories) == len(set(directories))
+
+    @pytest.mark.parametrize("mode,value", [("strict", 2), ("relaxed", 0), ("batched", 1)])
+    def test_sqlite_synchronous(self, tmp_path: Path, mode, value):
+        """Test that SQLite's synchronous setting follows the mode."""
+        backend = SQLiteBackend(tmp_path / "data.db", mode)
+
+        assert backend.conn.execute("PRAGMA synchronous").fetchone()[0] == value
+        close_connections()
+
+    def test_unknown_mode_rejected(self, temp_dirs):
+        """Test that the durability command rejects unknown modes."""
+        result = runner.invoke(app, ["storage", "durability", "fast"])
+
+        assert result.exit_code == 1
+        assert "Unknown durability mode: fast" in result.stdout
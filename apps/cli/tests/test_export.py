@@ -0,0 +1,128 @@
+"""Tests for export commands."""
+
+import csv
+import io
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow import storage
+from agentflow.cli import app
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield data_dir
+
+
+@pytest.fixture
+def with_data(temp_dirs):
+    """Register a user with two organizations and three projects."""
+    commands = [
+        ["auth", "register", "--email", "test@example.com", "--name", "Test", "--password", "secretpw1"],
+        ["org", "create", "--name", "My Org", "--slug", "my-org"],
+        ["org", "create", "--name", "Other", "--slug", "other"],
+        ["project", "create", "--org", "my-org", "--name", "Web", "--slug", "web"],
+        ["project", "create", "--org", "my-org", "--name", "API", "--slug", "api"],
+        ["project", "create", "--org", "other", "--name", "Docs", "--slug", "docs"],
+    ]
+    for args in commands:
+        assert runner.invoke(app, args).exit_code == 0
+
+    # Deactivate one project
+    with storage.transaction() as tx:
+        org = tx.find_organization_by_slug("my-org")
+        tx.find_project_by_slug(org.id, "api").is_active = False
+        tx.save(tx.load())
+
+
+def export(*args: str) -> list[dict]:
+    """Run an export as JSONL and parse its lines."""
+    result = runner.invoke(app, ["export", *args])
+    assert result.exit_code == 0, result.output
+    return [json.loads(line) for line in result.stdout.splitlines()]
+
+
+class TestExport:
+    """Tests for export commands."""
+
+    def test_users_without_secrets(self, with_data):
+        """Test that users are exported without password hashes or keys."""
+        [user] = export("users")
+
+        assert user["email"] == "test@example.com"
+        assert user["api_key_count"] == 1
+        assert "password_hash" not in user
+        assert "api_keys" not in user
+
+    def test_orgs(self, with_data):
+        """Test that every organization of the user is exported, or just one with --org."""
+        assert [o["slug"] for o in export("orgs")] == ["my-org", "other"]
+        assert [o["slug"] for o in export("orgs", "--org", "other")] == ["other"]
+
+    def test_projects_filters(self, with_data):
+        """Test the organization and active filters."""
+        assert [p["slug"] for p in export("projects")] == ["web", "api", "docs"]
+        assert [p["slug"] for p in export("projects", "--org", "my-org", "--active")] == ["web"]
+        assert [p["slug"] for p in export("projects", "--inactive")] == ["api"]
+        assert export("projects", "--org", "other")[0]["org"] == "other"
+
+    def test_csv(self, with_data):
+        """Test that CSV output has a header and readable booleans."""
+        result = runner.invoke(app, ["export", "projects", "--format", "csv"])
+
+        rows = list(csv.DictReader(io.StringIO(result.stdout)))
+        assert [r["slug"] for r in rows] == ["web", "api", "docs"]
+        assert rows[1]["is_active"] == "false"
+        assert rows[0]["description"] == ""
+
+    def test_round_trips_through_import(self, with_data, tmp_path: Path):
+        """Test that exported projects can be imported into a new org."""
+        result = runner.invoke(app, ["export", "projects", "--org", "my-org", "--format", "csv"])
+        path = tmp_path / "projects.csv"
+        path.write_text(result.stdout.replace(",my-org,", ",other,"))
+
+        assert runner.invoke(app, ["project", "import", str(path)]).exit_code == 0
+        other = storage.find_organization_by_slug("other")
+        assert storage.find_project_by_slug(other.id, "api").is_active is False
+
+    def test_unknown_org_and_format(self, with_data):
+        """Test that an unknown organization or format is an error."""
+        result = runner.invoke(app, ["export", "projects", "--org", "nope"])
+        assert result.exit_code == 1
+        assert "not found" in result.stdout
+
+        result = runner.invoke(app, ["export", "orgs", "--format", "xml"])
+        assert result.exit_code == 1
+        assert "Unknown format" in result.stdout
+
+    def test_other_users_data_not_exported(self, with_data):
+        """Test that only the current user and the organizations they own are exported."""
+        commands = [
+            ["auth", "register", "--email", "other@example.com", "--name", "Other", "--password", "secretpw2"],
+            ["org", "create", "--name", "Theirs", "--slug", "theirs"],
+            ["project", "create", "--org", "theirs", "--name", "Secret", "--slug", "secret"],
+            ["auth", "login", "--email", "test@example.com", "--password", "secretpw1"],
+        ]
+        for args in commands:
+            assert runner.invoke(app, args).exit_code == 0
+
+        assert [u["email"] for u in export("users")] == ["test@example.com"]
+        assert [o["slug"] for o in export("orgs")] == ["my-org", "other"]
+        assert [p["slug"] for p in export("projects")] == ["web", "api", "docs"]
+
+        for command in ("orgs", "projects"):
+            result = runner.invoke(app, ["export", command, "--org", "theirs"])
+            assert result.exit_code == 1
+            assert "Access denied" in result.stdout
@@ -0,0 +1,207 @@
+"""Tests for org and project import commands."""
+
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow import storage
+from agentflow.cli import app
+from agentflow.utils.records import bool_field, detect_format, read_records
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield data_dir
+
+
+@pytest.fixture
+def with_org(temp_dirs):
+    """Register a user and create and select an organization."""
+    runner.invoke(
+        app, ["auth", "register", "--email", "test@example.com", "--name", "Test", "--password", "secretpw1"]
+    )
+    runner.invoke(app, ["org", "create", "--name", "My Org", "--slug", "my-org"])
+    runner.invoke(app, ["org", "use", "my-org"])
+    return storage.find_organization_by_slug("my-org")
+
+
+def write_jsonl(path: Path, records: list[dict]) -> str:
+    """Write records as JSON lines and return the path."""
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+    return str(path)
+
+
+class TestRecords:
+    """Tests for record reading helpers."""
+
+    def test_detect_format(self):
+        """Test that the format comes from the option or the extension."""
+        assert detect_format("orgs.csv") == "csv"
+        assert detect_format("orgs.jsonl") == "jsonl"
+        assert detect_format("orgs.txt") is None
+        assert detect_format("-", "jsonl") == "jsonl"
+        assert detect_format("orgs.csv", "xml") is None
+
+    def test_read_jsonl_reports_bad_lines(self, tmp_path: Path):
+        """Test that unparsable lines are reported with their line number."""
+        path = tmp_path / "in.jsonl"
+        path.write_text('{"name": "A"}\n\nnot json\n[1]\n')
+
+        with open(path) as f:
+            records = [*read_records(f, "jsonl")]
+
+        assert records[0] == (1, {"name": "A"})
+        assert records[1][0] == 3 and "Invalid JSON" in records[1][1]["__error__"]
+        assert records[2] == (4, {"__error__": "Expected a JSON object"})
+
+    def test_bool_field(self):
+        """Test that booleans are read from JSON values and CSV text."""
+        assert bool_field({"a": False}, "a", True) is False
+        assert bool_field({"a": "Yes"}, "a", False) is True
+        assert bool_field({"a": ""}, "a", True) is True
+        assert bool_field({"a": "maybe"}, "a", True) is None
+
+
+class TestOrgImport:
+    """Tests for org import command."""
+
+    def test_imports_csv(self, with_org, tmp_path: Path):
+        """Test that organizations are created from a CSV file."""
+        path = tmp_path / "orgs.csv"
+        path.write_text("name,slug,description\nAcme,acme,Rockets\nGlobex,globex,\n")
+
+        result = runner.invoke(app, ["org", "import", str(path)])
+
+        assert result.exit_code == 0
+        assert "Imported 2 organizations" in result.stdout
+        acme = storage.find_organization_by_slug("acme")
+        assert acme.description == "Rockets"
+        assert acme.owner_id == with_org.owner_id
+        assert storage.find_organization_by_slug("globex").description is None
+
+    def test_invalid_records_import_nothing(self, with_org, tmp_path: Path):
+        """Test that any invalid record aborts the whole import."""
+        path = write_jsonl(
+            tmp_path / "orgs.jsonl",
+            [
+                {"name": "Acme", "slug": "acme"},
+                {"name": "Taken", "slug": "my-org"},
+                {"name": "Again", "slug": "acme"},
+                {"name": "Bad", "slug": "Bad Slug"},
+                {"slug": "nameless"},
+            ],
+        )
+
+        result = runner.invoke(app, ["org", "import", path])
+
+        assert result.exit_code == 1
+        assert "Line 2: Organization with slug 'my-org' already exists" in result.stdout
+        assert "Line 3: Organization with slug 'acme' already exists" in result.stdout
+        assert "Line 5: Name is required" in result.stdout
+        assert "4 invalid records" in result.stdout
+        assert storage.find_organization_by_slug("acme") is None
+
+    def test_dry_run(self, with_org, tmp_path: Path):
+        """Test that --dry-run validates without saving."""
+        path = write_jsonl(tmp_path / "orgs.jsonl", [{"name": "Acme", "slug": "acme"}])
+
+        result = runner.invoke(app, ["org", "import", path, "--dry-run"])
+
+        assert result.exit_code == 0
+        assert "1 organizations are valid" in result.stdout
+        assert storage.find_organization_by_slug("acme") is None
+
+    def test_unknown_format(self, with_org, tmp_path: Path):
+        """Test that a file of unknown type needs --format."""
+        path = tmp_path / "orgs.txt"
+        path.write_text('{"name": "Acme", "slug": "acme"}\n')
+
+        result = runner.invoke(app, ["org", "import", str(path)])
+        assert result.exit_code == 1
+        assert "Unknown format" in result.stdout
+
+        result = runner.invoke(app, ["org", "import", str(path), "--format", "jsonl"])
+        assert result.exit_code == 0
+
+    def test_missing_file(self, with_org):
+        """Test that a missing file is an error."""
+        result = runner.invoke(app, ["org", "import", "missing.csv"])
+
+        assert result.exit_code == 1
+        assert "File not found" in result.stdout
+
+
+class TestProjectImport:
+    """Tests for project import command."""
+
+    def test_imports_from_stdin(self, with_org):
+        """Test that projects are read from stdin into the current org."""
+        lines = [
+            {"name": "Web", "slug": "web", "github_url": "https://github.com/acme/web"},
+            {"name": "Old", "slug": "old", "is_active": False},
+        ]
+        stdin = "".join(json.dumps(r) + "\n" for r in lines)
+
+        result = runner.invoke(app, ["project", "import", "-", "--format", "jsonl"], input=stdin)
+
+        assert result.exit_code == 0
+        assert "Imported 2 projects" in result.stdout
+        assert storage.find_project_by_slug(with_org.id, "web").github_url == "https://github.com/acme/web"
+        assert storage.find_project_by_slug(with_org.id, "old").is_active is False
+
+    def test_org_column(self, with_org, tmp_path: Path):
+        """Test that records can name their organization."""
+        runner.invoke(app, ["org", "create", "--name", "Other", "--slug", "other"])
+        path = tmp_path / "projects.csv"
+        path.write_text("name,slug,org\nWeb,web,\nWeb,web,other\n")
+
+        result = runner.invoke(app, ["project", "import", str(path)])
+
+        assert result.exit_code == 0
+        other = storage.find_organization_by_slug("other")
+        assert storage.find_project_by_slug(with_org.id, "web")
+        assert storage.find_project_by_slug(other.id, "web")
+
+    def test_invalid_records_import_nothing(self, with_org, tmp_path: Path):
+        """Test that duplicates, unknown orgs and bad values abort the import."""
+        runner.invoke(app, ["project", "create", "--name", "Web", "--slug", "web"])
+        path = tmp_path / "projects.csv"
+        path.write_text(
+            "name,slug,org,is_active\nApi,api,,\nWeb,web,,\nApi,api,,\nX,x,nope,\nY,y,,maybe\n"
+        )
+
+        result = runner.invoke(app, ["project", "import", str(path)])
+
+        assert result.exit_code == 1
+        assert "Line 3: Project with slug 'web' already exists in my-org" in result.stdout
+        assert "Line 4: Project with slug 'api' already exists in my-org" in result.stdout
+        assert "Line 5: Organization 'nope' not found" in result.stdout
+        assert "Line 6: is_active must be true or false" in result.stdout
+        assert storage.find_project_by_slug(with_org.id, "api") is None
+
+    def test_writes_once(self, with_org, tmp_path: Path):
+        """Test that a large import is saved in a single write."""
+        path = write_jsonl(
+            tmp_path / "projects.jsonl",
+            [{"name": f"Project {i}", "slug": f"project-{i}"} for i in range(500)],
+        )
+
+        with patch.object(
+            storage.JSONBackend, "persist", autospec=True, side_effect=storage.JSONBackend.persist
+        ) as persist:
+            result = runner.invoke(app, ["project", "import", path])
+
+        assert result.exit_code == 0
+        persist.assert_called_once()
+        assert len(storage.find_projects_by_organization(with_org.id)) == 500
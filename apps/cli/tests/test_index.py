@@ -0,0 +1,102 @@
+"""Tests for in-memory database indexes."""
+
+from agentflow.index import DatabaseIndex
+from agentflow.models import User, Organization, Project, Database
+
+
+def make_database() -> Database:
+    """Build a small database with two orgs and three projects."""
+    user = User(id="user-1", email="test@example.com", password_hash="hash", name="Test")
+    org1 = Organization(id="org-1", owner_id="user-1", name="Org 1", slug="org-1")
+    org2 = Organization(id="org-2", owner_id="user-2", name="Org 2", slug="org-2")
+    projects = [
+        Project(id="proj-1", organization_id="org-1", name="P1", slug="web"),
+        Project(id="proj-2", organization_id="org-2", name="P2", slug="web"),
+        Project(id="proj-3", organization_id="org-1", name="P3", slug="api"),
+    ]
+    return Database(users=[user], organizations=[org1, org2], projects=projects)
+
+
+class TestDatabaseIndex:
+    """Tests for DatabaseIndex lookups."""
+
+    def test_user_by_email(self):
+        """Test that users are indexed by email."""
+        index = DatabaseIndex(make_database())
+
+        assert index.user_by_email("test@example.com").id == "user-1"
+        assert index.user_by_email("missing@example.com") is None
+
+    def test_organization_by_slug(self):
+        """Test that organizations are indexed by slug."""
+        index = DatabaseIndex(make_database())
+
+        assert index.organization_by_slug("org-2").id == "org-2"
+        assert index.organization_by_slug("missing") is None
+
+    def test_project_by_slug_is_scoped_to_organization(self):
+        """Test that project slugs are indexed per organization."""
+        index = DatabaseIndex(make_database())
+
+        assert index.project_by_slug("org-1", "web").id == "proj-1"
+        assert index.project_by_slug("org-2", "web").id == "proj-2"
+        assert index.project_by_slug("org-2", "api") is None
+
+    def test_grouped_lookups_keep_insertion_order(self):
+        """Test that per-org and per-owner lists keep insertion order."""
+        index = DatabaseIndex(make_database())
+
+        assert [p.id for p in index.projects_in_organization("org-1")] == [
+            "proj-1",
+            "proj-3",
+        ]
+        assert [o.id for o in index.organizations_owned_by("user-1")] == ["org-1"]
+        assert index.projects_in_organization("missing") == []
+
+
+class TestDatabaseIndexMaintenance:
+    """Tests for keeping the index in sync with the database."""
+
+    def test_index_is_reused(self):
+        """Test that the index is built once per database."""
+        db = make_database()
+
+        assert db.index is db.index
+
+    def test_add_helpers_update_index(self):
+        """Test that Database.add_* keep an existing index up to date."""
+        db = make_database()
+        index = db.index
+
+        db.add_project(Project(id="proj-4", organization_id="org-2", name="P4", slug="docs"))
+        db.add_organization(
+            Organization(id="org-3", owner_id="user-1", name="Org 3", slug="org-3")
+        )
+
+        assert db.index is index
+        assert index.project_by_slug("org-2", "docs").id == "proj-4"
+        assert [o.id for o in index.organizations_owned_by("user-1")] == ["org-1", "org-3"]
+
+    def test_project_counts_are_maintained(self):
+        """Test that per-organization project counts follow added projects."""
+        db = make_database()
+        index = db.index
+
+        db.add_project(
+            Project(id="proj-4", organization_id="org-1", name="P4", slug="old", is_active=False)
+        )
+
+        assert index.count_projects("org-1") == (2, 1)
+        assert index.count_projects("org-1").total == 3
+        assert index.count_projects("org-2") == (1, 0)
+        assert index.count_projects("missing") == (0, 0)
+
+    def test_direct_append_rebuilds_index(self):
+        """Test that appending to a collection directly invalidates the index."""
+        db = make_database()
+        index = db.index
+
+        db.projects.append(Project(id="proj-4", organization_id="org-2", name="P4", slug="docs"))
+
+        assert db.index is not index
+        assert db.index.project_by_slug("org-2", "docs").id == "proj-4"
@@ -0,0 +1,110 @@
+"""Tests for the mutation journal."""
+
+import pytest
+from pathlib import Path
+
+from agentflow.journal import make_entry, apply_entry, append_entries, read_entries
+from agentflow.models import User, APIKey, Organization, Project, Database
+
+
+class TestMakeEntry:
+    """Tests for make_entry function."""
+
+    def test_serializes_record(self):
+        """Test that records are dumped in JSON mode."""
+        project = Project(id="p1", organization_id="org-1", name="Web", slug="web")
+
+        entry = make_entry("insert", "projects", project)
+
+        assert entry["op"] == "insert"
+        assert entry["collection"] == "projects"
+        assert entry["record"]["slug"] == "web"
+        assert isinstance(entry["record"]["created_at"], str)
+
+    def test_rejects_unknown_op(self):
+        """Test that unknown ops are rejected."""
+        with pytest.raises(ValueError):
+            make_entry("upsert", "projects")
+
+    def test_rejects_unknown_collection(self):
+        """Test that unknown collections are rejected."""
+        with pytest.raises(ValueError):
+            make_entry("insert", "tasks")
+
+
+class TestApplyEntry:
+    """Tests for apply_entry function."""
+
+    def test_insert_is_idempotent(self):
+        """Test that replaying an insert twice keeps a single record."""
+        db = Database()
+        entry = make_entry("insert", "projects", Project(organization_id="o", name="W", slug="w"))
+
+        apply_entry(db, entry)
+        apply_entry(db, entry)
+
+        assert len(db.projects) == 1
+        assert db.index.project_by_slug("o", "w") is not None
+
+    def test_update_replaces_record(self):
+        """Test that updates replace the record with the same id."""
+        org = Organization(id="org-1", owner_id="u", name="Old", slug="old")
+        db = Database(organizations=[org])
+        renamed = org.model_copy(update={"name": "New", "slug": "new"})
+
+        apply_entry(db, make_entry("update", "organizations", renamed))
+
+        assert [o.name for o in db.organizations] == ["New"]
+        assert db.index.organization_by_slug("old") is None
+        assert db.index.organization_by_slug("new").id == "org-1"
+
+    def test_delete_removes_record(self):
+        """Test that deletes remove the record and ignore missing ids."""
+        db = Database(projects=[Project(id="p1", organization_id="o", name="W", slug="w")])
+
+        apply_entry(db, make_entry("delete", "projects", id="p1"))
+        apply_entry(db, make_entry("delete", "projects", id="p1"))
+
+        assert db.projects == []
+
+    def test_api_key_insert_targets_user(self):
+        """Test that API key entries are applied to their user."""
+        user = User(id="user-1", email="test@example.com", password_hash="h", name="T")
+        db = Database(users=[user])
+        entry = make_entry("insert", "api_keys", APIKey(key="afk_1", name="K"), user_id="user-1")
+
+        apply_entry(db, entry)
+        apply_entry(db, entry)
+
+        assert [k.key for k in db.users[0].api_keys] == ["afk_1"]
+
+
+class TestAppendAndRead:
+    """Tests for reading and writing journal files."""
+
+    def test_round_trip_from_offset(self, tmp_path: Path):
+        """Test that entries can be read incrementally by offset."""
+        path = tmp_path / "data.journal"
+        append_entries(path, [make_entry("delete", "projects", id="p1")])
+
+        first, offset = read_entries(path)
+        append_entries(path, [make_entry("delete", "projects", id="p2")])
+        second, end = read_entries(path, offset)
+
+        assert [e["id"] for e in first] == ["p1"]
+        assert [e["id"] for e in second] == ["p2"]
+        assert end == path.stat().st_size
+
+    def test_skips_torn_trailing_line(self, tmp_path: Path):
+        """Test that an unfinished last line is ignored, then isolated by the next append."""
+        path = tmp_path / "data.journal"
+        append_entries(path, [make_entry("delete", "projects", id="p1")])
+        with open(path, "a") as f:
+            f.write('{"op": "ins')
+
+        entries, _ = read_entries(path)
+        assert [e["id"] for e in entries] == ["p1"]
+
+        append_entries(path, [make_entry("delete", "projects", id="p2")])
+        entries, _ = read_entries(path)
+        assert [e["id"] for e in entries] == ["p1", "p2"]
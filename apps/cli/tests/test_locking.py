@@ -0,0 +1,324 @@
+"""Tests for locking and concurrent writes between processes."""
+
+import fcntl
+import multiprocessing
+import os
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from agentflow import storage
+from agentflow.cli import run_command
+from agentflow.utils import config
+from agentflow.locking import ConflictError, FileLock
+from agentflow.models import Database, Organization, Project, User
+
+
+@pytest.fixture
+def temp_data_dir(tmp_path: Path):
+    """Create temporary data directory for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            yield data_dir
+    storage.clear_cache()
+
+
+def in_other_process(func, *args) -> None:
+    """Run a function in a new process, as another agentflow command would."""
+    process = multiprocessing.get_context("spawn").Process(target=func, args=args)
+    process.start()
+    process.join(timeout=60)
+    assert process.exitcode == 0
+
+
+def can_lock(path: Path, operation: int) -> bool:
+    """Check whether an independent open of a lock file can take a lock."""
+    fd = os.open(path, os.O_RDWR)
+    try:
+        fcntl.flock(fd, operation | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def add_projects(
+    data_dir: Path, organization_id: str, slugs: list[str], compact: bool = False
+) -> None:
+    """Add projects one write at a time, in a new process."""
+    storage.DATA_DIR = data_dir
+    storage.DATA_FILE = data_dir / "data.json"
+    for slug in slugs:
+        storage.add_project(Project(organization_id=organization_id, name=slug, slug=slug))
+    if compact:
+        storage.get_backend().compact()
+
+
+def set_config_keys(config_file: Path, key: str, count: int) -> None:
+    """Set a config key over and over, one write at a time, in a new process."""
+    config.CONFIG_FILE = config_file
+    for n in range(count):
+        config.get_config().set(key, n)
+
+
+def sample() -> Database:
+    """Store and return a database with one user and organization."""
+    db = Database()
+    user = User(email="a@example.com", name="A", password_hash="x")
+    db.add_user(user)
+    db.add_organization(Organization(owner_id=user.id, name="Acme", slug="acme"))
+    storage.save_database(db)
+    return db
+
+
+def stored_slugs() -> list[str]:
+    """Get the stored project slugs, as a new process would read them."""
+    storage.clear_cache()
+    return sorted(p.slug for p in storage.load_database().projects)
+
+
+class TestFileLock:
+    """Tests for FileLock."""
+
+    def test_shared_allows_readers_only(self, tmp_path: Path):
+        """Test that a shared lock lets others read but not write."""
+        lock = FileLock(tmp_path / "data.lock")
+
+        with lock.shared():
+            assert can_lock(lock.path, fcntl.LOCK_SH)
+            assert not can_lock(lock.path, fcntl.LOCK_EX)
+
+        assert can_lock(lock.path, fcntl.LOCK_EX)
+
+    def test_exclusive_upgrade_is_reentrant(self, tmp_path: Path):
+        """Test that an exclusive block under a shared one upgrades and then downgrades."""
+        lock = FileLock(tmp_path / "data.lock")
+
+        with lock.shared():
+            with lock.exclusive():
+                with lock.shared():
+                    assert not can_lock(lock.path, fcntl.LOCK_SH)
+            assert can_lock(lock.path, fcntl.LOCK_SH)
+            assert not can_lock(lock.path, fcntl.LOCK_EX)
+
+        assert can_lock(lock.path, fcntl.LOCK_EX)
+
+    def test_read_does_not_create_directory(self, tmp_path: Path):
+        """Test that a shared lock in a missing directory doesn't create it."""
+        lock = FileLock(tmp_path / "missing" / "data.lock")
+
+        with lock.shared():
+            pass
+
+        assert not lock.path.parent.exists()
+
+
+class TestVersion:
+    """Tests for the version stamp of the JSON backend."""
+
+    def test_every_write_bumps_version(self, temp_data_dir):
+        """Test that saves and transactions each bump the stored version."""
+        db = sample()
+        assert storage.load_database().version == 1
+
+        storage.add_project(Project(organization_id=db.organizations[0].id, name="Web", slug="web"))
+        assert storage.load_database().version == 2
+
+        storage.get_backend().compact()
+        storage.clear_cache()
+        assert storage.load_database().version == 3
+
+    def test_version_read_from_journal(self, temp_data_dir):
+        """Test that a new process reads the version of the last journal line."""
+        db = sample()
+        for slug in ("web", "api"):
+            storage.add_project(Project(organization_id=db.organizations[0].id, name=slug, slug=slug))
+
+        storage.clear_cache()
+        assert storage.load_database().version == 3
+
+    def test_save_continues_from_stored_version(self, temp_data_dir):
+        """Test that saving a new Database doesn't reset the version."""
+        sample()
+        storage.save_database(Database())
+
+        storage.clear_cache()
+        assert storage.load_database().version == 2
+
+
+class TestConcurrentWrites:
+    """Tests for transactions racing with other processes."""
+
+    def test_other_writes_kept(self, temp_data_dir):
+        """Test that a transaction re-applies its changes onto another process's commit."""
+        org_id = sample().organizations[0].id
+
+        with storage.transaction():
+            storage.add_project(Project(organization_id=org_id, name="Web", slug="web"))
+            in_other_process(add_projects, temp_data_dir, org_id, ["api", "docs"])
+
+        # Same order as replaying the journal
+        assert [p.slug for p in storage.load_database().projects] == ["api", "docs", "web"]
+        assert storage.find_project_by_slug(org_id, "web") is not None
+        assert stored_slugs() == ["api", "docs", "web"]
+        assert storage.load_database().version == 4
+
+    def test_reapplied_after_compaction(self, temp_data_dir):
+        """Test that changes are re-applied onto a snapshot another process rewrote."""
+        org_id = sample().organizations[0].id
+
+        with storage.transaction():
+            storage.add_project(Project(organization_id=org_id, name="Web", slug="web"))
+            in_other_process(add_projects, temp_data_dir, org_id, ["api"], True)
+
+        assert stored_slugs() == ["api", "web"]
+        assert storage.load_database().version == 4
+
+    def test_taken_slug_conflicts_after_compaction(self, temp_data_dir):
+        """Test that a slug taken in a rewritten snapshot raises ConflictError."""
+        org_id = sample().organizations[0].id
+
+        with pytest.raises(ConflictError, match="Project slug 'web'"):
+            with storage.transaction():
+                storage.add_project(Project(organization_id=org_id, name="Web", slug="web"))
+                in_other_process(add_projects, temp_data_dir, org_id, ["web"], True)
+
+        assert stored_slugs() == ["web"]
+
+    def test_taken_slug_conflicts(self, temp_data_dir):
+        """Test that a slug taken by another process meanwhile raises ConflictError."""
+        org_id = sample().organizations[0].id
+
+        with pytest.raises(ConflictError, match="Project slug 'web' was taken by another process"):
+            with storage.transaction():
+                storage.add_project(Project(organization_id=org_id, name="Web", slug="web"))
+                storage.add_project(Project(organization_id=org_id, name="API", slug="api"))
+                in_other_process(add_projects, temp_data_dir, org_id, ["web"])
+
+        assert stored_slugs() == ["web"]
+        assert storage.load_database().version == 2
+
+    def test_stale_replace_conflicts(self, temp_data_dir):
+        """Test that replacing data another process changed meanwhile raises ConflictError."""
+        org_id = sample().organizations[0].id
+
+        with pytest.raises(ConflictError):
+            with storage.transaction() as tx:
+                db = tx.load()
+                in_other_process(add_projects, temp_data_dir, org_id, ["api"])
+                tx.save(Database(users=db.users))
+
+        assert stored_slugs() == ["api"]
+
+    def test_parallel_writers_lose_nothing(self, temp_data_dir):
+        """Test that writers in parallel processes lose none of each other's writes."""
+        org_id = sample().organizations[0].id
+        context = multiprocessing.get_context("spawn")
+        slugs = [[f"p{n}-{i}" for i in range(10)] for n in range(4)]
+
+        processes = [
+            context.Process(target=add_projects, args=(temp_data_dir, org_id, s)) for s in slugs
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        assert stored_slugs() == sorted(slug for s in slugs for slug in s)
+        assert storage.load_database().version == 41
+
+    def test_cli_reports_conflict(self, capsys):
+        """Test that a command losing a race reports the conflict and fails."""
+        conflict = ConflictError("Project slug 'web' was taken by another process")
+
+        with patch("agentflow.cli.app", side_effect=conflict):
+            assert run_command(["project", "create", "--name", "Web"]) == 1
+
+        assert "Project slug 'web' was taken by another process" in capsys.readouterr().out
+
+
+@pytest.fixture
+def sharded(temp_data_dir, monkeypatch):
+    """Select the sharded backend, in this process and the ones it starts."""
+    monkeypatch.setenv(storage.BACKEND_ENV_VAR, "sharded")
+    yield temp_data_dir
+
+
+class TestShardedConcurrentWrites:
+    """Tests for sharded transactions racing with other processes."""
+
+    def test_other_writes_kept(self, sharded):
+        """Test that a transaction re-applies its changes onto a shard another process rewrote."""
+        org_id = sample().organizations[0].id
+
+        with storage.transaction():
+            storage.add_project(Project(organization_id=org_id, name="Web", slug="web"))
+            in_other_process(add_projects, sharded, org_id, ["api", "docs"])
+
+        assert stored_slugs() == ["api", "docs", "web"]
+        assert storage.count_projects([org_id])[org_id] == (3, 0)
+
+    def test_taken_slug_conflicts(self, sharded):
+        """Test that a slug another process took meanwhile raises ConflictError."""
+        org_id = sample().organizations[0].id
+
+        with pytest.raises(ConflictError, match="Project slug 'web' was taken by another process"):
+            with storage.transaction():
+                storage.add_project(Project(organization_id=org_id, name="Web", slug="web"))
+                in_other_process(add_projects, sharded, org_id, ["web"])
+
+        assert stored_slugs() == ["web"]
+
+    def test_stale_replace_conflicts(self, sharded):
+        """Test that replacing shards another process rewrote meanwhile raises ConflictError."""
+        org_id = sample().organizations[0].id
+
+        with pytest.raises(ConflictError):
+            with storage.transaction() as tx:
+                db = tx.load()
+                in_other_process(add_projects, sharded, org_id, ["api"])
+                tx.save(Database(users=db.users, organizations=db.organizations))
+
+        assert stored_slugs() == ["api"]
+
+    def test_parallel_writers_lose_nothing(self, sharded):
+        """Test that writers in parallel processes lose none of each other's writes."""
+        org_id = sample().organizations[0].id
+        context = multiprocessing.get_context("spawn")
+        slugs = [[f"p{n}-{i}" for i in range(10)] for n in range(4)]
+
+        processes = [context.Process(target=add_projects, args=(sharded, org_id, s)) for s in slugs]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        assert stored_slugs() == sorted(slug for s in slugs for slug in s)
+        assert storage.count_projects([org_id])[org_id] == (40, 0)
+
+
+class TestConcurrentConfigWrites:
+    """Tests for config writes racing with other processes."""
+
+    def test_parallel_writers_keep_each_others_keys(self, tmp_path: Path):
+        """Test that processes setting different keys don't revert each other."""
+        config_file = tmp_path / "config.yaml"
+        context = multiprocessing.get_context("spawn")
+        keys = [f"key_{n}" for n in range(4)]
+
+        processes = [
+            context.Process(target=set_config_keys, args=(config_file, key, 50)) for key in keys
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        with patch("agentflow.utils.config.CONFIG_FILE", config_file):
+            assert {key: config.get_config().get(key) for key in keys} == {key: 49 for key in keys}
@@ -79,6 +79,25 @@ class TestOrgList:
         assert "org-2" in result.stdout
         assert "0" in result.stdout  # Project count
 
+    def test_list_counts_without_reading_projects(self, temp_dirs, authenticated_user):
+        """Test that project counts come from the maintained aggregates."""
+        from agentflow import storage
+        from agentflow.commands.project import app as project_app
+
+        runner.invoke(app, ["create", "--name", "Org 1", "--slug", "org-1"])
+        runner.invoke(app, ["create", "--name", "Org 2", "--slug", "org-2"])
+        for slug in ("web", "api"):
+            runner.invoke(project_app, ["create", "--org", "org-1", "--name", slug, "--slug", slug])
+
+        with patch.object(
+            storage.StorageBackend, "find_projects_by_organization", side_effect=AssertionError
+        ):
+            result = runner.invoke(app, ["list"])
+
+        assert result.exit_code == 0
+        counts = storage.count_projects([storage.find_organization_by_slug("org-1").id])
+        assert [*counts.values()] == [(2, 0)]
+
     def test_list_when_not_authenticated(self, temp_dirs):
         """Test listing when not authenticated."""
         result = runner.invoke(app, ["list"])
@@ -0,0 +1,161 @@
+"""Tests for output formatting."""
+
+import csv
+import io
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow.cli import app
+from agentflow.utils import output
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield
+    output.set_output_format("table")
+
+
+@pytest.fixture
+def with_projects(temp_dirs):
+    """Register a user with an organization and two projects."""
+    commands = [
+        ["auth", "register", "--email", "test@example.com", "--name", "Test", "--password", "secretpw1"],
+        ["org", "create", "--name", "My Org", "--slug", "my-org"],
+        ["org", "use", "my-org"],
+        ["project", "create", "--name", "Web", "--slug", "web"],
+        ["project", "create", "--name", "API", "--slug", "api", "--github-url", "https://github.com/a/api"],
+    ]
+    for args in commands:
+        assert runner.invoke(app, args).exit_code == 0
+
+
+class TestPrintTable:
+    """Tests for print_table in each output format."""
+
+    def test_json_document(self, capsys):
+        """Test that json wraps the records in a response document."""
+        output.set_output_format("json")
+        try:
+            output.print_table(["NAME"], [["A"]], [{"id": "1", "name": "A"}], name="orgs")
+        finally:
+            output.set_output_format("table")
+
+        assert json.loads(capsys.readouterr().out) == {
+            "success": True,
+            "data": {"orgs": [{"id": "1", "name": "A"}], "total": 1},
+        }
+
+    def test_rows_without_records(self, capsys):
+        """Test that rows are keyed by their column headers by default."""
+        output.set_output_format("jsonl")
+        try:
+            output.print_table(["NAME", "LAST USED"], [["A", "Never"]])
+        finally:
+            output.set_output_format("table")
+
+        assert json.loads(capsys.readouterr().out) == {"name": "A", "last_used": "Never"}
+
+    def test_messages_go_to_stderr(self, capsys):
+        """Test that messages don't mix with machine-readable output."""
+        output.set_output_format("csv")
+        try:
+            output.info("hello")
+        finally:
+            output.set_output_format("table")
+
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert captured.err == "hello\n"
+
+    def test_rejects_unknown_format(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError):
+            output.set_output_format("xml")
+
+
+class TestOutputOption:
+    """Tests for the global --output option."""
+
+    def test_project_list_json(self, with_projects):
+        """Test that project list can be printed as JSON."""
+        result = runner.invoke(app, ["--output", "json", "project", "list"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)["data"]
+        assert data["total"] == 2
+        assert [p["slug"] for p in data["projects"]] == ["web", "api"]
+        assert data["projects"][1]["github_url"] == "https://github.com/a/api"
+
+    def test_org_list_csv(self, with_projects):
+        """Test that org list can be printed as CSV."""
+        result = runner.invoke(app, ["--output", "csv", "org", "list"])
+
+        [row] = list(csv.DictReader(io.StringIO(result.stdout)))
+        assert row["slug"] == "my-org"
+        assert row["projects"] == "2"
+
+    def test_raw_prints_ids(self, with_projects):
+        """Test that raw prints one ID per line."""
+        from agentflow import storage
+
+        result = runner.invoke(app, ["--output", "raw", "org", "list"])
+
+        assert result.stdout.split() == [storage.find_organization_by_slug("my-org").id]
+
+    def test_api_keys_never_listed(self, with_projects):
+        """Test that API key listings leave the secret key out."""
+        result = runner.invoke(app, ["--output", "jsonl", "auth", "api-keys", "list"])
+
+        [key] = [json.loads(line) for line in result.stdout.splitlines()]
+        assert key["name"] == "Default Key"
+        assert "key" not in key
+
+    def test_empty_list(self, with_projects):
+        """Test that empty lists are still valid documents."""
+        runner.invoke(app, ["org", "create", "--name", "Empty", "--slug", "empty"])
+
+        result = runner.invoke(app, ["--output", "json", "project", "list", "--org", "empty"])
+
+        assert json.loads(result.stdout)["data"] == {"projects": [], "total": 0, "next_cursor": None}
+
+    def test_env_var(self, with_projects, monkeypatch):
+        """Test that AGENTFLOW_OUTPUT selects the format."""
+        monkeypatch.setenv("AGENTFLOW_OUTPUT", "raw")
+
+        result = runner.invoke(app, ["project", "list"])
+
+        assert len(result.stdout.split()) == 2
+
+    def test_invalid_format(self, temp_dirs):
+        """Test that an unknown format is a usage error."""
+        result = runner.invoke(app, ["--output", "xml", "version"])
+
+        assert result.exit_code == 2
+
+    def test_skips_rich(self, with_projects):
+        """Test that machine-readable output doesn't import rich."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys\n"
+            "from agentflow.utils import output\n"
+            "output.set_output_format('jsonl')\n"
+            "output.print_table(['NAME'], [['A']])\n"
+            "output.info('done')\n"
+            "assert not any(m.startswith('rich') for m in sys.modules)\n"
+        )
+        src = str(Path(output.__file__).parent.parent.parent)
+        subprocess.run([sys.executable, "-c", code], check=True, env={"PYTHONPATH": src})
@@ -0,0 +1,362 @@
+"""Tests for cursor pagination."""
+
+import json
+import pytest
+from datetime import datetime, timedelta, UTC
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow import storage
+from agentflow.cli import app
+from agentflow.index import Filter
+from agentflow.models import Database, Organization, Project
+from agentflow.pagination import Pager, decode_cursor, encode_cursor
+from agentflow.sqlite_backend import close_connections
+from agentflow.utils import output
+
+runner = CliRunner()
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+# Whole seconds and fractions of them, which JSON dumps in different forms
+INSTANTS = [
+    START,
+    START + timedelta(microseconds=1),
+    START + timedelta(seconds=0.5),
+    START + timedelta(seconds=1),
+    START + timedelta(seconds=1.25),
+    START + timedelta(seconds=2),
+]
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield
+    output.set_output_format("table")
+
+
+@pytest.fixture
+def with_projects(temp_dirs):
+    """Register a user with an organization holding five projects."""
+    runner.invoke(
+        app, ["auth", "register", "--email", "test@example.com", "--name", "Test", "--password", "secretpw1"]
+    )
+    runner.invoke(app, ["org", "create", "--name", "My Org", "--slug", "my-org"])
+    runner.invoke(app, ["org", "use", "my-org"])
+    org = storage.find_organization_by_slug("my-org")
+    with storage.transaction():
+        # Added out of creation order
+        for i in (3, 0, 4, 1, 2):
+            storage.add_project(
+                Project(organization_id=org.id, name=f"P{i}", slug=f"p{i}", created_at=START + timedelta(days=i))
+            )
+    return org
+
+
+@pytest.fixture(params=storage.BACKENDS)
+def each_backend(request, temp_dirs, monkeypatch):
+    """Select each storage backend in turn through the environment."""
+    monkeypatch.setenv(storage.BACKEND_ENV_VAR, request.param)
+    yield request.param
+    close_connections()
+
+
+def add_instant_projects(organization_id: str = "org-1") -> None:
+    """Add a project per instant of INSTANTS, out of creation order."""
+    with storage.transaction():
+        for i in (3, 0, 5, 2, 4, 1):
+            storage.add_project(
+                Project(organization_id=organization_id, name=f"P{i}", slug=f"p{i}", created_at=INSTANTS[i])
+            )
+
+
+def sample_database() -> Database:
+    """Build a database with projects added out of slug order."""
+    projects = [
+        Project(id=f"id-{slug}", organization_id="org-1", name=slug, slug=slug, created_at=START + timedelta(days=i))
+        for i, slug in enumerate(["c", "a", "b"])
+    ]
+    return Database(
+        organizations=[Organization(id="org-1", owner_id="user-1", name="A", slug="a")],
+        projects=projects,
+    )
+
+
+class TestCursor:
+    """Tests for cursor tokens."""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the key it was built from."""
+        token = encode_cursor("slug", ("web", "id-1"))
+
+        assert decode_cursor(token, "slug") == ("web", "id-1")
+
+    def test_rejects_garbage_and_other_orders(self):
+        """Test that malformed cursors and cursors of another order are rejected."""
+        with pytest.raises(ValueError):
+            decode_cursor("not a cursor!", "slug")
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor("slug", ("web", "id-1")), "created_at")
+
+    @pytest.mark.parametrize("key", [(1, 2), ("web",), ("web", "id-1", "extra"), ("web", None)])
+    def test_rejects_malformed_keys(self, key):
+        """Test that keys other than a pair of strings are rejected."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(encode_cursor("slug", key), "slug")
+
+
+class TestOrderedIndex:
+    """Tests for the ordered indexes of DatabaseIndex."""
+
+    def test_pages_in_key_order(self):
+        """Test that pages follow the sort key, whatever the insertion order."""
+        index = sample_database().index
+
+        first, key = index.page("projects", "org-1", "slug", limit=2)
+        rest, end = index.page("projects", "org-1", "slug", after=key, limit=2)
+
+        assert [p.slug for p in first] == ["a", "b"]
+        assert [p.slug for p in rest] == ["c"]
+        assert end is None
+
+    def test_new_records_join_built_indexes(self):
+        """Test that adding a record updates an already built ordered index."""
+        db = sample_database()
+        db.index.page("projects", "org-1", "slug")
+
+        db.add_project(Project(organization_id="org-1", name="aa", slug="aa"))
+
+        projects, _ = db.index.page("projects", "org-1", "slug")
+        assert [p.slug for p in projects] == ["a", "aa", "b", "c"]
+
+    def test_storage_page_functions(self, temp_dirs):
+        """Test the storage functions over the JSON backend."""
+        storage.save_database(sample_database())
+
+        projects, key = storage.page_projects("org-1", "created_at", limit=2)
+        assert [p.slug for p in projects] == ["c", "a"]
+        assert [p.slug for p in storage.page_projects("org-1", "created_at", key)[0]] == ["b"]
+        assert [o.slug for o in storage.page_organizations("user-1")[0]] == ["a"]
+
+
+class TestFilteredPages:
+    """Tests for filtered pages of DatabaseIndex."""
+
+    def test_filters_and_pages(self):
+        """Test that pages only hold matches and continue after the last one."""
+        db = sample_database()
+        db.add_project(Project(organization_id="org-1", name="Web", slug="web", is_active=False))
+        index = db.index
+
+        where = Filter(is_active=True)
+        first, key = index.page("projects", "org-1", "slug", limit=2, where=where)
+        rest, end = index.page("projects", "org-1", "slug", key, 2, where)
+
+        assert [p.slug for p in first] == ["a", "b"]
+        assert [p.slug for p in rest] == ["c"]
+        assert end is None
+
+    def test_name_and_github(self):
+        """Test the name and GitHub URL conditions."""
+        db = sample_database()
+        db.add_project(
+            Project(organization_id="org-1", name="My Web", slug="web", github_url="https://github.com/a/web")
+        )
+
+        def slugs(where):
+            return [p.slug for p in db.index.page("projects", "org-1", "slug", where=where)[0]]
+
+        assert slugs(Filter(name_contains="WEB")) == ["web"]
+        assert slugs(Filter(has_github=False)) == ["a", "b", "c"]
+
+    def test_created_after_starts_past_the_bound(self):
+        """Test that created_after is strict and skips older records."""
+        index = sample_database().index
+
+        projects, _ = index.page("projects", "org-1", "created_at", where=Filter(created_after=START))
+
+        assert [p.slug for p in projects] == ["a", "b"]
+
+
+class TestTimestampOrder:
+    """Tests for creation time order across whole and fractional seconds."""
+
+    def test_pages_in_time_order(self, each_backend):
+        """Test that one-record pages walk the projects in creation order on every backend."""
+        add_instant_projects()
+
+        slugs = []
+        after = None
+        while True:
+            projects, after = storage.page_projects("org-1", "created_at", after, 1)
+            slugs += [p.slug for p in projects]
+            if after is None:
+                break
+
+        assert slugs == ["p0", "p1", "p2", "p3", "p4", "p5"]
+
+    def test_created_after_same_second(self, each_backend):
+        """Test that --created-after keeps the fractions of its second on every backend."""
+        runner.invoke(
+            app, ["auth", "register", "--email", "test@example.com", "--name", "Test", "--password", "secretpw1"]
+        )
+        runner.invoke(app, ["org", "create", "--name", "My Org", "--slug", "my-org"])
+        runner.invoke(app, ["org", "use", "my-org"])
+        add_instant_projects(storage.find_organization_by_slug("my-org").id)
+
+        def slugs(created_after):
+            args = ["--output", "json", "project", "list", "--created-after", created_after]
+            return [p["slug"] for p in json.loads(runner.invoke(app, args).stdout)["data"]["projects"]]
+
+        assert slugs("2025-01-01T00:00:00") == ["p1", "p2", "p3", "p4", "p5"]
+        assert slugs("2025-01-01T00:00:01") == ["p4", "p5"]
+
+
+class TestPager:
+    """Tests for the Pager class."""
+
+    def test_limit_sets_next_cursor(self):
+        """Test that stopping at the limit leaves a cursor to continue from."""
+        index = sample_database().index
+
+        def fetch(after, size):
+            return index.page("projects", "org-1", "slug", after, size)
+
+        pager = Pager(fetch, "slug", limit=2, page_size=1)
+        pages = [[p.slug for p in page] for page in pager.pages()]
+        assert pages == [["a"], ["b"]]
+
+        rest = Pager(fetch, "slug", cursor=pager.next_cursor)
+        assert [[p.slug for p in page] for page in rest.pages()] == [["c"]]
+        assert rest.next_cursor is None
+
+
+class TestListPagination:
+    """Tests for --limit, --cursor and --page-size on list commands."""
+
+    def test_projects_listed_by_creation_time(self, with_projects):
+        """Test that projects are listed oldest first."""
+        result = runner.invoke(app, ["--output", "raw", "project", "list"])
+
+        ids = result.stdout.split()
+        slugs = [storage.load_database().index.projects_by_id[i].slug for i in ids]
+        assert slugs == ["p0", "p1", "p2", "p3", "p4"]
+
+    def test_limit_and_cursor(self, with_projects):
+        """Test walking the projects two at a time with the emitted cursor."""
+        seen = []
+        cursor = None
+        for _ in range(3):
+            args = ["--output", "json", "project", "list", "--limit", "2"]
+            result = runner.invoke(app, args + (["--cursor", cursor] if cursor else []))
+            data = json.loads(result.stdout)["data"]
+            seen += [p["slug"] for p in data["projects"]]
+            cursor = data["next_cursor"]
+
+        assert seen == ["p0", "p1", "p2", "p3", "p4"]
+        assert cursor is None
+
+    def test_table_shows_next_command(self, with_projects):
+        """Test that the table output tells how to get the next page."""
+        result = runner.invoke(app, ["project", "list", "--limit", "3", "--page-size", "2"])
+
+        assert result.exit_code == 0
+        assert "p2" in result.stdout and "p3" not in result.stdout
+        assert "--cursor" in result.stdout
+
+    def test_pages_share_one_table(self, with_projects):
+        """Test that small pages are rendered as one table with one header."""
+        result = runner.invoke(app, ["project", "list", "--page-size", "2"])
+
+        assert result.exit_code == 0
+        assert result.stdout.count("NAME") == 1
+        assert all(f"p{i}" in result.stdout for i in range(5))
+
+    def test_line_formats_print_cursor_to_stderr(self, with_projects):
+        """Test that jsonl output keeps the cursor out of the records."""
+        result = runner.invoke(app, ["--output", "jsonl", "project", "list", "--limit", "1"])
+
+        assert len(result.stdout.splitlines()) == 1
+        assert "next_cursor: " in result.stderr
+
+    def test_org_list_limit(self, with_projects):
+        """Test that org list pages too."""
+        runner.invoke(app, ["org", "create", "--name", "Other", "--slug", "other"])
+
+        result = runner.invoke(app, ["--output", "json", "org", "list", "--limit", "1"])
+
+        data = json.loads(result.stdout)["data"]
+        assert [o["slug"] for o in data["organizations"]] == ["my-org"]
+        assert data["organizations"][0]["projects"] == 5
+        assert data["next_cursor"]
+
+    def test_invalid_cursor(self, with_projects):
+        """Test that an invalid cursor is an error."""
+        result = runner.invoke(app, ["project", "list", "--cursor", "nope"])
+
+        assert result.exit_code == 1
+        assert "Invalid cursor" in result.stdout
+
+    def test_forged_cursor(self, with_projects):
+        """Test that a well-encoded cursor with a malformed key is an error."""
+        result = runner.invoke(app, ["project", "list", "--cursor", encode_cursor("created_at", (1, 2))])
+
+        assert result.exit_code == 1
+        assert "Invalid cursor" in result.stdout
+
+
+class TestListFilters:
+    """Tests for the filter and sort options of list commands."""
+
+    def test_sort_by_slug(self, with_projects):
+        """Test that --sort changes the order."""
+        runner.invoke(app, ["project", "create", "--name", "A", "--slug", "a"])
+
+        result = runner.invoke(app, ["--output", "json", "project", "list", "--sort", "slug"])
+
+        slugs = [p["slug"] for p in json.loads(result.stdout)["data"]["projects"]]
+        assert slugs == ["a", "p0", "p1", "p2", "p3", "p4"]
+
+    def test_filters_with_cursor(self, with_projects):
+        """Test that filters combine with --limit and the cursor."""
+        runner.invoke(app, ["project", "create", "--name", "Hub", "--slug", "hub", "-g", "https://github.com/a/hub"])
+        args = ["--output", "json", "project", "list", "--created-after", "2025-01-02", "--limit", "2"]
+
+        data = json.loads(runner.invoke(app, args).stdout)["data"]
+        rest = json.loads(runner.invoke(app, args + ["--cursor", data["next_cursor"]]).stdout)["data"]
+
+        assert [p["slug"] for p in data["projects"] + rest["projects"]] == ["p2", "p3", "p4", "hub"]
+        result = runner.invoke(app, ["--output", "raw", "project", "list", "--has-github"])
+        assert result.stdout.split() == [storage.find_project_by_slug(with_projects.id, "hub").id]
+
+    def test_no_match(self, with_projects):
+        """Test the message when nothing matches."""
+        result = runner.invoke(app, ["project", "list", "--inactive"])
+
+        assert result.exit_code == 0
+        assert "No matching projects in my-org" in result.stdout
+
+    def test_unknown_sort(self, with_projects):
+        """Test that an unknown sort order is an error."""
+        result = runner.invoke(app, ["project", "list", "--sort", "size"])
+
+        assert result.exit_code == 1
+        assert "Unknown sort order 'size'" in result.stdout
+
+    def test_org_list_filters(self, with_projects):
+        """Test the filter and sort options of org list."""
+        runner.invoke(app, ["org", "create", "--name", "Acme", "--slug", "acme"])
+
+        result = runner.invoke(app, ["--output", "json", "org", "list", "--sort", "name"])
+        assert [o["slug"] for o in json.loads(result.stdout)["data"]["organizations"]] == ["acme", "my-org"]
+
+        result = runner.invoke(app, ["--output", "json", "org", "list", "--name-contains", "org"])
+        assert [o["slug"] for o in json.loads(result.stdout)["data"]["organizations"]] == ["my-org"]
@@ -0,0 +1,126 @@
+"""Tests for the prompt command."""
+
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+import agentflow
+from agentflow.cli import app
+from agentflow.utils.config import get_context_file, set_current_organization, set_current_project
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def temp_config_dir(tmp_path: Path):
+    """Create temporary config directory for testing."""
+    config_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.utils.config.CONFIG_DIR", config_dir):
+        with patch("agentflow.utils.config.CONFIG_FILE", config_dir / "config.yaml"):
+            yield config_dir
+
+
+class TestPromptCommand:
+    """Tests for the prompt command."""
+
+    def test_prints_context(self, temp_config_dir):
+        """Test that the current organization and project are printed."""
+        set_current_organization("my-org")
+        set_current_project("my-project")
+
+        result = runner.invoke(app, ["prompt"])
+
+        assert result.exit_code == 0
+        assert result.stdout == "[my-org / my-project]\n"
+
+    def test_no_context(self, temp_config_dir):
+        """Test that nothing is printed without a current organization."""
+        result = runner.invoke(app, ["prompt"])
+
+        assert result.exit_code == 0
+        assert result.stdout == ""
+        assert not get_context_file().exists()
+
+    def test_recreates_missing_file(self, temp_config_dir):
+        """Test that a missing context file is recreated from the config."""
+        set_current_organization("my-org")
+        get_context_file().unlink()
+
+        result = runner.invoke(app, ["prompt"])
+
+        assert result.stdout == "[my-org]\n"
+        assert get_context_file().read_text() == "[my-org]"
+
+    @pytest.mark.parametrize("shell", ["bash", "zsh", "fish"])
+    def test_hooks(self, temp_config_dir, shell):
+        """Test that the hooks read the context file of this config."""
+        result = runner.invoke(app, ["prompt", "--shell", shell])
+
+        assert result.exit_code == 0
+        assert str(get_context_file()) in result.stdout
+
+    def test_unknown_shell(self, temp_config_dir):
+        """Test that an unsupported shell is rejected."""
+        result = runner.invoke(app, ["prompt", "--shell", "tcsh"])
+
+        assert result.exit_code == 1
+        assert "Unknown shell 'tcsh'" in result.stdout
+
+    @pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not installed")
+    def test_bash_hook(self, temp_config_dir):
+        """Test the bash hook in bash, reading the file without running agentflow."""
+        set_current_organization("my-org")
+        hook = runner.invoke(app, ["prompt", "--shell", "bash"]).stdout
+
+        result = subprocess.run(
+            [shutil.which("bash"), "-c", f'PS1="$ "\n{hook}\n_agentflow_prompt'],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PATH": "/nonexistent"},
+        )
+
+        assert result.stdout == "[my-org] "
+
+
+class TestFastPath:
+    """Tests for `agentflow prompt` without loading the CLI."""
+
+    def run(self, home: Path) -> subprocess.CompletedProcess:
+        """Run `python -m agentflow prompt` with another home directory."""
+        src = str(Path(agentflow.__file__).parent.parent)
+        return subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "agentflow", "prompt"],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "HOME": str(home), "PYTHONPATH": src},
+        )
+
+    def test_reads_context_file(self, tmp_path: Path):
+        """Test that the context file is printed without importing the CLI."""
+        config_dir = tmp_path / ".agentflow"
+        config_dir.mkdir()
+        (config_dir / "config.yaml").write_text("current_organization: my-org\n")
+        (config_dir / "context").write_text("[my-org]")
+
+        result = self.run(tmp_path)
+
+        assert result.stdout == "[my-org]\n"
+        assert "typer" not in result.stderr
+        assert "pathlib" not in result.stderr.replace("agentflow", "")
+
+    def test_falls_back_to_command(self, tmp_path: Path):
+        """Test that a missing context file is left to the prompt command."""
+        config_dir = tmp_path / ".agentflow"
+        config_dir.mkdir()
+        (config_dir / "config.yaml").write_text("current_organization: my-org\n")
+
+        result = self.run(tmp_path)
+
+        assert result.stdout == "[my-org]\n"
+        assert (config_dir / "context").read_text() == "[my-org]"
@@ -0,0 +1,300 @@
+"""Tests for full-text search."""
+
+import json
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow import search, storage
+from agentflow.cli import app
+from agentflow.models import Database, Organization, Project, User
+from agentflow.search import SearchIndex, tokenize
+from agentflow.sqlite_backend import close_connections
+from agentflow.utils import output
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield data_dir
+    search.close_connections()
+    close_connections()
+    output.set_output_format("table")
+
+
+@pytest.fixture
+def with_org(temp_dirs):
+    """Register a user and create and select an organization."""
+    runner.invoke(
+        app, ["auth", "register", "--email", "test@example.com", "--name", "Test", "--password", "secretpw1"]
+    )
+    runner.invoke(app, ["org", "create", "--name", "Acme Rockets", "--slug", "acme", "-d", "Launch services"])
+    runner.invoke(app, ["org", "use", "acme"])
+    return storage.find_organization_by_slug("acme")
+
+
+def sample_records() -> tuple[list[User], list[Organization], list[Project]]:
+    """Build two users with one organization and a few projects each."""
+    users = [
+        User(id="user-1", email="a@example.com", name="A", password_hash="x"),
+        User(id="user-2", email="b@example.com", name="B", password_hash="x"),
+    ]
+    organizations = [
+        Organization(id="org-1", owner_id="user-1", name="Acme", slug="acme"),
+        Organization(id="org-2", owner_id="user-2", name="Globex", slug="globex"),
+    ]
+    projects = [
+        Project(id="p-web", organization_id="org-1", name="Web", slug="web", description="Rocket storefront"),
+        Project(
+            id="p-api",
+            organization_id="org-1",
+            name="Rocket API",
+            slug="rocket-api",
+            github_url="https://github.com/acme/api",
+        ),
+        Project(id="p-other", organization_id="org-2", name="Rocket", slug="rocket"),
+    ]
+    return users, organizations, projects
+
+
+class TestSearchIndex:
+    """Tests for the SearchIndex class."""
+
+    def test_tokenize(self):
+        """Test that text is split into lowercase alphanumeric tokens."""
+        assert tokenize("My-Org: https://github.com/Acme/web_2") == [
+            "my",
+            "org",
+            "https",
+            "github",
+            "com",
+            "acme",
+            "web",
+            "2",
+        ]
+        assert tokenize(None) == []
+
+    def test_ranks_by_field(self, tmp_path: Path):
+        """Test that name matches outrank description matches."""
+        index = SearchIndex(tmp_path / "search.db")
+        index.sync(*sample_records())
+
+        results = index.search("rocket", "a@example.com")
+
+        assert [r.id for r in results] == ["p-api", "p-web"]
+        assert results[0].org == "acme"
+
+    def test_every_word_must_match_and_last_is_a_prefix(self, tmp_path: Path):
+        """Test AND semantics and prefix matching of the last word."""
+        index = SearchIndex(tmp_path / "search.db")
+        index.sync(*sample_records())
+
+        assert [r.id for r in index.search("rocket ap")] == ["p-api"]
+        assert [r.id for r in index.search("ap rocket")] == []
+        assert [r.id for r in index.search("github acme")] == ["p-api"]
+        assert index.search("") == []
+
+    def test_scoped_to_owner(self, tmp_path: Path):
+        """Test that a user only finds their organizations and projects."""
+        index = SearchIndex(tmp_path / "search.db")
+        index.sync(*sample_records())
+
+        assert [r.id for r in index.search("rocket", "b@example.com")] == ["p-other"]
+        assert [r.id for r in index.search("globex", "a@example.com")] == []
+
+    def test_sync_only_rewrites_changes(self, tmp_path: Path):
+        """Test that sync re-indexes changed records and drops removed ones."""
+        index = SearchIndex(tmp_path / "search.db")
+        users, organizations, projects = sample_records()
+        assert index.sync(users, organizations, projects) == 5
+
+        projects[0].name = "Shop"
+        assert index.sync(users, organizations, projects[:2]) == 2
+
+        assert [r.id for r in index.search("shop")] == ["p-web"]
+        assert [r.id for r in index.search("rocket")] == ["p-api", "p-web"]
+
+
+class TestSearchUpdates:
+    """Tests for keeping the index up to date through storage writes."""
+
+    def test_built_on_first_search(self, temp_dirs):
+        """Test that the index is built from the stored data when missing."""
+        users, organizations, projects = sample_records()
+        storage.save_database(Database(users=users, organizations=organizations, projects=projects))
+        assert not storage.get_search_file().exists()
+
+        assert [r.id for r in storage.search("web")] == ["p-web"]
+        assert storage.get_search_file().exists()
+
+    def test_writes_update_existing_index(self, temp_dirs):
+        """Test that adds and saves are indexed once the index exists."""
+        users, organizations, projects = sample_records()
+        storage.save_database(Database(users=users, organizations=organizations, projects=projects))
+        storage.search("web")
+
+        storage.add_project(Project(id="p-new", organization_id="org-1", name="Launchpad", slug="pad"))
+        assert [r.id for r in storage.search("launch")] == ["p-new"]
+
+        db = storage.load_database()
+        db.projects = [p for p in db.projects if p.id != "p-web"]
+        storage.save_database(db)
+        assert storage.search("web") == []
+
+    def test_rolled_back_changes_are_not_indexed(self, temp_dirs):
+        """Test that only committed records reach the index."""
+        storage.search("anything")
+
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                storage.add_organization(Organization(owner_id="user-1", name="Ghost", slug="ghost"))
+                raise RuntimeError()
+
+        assert storage.search("ghost") == []
+
+    def test_sqlite_backend(self, temp_dirs, monkeypatch):
+        """Test that writes to the SQLite backend are indexed too."""
+        monkeypatch.setenv(storage.BACKEND_ENV_VAR, "sqlite")
+        storage.search("anything")
+
+        with storage.transaction():
+            storage.add_organization(Organization(id="org-1", owner_id="user-1", name="Initech", slug="initech"))
+
+        assert [r.id for r in storage.search("initech")] == ["org-1"]
+
+
+class TestSearchCommand:
+    """Tests for the search command."""
+
+    def test_finds_projects(self, with_org):
+        """Test searching projects created through the CLI."""
+        runner.invoke(app, ["project", "create", "--name", "Rocket API", "--slug", "rocket-api"])
+        runner.invoke(app, ["project", "create", "--name", "Web", "--slug", "web"])
+
+        result = runner.invoke(app, ["--output", "json", "search", "rocket"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.stdout)["data"]
+        # "Rocket" matches the project's name as a whole word, "Rockets" only as a prefix
+        assert [(r["type"], r["slug"]) for r in data["results"]] == [
+            ("project", "rocket-api"),
+            ("organization", "acme"),
+        ]
+
+    def test_no_results(self, with_org):
+        """Test the message when nothing matches."""
+        result = runner.invoke(app, ["search", "nothing"])
+
+        assert result.exit_code == 0
+        assert "No results for 'nothing'" in result.stdout
+
+    def test_reindex(self, with_org):
+        """Test that --reindex rebuilds the index."""
+        runner.invoke(app, ["search", "acme"])
+        storage.get_search_file().unlink()
+        search.close_connections()
+
+        result = runner.invoke(app, ["search", "--reindex"])
+
+        assert result.exit_code == 0
+        assert "Search index updated" in result.stdout
+        assert [r.slug for r in storage.search("launch")] == ["acme"]
+
+    def test_requires_authentication(self, temp_dirs):
+        """Test that searching needs a logged in user."""
+        result = runner.invoke(app, ["search", "acme"])
+
+        assert result.exit_code == 1
+        assert "Not authenticated" in result.stdout
+
+
+class TestSlugSuggestions:
+    """Tests for trigram slug suggestions and completion."""
+
+    def test_similar_slugs(self, tmp_path: Path):
+        """Test that mistyped slugs get the closest slugs of the same scope."""
+        index = SearchIndex(tmp_path / "search.db")
+        index.sync(*sample_records())
+
+        assert index.similar_slugs("project", "rocket-ap", org_slug="acme") == ["rocket-api"]
+        assert index.similar_slugs("project", "rockett", org_slug="globex") == ["rocket"]
+        assert index.similar_slugs("organization", "acmee", owner_email="a@example.com") == ["acme"]
+        assert index.similar_slugs("organization", "acmee", owner_email="b@example.com") == []
+        assert index.similar_slugs("project", "zzz", org_slug="acme") == []
+
+    def test_transposed_short_slug(self, tmp_path: Path):
+        """Test that swapped letters in a short slug still get a suggestion."""
+        index = SearchIndex(tmp_path / "search.db")
+        index.sync(*sample_records())
+
+        assert index.similar_slugs("project", "wbe", org_slug="acme") == ["web"]
+        assert index.similar_slugs("project", "wbe", org_slug="globex") == []
+        assert index.similar_slugs("project", "rokcet-api", org_slug="acme") == ["rocket-api"]
+
+    def test_complete_slugs(self, tmp_path: Path):
+        """Test prefix completion, falling back to similar slugs."""
+        index = SearchIndex(tmp_path / "search.db")
+        index.sync(*sample_records())
+
+        assert index.complete_slugs("project", "", org_slug="acme") == ["rocket-api", "web"]
+        assert index.complete_slugs("project", "ro", org_slug="acme") == ["rocket-api"]
+        assert index.complete_slugs("project", "webb", org_slug="acme") == ["web"]
+
+    def test_backfills_trigrams(self, tmp_path: Path):
+        """Test that an index written before trigrams existed gets them."""
+        path = tmp_path / "search.db"
+        SearchIndex(path).sync(*sample_records())
+        with search.connect(path) as conn:
+            conn.execute("DROP TABLE trigrams")
+        search.close_connections()
+
+        assert SearchIndex(path).similar_slugs("project", "webb", org_slug="acme") == ["web"]
+
+
+class TestDidYouMean:
+    """Tests for suggestions on "not found" errors."""
+
+    def test_org_use(self, with_org):
+        """Test that org use suggests the closest organization."""
+        result = runner.invoke(app, ["org", "use", "acmee"])
+
+        assert result.exit_code == 1
+        assert "Organization 'acmee' not found" in result.stdout
+        assert "Did you mean: acme?" in result.stdout
+
+    def test_project_view(self, with_org):
+        """Test that project view suggests projects of the organization."""
+        runner.invoke(app, ["project", "create", "--name", "Rocket API", "--slug", "rocket-api"])
+
+        result = runner.invoke(app, ["project", "view", "rocket-apu"])
+
+        assert result.exit_code == 1
+        assert "Did you mean: rocket-api?" in result.stdout
+
+    def test_no_suggestion(self, with_org):
+        """Test that nothing is suggested when no slug is close."""
+        result = runner.invoke(app, ["project", "use", "zzz"])
+
+        assert result.exit_code == 1
+        assert "Did you mean" not in result.stdout
+
+    def test_completion(self, with_org):
+        """Test the completion callbacks of slug arguments."""
+        from agentflow.completion import complete_org_slug, complete_project_slug
+
+        runner.invoke(app, ["project", "create", "--name", "Web", "--slug", "web"])
+        ctx = SimpleNamespace(params={})
+
+        assert complete_org_slug("ac") == ["acme"]
+        assert complete_project_slug(ctx, "w") == ["web"]
+        assert complete_project_slug(SimpleNamespace(params={"org": "nope"}), "w") == []
@@ -0,0 +1,52 @@
+"""Tests for on-disk serializers."""
+
+import pytest
+
+from agentflow.models import Database, Organization
+from agentflow.serializers import FORMATS, detect_format, dumps, loads
+
+DOCUMENT = {
+    "users": [
+        {
+            "id": "user-1",
+            "email": "test@example.com",
+            "api_keys": [{"id": "key-1", "last_used_at": None, "is_active": True}],
+        },
+        {"id": "user-2", "email": "été@example.com", "api_keys": []},
+    ],
+    "organizations": [],
+    "projects": [
+        {"id": "p1", "slug": "web", "is_active": False, "extra": {"a": 1}},
+        {"id": "p2", "slug": "nul\0byte"},
+    ],
+    "version": 3,
+}
+
+
+class TestRoundTrip:
+    """Tests for dumps/loads round trips."""
+
+    @pytest.mark.parametrize("fmt", FORMATS)
+    def test_round_trip(self, fmt):
+        """Test that every format restores the document exactly."""
+        assert loads(dumps(DOCUMENT, fmt)) == DOCUMENT
+
+    @pytest.mark.parametrize("fmt", FORMATS)
+    def test_detects_format(self, fmt):
+        """Test that the format is detected from the content."""
+        assert detect_format(dumps(DOCUMENT, fmt)) == fmt
+
+    def test_rejects_unknown_format(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError):
+            dumps(DOCUMENT, "xml")
+        with pytest.raises(ValueError):
+            dumps(DOCUMENT, "binary")
+
+    @pytest.mark.parametrize("fmt", FORMATS)
+    def test_models_match_dicts(self, fmt):
+        """Test that a Pydantic model is written like its JSON-mode dump."""
+        db = Database(organizations=[Organization(owner_id="user-1", name="Acme", slug="acme")])
+
+        assert loads(dumps(db, fmt)) == loads(dumps(db.model_dump(mode="json"), fmt))
+        assert detect_format(dumps(db, fmt)) == fmt
@@ -0,0 +1,205 @@
+"""Tests for the sharded storage backend."""
+
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow import storage
+from agentflow.commands.storage import app as storage_app
+from agentflow.models import User, APIKey, Organization, Project, Database
+from agentflow.sharded_backend import ShardedBackend, shard_path
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def sharded(tmp_path: Path, monkeypatch):
+    """Select the sharded backend over temporary data and config directories."""
+    data_dir = tmp_path / ".agentflow"
+    monkeypatch.setenv(storage.BACKEND_ENV_VAR, "sharded")
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    storage.clear_cache()
+                    yield
+    storage.clear_cache()
+
+
+def sample_database() -> Database:
+    """Build a database with two organizations and their projects."""
+    user = User(id="user-1", email="test@example.com", password_hash="hash", name="Test")
+    return Database(
+        users=[user],
+        organizations=[
+            Organization(id="org-1", owner_id="user-1", name="A", slug="a"),
+            Organization(id="org-2", owner_id="user-1", name="B", slug="b"),
+        ],
+        projects=[
+            Project(id="p1", organization_id="org-1", name="Web", slug="web"),
+            Project(id="p2", organization_id="org-2", name="Web", slug="web"),
+            Project(id="p3", organization_id="org-1", name="API", slug="api"),
+        ],
+    )
+
+
+class TestShardLayout:
+    """Tests for the shard files."""
+
+    def test_save_writes_one_file_per_shard(self, sharded):
+        """Test that projects are split by organization."""
+        storage.save_database(sample_database())
+
+        assert shard_path("users").exists()
+        assert shard_path("organizations").exists()
+        assert shard_path(("projects", "org-1")).exists()
+        assert shard_path(("projects", "org-2")).exists()
+        assert not storage.DATA_FILE.exists()
+
+    def test_save_and_load_round_trip(self, sharded):
+        """Test that loading reassembles every shard."""
+        storage.save_database(sample_database())
+        storage.clear_cache()
+
+        db = storage.load_database()
+
+        assert [u.id for u in db.users] == ["user-1"]
+        assert [o.id for o in db.organizations] == ["org-1", "org-2"]
+        assert [p.id for p in db.projects] == ["p1", "p3", "p2"]
+
+    def test_save_removes_stale_project_shards(self, sharded):
+        """Test that organizations without projects lose their shard file."""
+        storage.save_database(sample_database())
+        db = storage.load_database()
+        db.projects = [p for p in db.projects if p.organization_id == "org-1"]
+
+        storage.save_database(db)
+
+        assert not shard_path(("projects", "org-2")).exists()
+        assert storage.find_projects_by_organization("org-2") == []
+
+
+class TestShardedLookups:
+    """Tests for lookups only reading the shards they need."""
+
+    def test_project_lookup_reads_one_shard(self, sharded):
+        """Test that a project lookup doesn't parse other shards."""
+        storage.save_database(sample_database())
+        storage.clear_cache()
+
+        assert storage.find_project_by_slug("org-2", "web").id == "p2"
+        assert storage.slug_exists_in_projects("org-2", "api") is False
+
+        assert set(storage._cache) == {shard_path(("projects", "org-2"))}
+
+    def test_user_and_organization_lookups(self, sharded):
+        """Test user and organization lookups."""
+        storage.save_database(sample_database())
+
+        assert storage.find_user_by_email("test@example.com").id == "user-1"
+        assert storage.find_organization_by_slug("b").id == "org-2"
+        assert [o.id for o in storage.find_organizations_by_owner("user-1")] == ["org-1", "org-2"]
+        assert [p.id for p in storage.find_projects_by_organization("org-1")] == ["p1", "p3"]
+
+    def test_iter_projects_leaves_cache_alone(self, sharded):
+        """Test that iterating over every project doesn't cache its shards."""
+        storage.save_database(sample_database())
+        storage.clear_cache()
+
+        assert [p.id for p in storage.iter_projects()] == ["p1", "p3", "p2"]
+        assert [p.id for p in storage.iter_projects("org-2")] == ["p2"]
+
+        assert set(storage._cache) == {shard_path("organizations"), shard_path(("projects", "org-2"))}
+
+    def test_project_counts_skip_project_shards(self, sharded):
+        """Test that counting reads project_counts.json, not the project shards."""
+        storage.save_database(sample_database())
+        storage.clear_cache()
+
+        assert storage.count_projects(["org-1", "org-2"]) == {"org-1": (2, 0), "org-2": (1, 0)}
+        assert storage._cache == {}
+
+    def test_project_counts_follow_transactions(self, sharded):
+        """Test that committed and pending projects are counted."""
+        storage.save_database(sample_database())
+
+        with storage.transaction():
+            storage.add_project(Project(organization_id="org-2", name="Old", slug="old", is_active=False))
+            assert storage.count_projects(["org-2"]) == {"org-2": (1, 1)}
+
+        storage.clear_cache()
+        assert storage.count_projects(["org-1", "org-2"]) == {"org-1": (2, 0), "org-2": (1, 1)}
+
+
+class TestShardedWrites:
+    """Tests for writes only rewriting the shards they touch."""
+
+    def test_add_project_rewrites_only_its_shard(self, sharded):
+        """Test that adding a project leaves the other shards untouched."""
+        storage.save_database(sample_database())
+        untouched = [shard_path(k) for k in ("users", "organizations", ("projects", "org-2"))]
+        before = [path.stat().st_mtime_ns for path in untouched]
+
+        storage.add_project(Project(id="p4", organization_id="org-1", name="Docs", slug="docs"))
+
+        assert [path.stat().st_mtime_ns for path in untouched] == before
+        assert storage.find_project_by_slug("org-1", "docs").id == "p4"
+
+    def test_add_api_key(self, sharded):
+        """Test that API keys are stored in the users shard."""
+        storage.save_database(sample_database())
+
+        storage.add_api_key("user-1", APIKey(key="afk_1", name="Default Key"))
+        storage.clear_cache()
+
+        assert [k.key for k in storage.find_user_by_email("test@example.com").api_keys] == ["afk_1"]
+
+    def test_transaction_commit(self, sharded):
+        """Test that a transaction's writes are visible inside and after it."""
+        with storage.transaction():
+            storage.add_organization(Organization(id="org-1", owner_id="u", name="A", slug="a"))
+            storage.add_project(Project(organization_id="org-1", name="Web", slug="web"))
+            assert storage.slug_exists_in_projects("org-1", "web") is True
+            assert not shard_path(("projects", "org-1")).exists()
+
+        storage.clear_cache()
+        assert storage.slug_exists_in_organizations("a") is True
+        assert storage.slug_exists_in_projects("org-1", "web") is True
+
+    def test_transaction_rollback(self, sharded):
+        """Test that a failing transaction writes nothing and leaves no cached changes."""
+        storage.save_database(sample_database())
+
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                storage.add_project(Project(organization_id="org-1", name="Docs", slug="docs"))
+                raise RuntimeError("boom")
+
+        assert storage.slug_exists_in_projects("org-1", "docs") is False
+
+
+class TestShardedMigrate:
+    """Tests for migrating to the sharded backend."""
+
+    def test_migrates_json_to_sharded(self, sharded, monkeypatch):
+        """Test that migrate --from json copies data.json into shards."""
+        from agentflow.utils.config import get_storage_backend
+
+        storage.get_backend("json").save(sample_database())
+
+        result = runner.invoke(storage_app, ["migrate", "--from", "json", "--to", "sharded"])
+
+        assert result.exit_code == 0
+        assert "Migrated data from json to sharded" in result.stdout
+        assert get_storage_backend() == "sharded"
+        assert isinstance(storage.get_backend(), ShardedBackend)
+        assert storage.find_project_by_slug("org-2", "web").id == "p2"
+
+    def test_rejects_same_source_and_target(self, sharded):
+        """Test that migrating a backend onto itself is rejected."""
+        result = runner.invoke(storage_app, ["migrate", "--to", "sharded"])
+
+        assert result.exit_code == 1
+        assert "already stored in sharded" in result.stdout
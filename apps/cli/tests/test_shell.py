@@ -0,0 +1,89 @@
+"""Tests for the interactive shell."""
+
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow.cli import app
+from agentflow.commands.shell import get_prompt, parse_line
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield
+
+
+class TestParseLine:
+    """Tests for parse_line function."""
+
+    def test_splits_like_a_shell(self):
+        """Test that quoting works as in a shell."""
+        assert parse_line('org create --name "My Org"') == ["org", "create", "--name", "My Org"]
+
+    def test_drops_program_name_and_comments(self):
+        """Test that a pasted 'agentflow' prefix and comments are ignored."""
+        assert parse_line("agentflow org list  # all orgs") == ["org", "list"]
+
+    def test_rejects_unbalanced_quotes(self):
+        """Test that unparsable lines return None."""
+        assert parse_line('org create --name "My Org') is None
+
+
+class TestShell:
+    """Tests for shell command."""
+
+    def test_prompt_shows_context(self, temp_dirs):
+        """Test that the prompt includes the current org and project."""
+        from agentflow.utils.config import set_current_organization, set_current_project
+
+        assert get_prompt() == "agentflow> "
+
+        set_current_organization("my-org")
+        set_current_project("web")
+
+        assert get_prompt() == "agentflow [my-org / web]> "
+
+    def test_runs_commands_in_one_process(self, temp_dirs):
+        """Test that several commands run and see each other's changes."""
+        script = "\n".join(
+            [
+                "auth register --email test@example.com --name Test --password secretpw1",
+                "org create --name 'My Org' --slug my-org",
+                "org use my-org",
+                "org list",
+                "exit",
+            ]
+        )
+
+        result = runner.invoke(app, ["shell"], input=script + "\n")
+
+        assert result.exit_code == 0
+        assert "User registered successfully" in result.stdout
+        assert "Now using organization: my-org" in result.stdout
+        assert "agentflow [my-org]> " in result.stdout
+        assert "My Org" in result.stdout
+
+    def test_errors_do_not_exit(self, temp_dirs):
+        """Test that failing commands leave the shell running."""
+        result = runner.invoke(app, ["shell"], input="nope\nversion\n")
+
+        assert result.exit_code == 0
+        assert "No such command" in result.output
+        assert "AgentFlow CLI v0.0.1" in result.stdout
+
+    def test_rejects_nested_shell(self, temp_dirs):
+        """Test that the shell can't be started from itself."""
+        result = runner.invoke(app, ["shell"], input="shell\n")
+
+        assert result.exit_code == 0
+        assert "Already in the shell" in result.stdout
@@ -0,0 +1,107 @@
+"""Tests for the validated snapshot cache."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+from agentflow import snapshot_cache, storage
+from agentflow.models import User, APIKey, Organization, Project, Database
+
+
+def sample_database() -> Database:
+    """Build a database with one record of each kind."""
+    user = User(id="user-1", email="test@example.com", password_hash="hash", name="Test")
+    user.api_keys.append(APIKey(key="afk_1", name="Default Key"))
+    return Database(
+        users=[user],
+        organizations=[Organization(id="org-1", owner_id="user-1", name="Org", slug="org")],
+        projects=[Project(id="p1", organization_id="org-1", name="Web", slug="web")],
+    )
+
+
+def write_data_file(path: Path, db: Database) -> bytes:
+    """Write a database to a data file and return its content."""
+    raw = storage.serialize_database(db, "json")
+    path.write_bytes(raw)
+    return raw
+
+
+class TestSnapshotCache:
+    """Tests for storing and fetching validated snapshots."""
+
+    def test_load_validates_then_caches(self, tmp_path: Path):
+        """Test that the first load validates and writes the cache file."""
+        path = tmp_path / "data.json"
+        raw = write_data_file(path, sample_database())
+
+        db = snapshot_cache.load(path, raw)
+
+        assert db.users[0].email == "test@example.com"
+        assert snapshot_cache.get_cache_file(path).exists()
+
+    def test_cached_load_skips_validation(self, tmp_path: Path):
+        """Test that loading the same content doesn't validate again."""
+        path = tmp_path / "data.json"
+        original = sample_database()
+        raw = write_data_file(path, original)
+        snapshot_cache.load(path, raw)
+
+        with patch("agentflow.snapshot_cache.Database.__init__") as validate:
+            db = snapshot_cache.load(path, raw)
+
+        validate.assert_not_called()
+        assert db.model_dump() == original.model_dump()
+        assert db.users[0].api_keys[0].key == "afk_1"
+        assert db.index.project_by_slug("org-1", "web").id == "p1"
+
+    def test_changed_content_is_validated(self, tmp_path: Path):
+        """Test that a data file changed outside the CLI misses the cache."""
+        path = tmp_path / "data.json"
+        snapshot_cache.load(path, write_data_file(path, sample_database()))
+        edited = sample_database()
+        edited.organizations[0].name = "Edited"
+        raw = write_data_file(path, edited)
+
+        assert snapshot_cache.fetch(path, raw) is None
+        assert snapshot_cache.load(path, raw).organizations[0].name == "Edited"
+        assert snapshot_cache.fetch(path, raw).organizations[0].name == "Edited"
+
+    def test_corrupt_cache_is_ignored(self, tmp_path: Path):
+        """Test that an unreadable cache file falls back to validation."""
+        path = tmp_path / "data.json"
+        raw = write_data_file(path, sample_database())
+        snapshot_cache.get_cache_file(path).write_bytes(b"not a pickle")
+
+        assert snapshot_cache.fetch(path, raw) is None
+        assert snapshot_cache.load(path, raw).projects[0].slug == "web"
+
+    def test_rebuilt_records_are_mutable(self, tmp_path: Path):
+        """Test that records rebuilt from the cache behave like validated ones."""
+        path = tmp_path / "data.json"
+        raw = write_data_file(path, sample_database())
+        snapshot_cache.store(path, raw, sample_database())
+
+        project = snapshot_cache.fetch(path, raw).projects[0]
+        project.name = "Renamed"
+
+        assert project.model_dump()["name"] == "Renamed"
+        assert project.created_at.utcoffset().total_seconds() == 0
+
+
+class TestStorageIntegration:
+    """Tests for the JSON backend using the snapshot cache."""
+
+    def test_save_primes_cache(self, tmp_path: Path):
+        """Test that a save lets another process load without validation."""
+        data_dir = tmp_path / ".agentflow"
+        data_file = data_dir / "data.json"
+
+        with patch("agentflow.storage.DATA_DIR", data_dir):
+            with patch("agentflow.storage.DATA_FILE", data_file):
+                storage.save_database(sample_database())
+                storage.clear_cache()
+
+                with patch("agentflow.snapshot_cache.Database.__init__") as validate:
+                    db = storage.load_database()
+
+        validate.assert_not_called()
+        assert db.organizations[0].slug == "org"
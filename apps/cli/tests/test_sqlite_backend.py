@@ -0,0 +1,252 @@
+"""Tests for the SQLite storage backend."""
+
+import pytest
+from datetime import datetime, UTC
+from pathlib import Path
+from unittest.mock import patch
+from typer.testing import CliRunner
+
+from agentflow import storage
+from agentflow.commands.storage import app as storage_app
+from agentflow.index import Filter
+from agentflow.models import User, APIKey, Organization, Project, Database
+from agentflow.sqlite_backend import SQLiteBackend, close_connections
+
+runner = CliRunner()
+
+
+@pytest.fixture
+def temp_dirs(tmp_path: Path):
+    """Create temporary data and config directories for testing."""
+    data_dir = tmp_path / ".agentflow"
+
+    with patch("agentflow.storage.DATA_DIR", data_dir):
+        with patch("agentflow.storage.DATA_FILE", data_dir / "data.json"):
+            with patch("agentflow.utils.config.CONFIG_DIR", data_dir):
+                with patch("agentflow.utils.config.CONFIG_FILE", data_dir / "config.yaml"):
+                    yield
+    close_connections()
+
+
+@pytest.fixture
+def sqlite_backend(temp_dirs, monkeypatch):
+    """Select the SQLite backend through the environment."""
+    monkeypatch.setenv(storage.BACKEND_ENV_VAR, "sqlite")
+
+
+class TestBackendSelection:
+    """Tests for choosing the storage backend."""
+
+    def test_defaults_to_json(self, temp_dirs, monkeypatch):
+        """Test that the JSON backend is used by default."""
+        monkeypatch.delenv(storage.BACKEND_ENV_VAR, raising=False)
+        assert isinstance(storage.get_backend(), storage.JSONBackend)
+
+    def test_env_var_selects_sqlite(self, sqlite_backend):
+        """Test that AGENTFLOW_STORAGE selects the SQLite backend."""
+        assert isinstance(storage.get_backend(), SQLiteBackend)
+
+    def test_config_selects_sqlite(self, temp_dirs, monkeypatch):
+        """Test that the storage_backend config key selects the backend."""
+        from agentflow.utils.config import set_storage_backend
+
+        monkeypatch.delenv(storage.BACKEND_ENV_VAR, raising=False)
+        set_storage_backend("sqlite")
+
+        assert isinstance(storage.get_backend(), SQLiteBackend)
+
+    def test_unknown_backend_raises(self, temp_dirs, monkeypatch):
+        """Test that an unknown backend name is rejected."""
+        monkeypatch.setenv(storage.BACKEND_ENV_VAR, "nope")
+
+        with pytest.raises(ValueError):
+            storage.get_backend()
+
+
+class TestSQLiteLookups:
+    """Tests for storage functions running on SQLite."""
+
+    def test_add_and_find_user_with_api_keys(self, sqlite_backend):
+        """Test that users round-trip with their API keys."""
+        user = User(email="test@example.com", password_hash="hash", name="Test")
+        user.api_keys.append(APIKey(key="afk_1", name="Default Key"))
+        storage.add_user(user)
+        storage.add_api_key(user.id, APIKey(key="afk_2", name="Second"))
+
+        result = storage.find_user_by_email("test@example.com")
+
+        assert result.id == user.id
+        assert [k.key for k in result.api_keys] == ["afk_1", "afk_2"]
+        assert storage.find_user_by_email("missing@example.com") is None
+
+    def test_organization_lookups(self, sqlite_backend):
+        """Test organization lookups by slug and owner."""
+        storage.add_organization(Organization(id="org-1", owner_id="user-1", name="A", slug="a"))
+        storage.add_organization(Organization(id="org-2", owner_id="user-2", name="B", slug="b"))
+        storage.add_organization(Organization(id="org-3", owner_id="user-1", name="C", slug="c"))
+
+        assert storage.find_organization_by_slug("b").id == "org-2"
+        assert storage.slug_exists_in_organizations("c") is True
+        assert storage.slug_exists_in_organizations("d") is False
+        assert [o.id for o in storage.find_organizations_by_owner("user-1")] == ["org-1", "org-3"]
+
+    def test_project_lookups_are_scoped_to_organization(self, sqlite_backend):
+        """Test project lookups within an organization."""
+        storage.add_project(Project(id="p1", organization_id="org-1", name="Web", slug="web"))
+        storage.add_project(Project(id="p2", organization_id="org-2", name="Web", slug="web"))
+        storage.add_project(Project(id="p3", organization_id="org-1", name="API", slug="api"))
+
+        assert storage.find_project_by_slug("org-2", "web").id == "p2"
+        assert storage.slug_exists_in_projects("org-2", "api") is False
+        assert [p.id for p in storage.find_projects_by_organization("org-1")] == ["p1", "p3"]
+
+    def test_iterators(self, sqlite_backend):
+        """Test that records are iterated in insertion order."""
+        storage.add_user(User(email="test@example.com", password_hash="hash", name="Test"))
+        storage.add_organization(Organization(id="org-1", owner_id="user-1", name="A", slug="a"))
+        storage.add_project(Project(id="p1", organization_id="org-1", name="Web", slug="web"))
+        storage.add_project(Project(id="p2", organization_id="org-2", name="Web", slug="web"))
+
+        assert [u.email for u in storage.iter_users()] == ["test@example.com"]
+        assert [o.id for o in storage.iter_organizations()] == ["org-1"]
+        assert [p.id for p in storage.iter_projects()] == ["p1", "p2"]
+        assert [p.id for p in storage.iter_projects("org-2")] == ["p2"]
+
+    def test_page_projects(self, sqlite_backend):
+        """Test keyset pagination through the ordered indexes."""
+        for slug in ("c", "a", "b"):
+            storage.add_project(Project(id=f"id-{slug}", organization_id="org-1", name=slug, slug=slug))
+
+        first, key = storage.page_projects("org-1", "slug", limit=2)
+        rest, end = storage.page_projects("org-1", "slug", key, 2)
+
+        assert [p.slug for p in first] == ["a", "b"]
+        assert [p.slug for p in rest] == ["c"]
+        assert end is None
+        assert [p.slug for p in storage.page_projects("org-1")[0]] == ["c", "a", "b"]
+
+    def test_page_projects_filtered(self, sqlite_backend):
+        """Test that filters are applied by the query."""
+        storage.add_project(Project(organization_id="org-1", name="Web 100%", slug="web"))
+        storage.add_project(
+            Project(organization_id="org-1", name="Api", slug="api", github_url="https://github.com/a/api")
+        )
+        storage.add_project(Project(organization_id="org-1", name="Old", slug="old", is_active=False))
+
+        def slugs(where):
+            return [p.slug for p in storage.page_projects("org-1", "slug", where=where)[0]]
+
+        assert slugs(Filter(is_active=False)) == ["old"]
+        assert slugs(Filter(has_github=True)) == ["api"]
+        assert slugs(Filter(has_github=False, is_active=True)) == ["web"]
+        assert slugs(Filter(name_contains="0%")) == ["web"]
+        assert slugs(Filter(name_contains="_")) == []
+        assert slugs(Filter(created_after=datetime(2000, 1, 1, tzinfo=UTC))) == ["api", "old", "web"]
+        assert slugs(Filter(created_after=datetime.now(UTC))) == []
+
+    def test_project_counts_follow_writes(self, sqlite_backend):
+        """Test that triggers keep the project counts up to date."""
+        storage.add_project(Project(organization_id="org-1", name="Web", slug="web"))
+        storage.add_project(Project(organization_id="org-1", name="Old", slug="old", is_active=False))
+        storage.add_project(Project(organization_id="org-2", name="Web", slug="web"))
+
+        assert storage.count_projects(["org-1", "org-2", "org-3"]) == {
+            "org-1": (1, 1),
+            "org-2": (1, 0),
+            "org-3": (0, 0),
+        }
+
+        storage.save_database(Database(projects=[Project(organization_id="org-2", name="A", slug="a")]))
+
+        assert storage.count_projects(["org-1", "org-2"]) == {"org-1": (0, 0), "org-2": (1, 0)}
+
+    def test_project_counts_backfilled(self, temp_dirs):
+        """Test that databases created before project_counts get it filled."""
+        path = storage.get_sqlite_file()
+        backend = SQLiteBackend(path)
+        backend.add_project(Project(organization_id="org-1", name="Web", slug="web"))
+        backend.conn.executescript("DROP TABLE project_counts")
+        close_connections()
+
+        assert SQLiteBackend(path).count_projects(["org-1"]) == {"org-1": (1, 0)}
+
+    def test_timestamps_normalized(self, temp_dirs):
+        """Test that databases storing JSON-dumped timestamps get them rewritten."""
+        path = storage.get_sqlite_file()
+        backend = SQLiteBackend(path)
+        for slug, created_at in (("whole", "2025-01-01T00:00:00Z"), ("half", "2025-01-01T00:00:00.500000Z")):
+            backend.add_project(Project(id=f"id-{slug}", organization_id="org-1", name=slug, slug=slug))
+            backend.conn.execute("UPDATE projects SET created_at = ? WHERE slug = ?", (created_at, slug))
+        backend.conn.execute("PRAGMA user_version = 0")
+        backend.conn.commit()
+        close_connections()
+
+        backend = SQLiteBackend(path)
+
+        stored = backend.conn.execute("SELECT created_at FROM projects ORDER BY created_at")
+        assert [row[0] for row in stored] == [
+            "2025-01-01T00:00:00.000000+00:00",
+            "2025-01-01T00:00:00.500000+00:00",
+        ]
+        assert [p.slug for p in backend.page_projects("org-1")[0]] == ["whole", "half"]
+
+    def test_save_and_load_round_trip(self, sqlite_backend):
+        """Test that save_database replaces the whole database."""
+        user = User(email="test@example.com", password_hash="hash", name="Test")
+        org = Organization(owner_id=user.id, name="Org", slug="org")
+        project = Project(organization_id=org.id, name="Web", slug="web", is_active=False)
+        storage.save_database(Database(users=[user], organizations=[org], projects=[project]))
+
+        db = storage.load_database()
+
+        assert db.users[0].email == "test@example.com"
+        assert db.organizations[0].slug == "org"
+        assert db.projects[0].is_active is False
+        assert db.projects[0].created_at == project.created_at
+
+
+class TestSQLiteTransaction:
+    """Tests for transactions on SQLite."""
+
+    def test_commit(self, sqlite_backend):
+        """Test that a transaction's inserts are visible inside and after it."""
+        with storage.transaction():
+            storage.add_project(Project(organization_id="org-1", name="Web", slug="web"))
+            assert storage.slug_exists_in_projects("org-1", "web") is True
+
+        assert storage.slug_exists_in_projects("org-1", "web") is True
+
+    def test_rollback_on_exception(self, sqlite_backend):
+        """Test that a failing transaction inserts nothing."""
+        with pytest.raises(RuntimeError):
+            with storage.transaction():
+                storage.add_project(Project(organization_id="org-1", name="Web", slug="web"))
+                raise RuntimeError("boom")
+
+        assert storage.find_projects_by_organization("org-1") == []
+
+
+class TestMigrateCommand:
+    """Tests for storage migrate command."""
+
+    def test_migrates_json_to_sqlite(self, temp_dirs, monkeypatch):
+        """Test that migrate imports data.json and activates SQLite."""
+        from agentflow.utils.config import get_storage_backend
+
+        monkeypatch.delenv(storage.BACKEND_ENV_VAR, raising=False)
+        org = Organization(owner_id="user-1", name="Org", slug="org")
+        storage.save_database(Database(organizations=[org]))
+
+        result = runner.invoke(storage_app, ["migrate", "--to", "sqlite"])
+
+        assert result.exit_code == 0
+        assert "Migrated data from json to sqlite" in result.stdout
+        assert get_storage_backend() == "sqlite"
+        assert storage.find_organization_by_slug("org").id == org.id
+
+    def test_rejects_unknown_backend(self, temp_dirs):
+        """Test that migrate rejects unknown target backends."""
+        result = runner.invoke(storage_app, ["migrate", "--to", "nope"])
+
+        assert result.exit_code == 1
+        assert "Unknown backend" in result.stdout
@@ -16,6 +16,12 @@ from agentflow.storage import (
     find_organizations_by_owner,
     slug_exists_in_organizations,
     slug_exists_in_projects,
+    clear_cache,
+    add_project,
+    add_organization,
+    transaction,
+    get_backend,
+    get_journal_file,
     DATA_DIR,
     DATA_FILE,
 )
@@ -131,6 +137,238 @@ class TestSaveDatabase:
         assert data["users"][0]["email"] == "test@example.com"
 
 
+class TestDatabaseCache:
+    """Tests for the per-process parsed database cache."""
+
+    def test_reuses_database_while_file_unchanged(self, temp_data_dir):
+        """Test that load_database returns the cached Database."""
+        user = User(email="test@example.com", password_hash="hash", name="Test")
+        save_database(Database(users=[user]))
+
+        assert load_database() is load_database()
+
+    def test_save_updates_cache_in_place(self, temp_data_dir):
+        """Test that save_database makes the saved Database the cached one."""
+        db = Database()
+        save_database(db)
+
+        assert load_database() is db
+
+    def test_reloads_when_file_changes(self, temp_data_dir):
+        """Test that an external change to the file invalidates the cache."""
+        import agentflow.storage
+
+        save_database(Database())
+        first = load_database()
+
+        with open(agentflow.storage.DATA_FILE, "w") as f:
+            json.dump({"organizations": [{"owner_id": "u", "name": "Org", "slug": "org"}]}, f)
+
+        second = load_database()
+
+        assert second is not first
+        assert second.organizations[0].slug == "org"
+
+    def test_clear_cache_forces_reload(self, temp_data_dir):
+        """Test that clear_cache drops cached databases."""
+        save_database(Database())
+        first = load_database()
+
+        clear_cache()
+
+        assert load_database() is not first
+
+
+class TestJournal:
+    """Tests for journaled writes in the JSON backend."""
+
+    def test_insert_appends_to_journal_without_rewriting_snapshot(self, temp_data_dir):
+        """Test that add_project leaves data.json untouched."""
+        import agentflow.storage
+
+        save_database(Database())
+        snapshot = agentflow.storage.DATA_FILE.read_bytes()
+
+        add_project(Project(organization_id="org-1", name="Web", slug="web"))
+
+        assert agentflow.storage.DATA_FILE.read_bytes() == snapshot
+        assert len(get_journal_file().read_text().splitlines()) == 1
+
+    def test_load_replays_journal(self, temp_data_dir):
+        """Test that journaled inserts are visible after a fresh load."""
+        add_project(Project(organization_id="org-1", name="Web", slug="web"))
+        clear_cache()
+
+        assert find_project_by_slug("org-1", "web") is not None
+
+    def test_picks_up_entries_appended_since_last_load(self, temp_data_dir):
+        """Test that a cached database replays new journal entries only."""
+        save_database(Database())
+        db = load_database()
+
+        add_project(Project(organization_id="org-1", name="Web", slug="web"))
+
+        assert load_database() is db
+        assert [p.slug for p in db.projects] == ["web"]
+
+    def test_save_drops_journal(self, temp_data_dir):
+        """Test that a full save folds the journal into the snapshot."""
+        add_project(Project(organization_id="org-1", name="Web", slug="web"))
+
+        save_database(load_database())
+
+        assert not get_journal_file().exists()
+        clear_cache()
+        assert len(load_database().projects) == 1
+
+    def test_compacts_when_journal_outgrows_snapshot(self, temp_data_dir):
+        """Test that the journal is compacted past the size threshold."""
+        with patch("agentflow.storage.JOURNAL_COMPACT_MIN_BYTES", 0):
+            add_project(Project(organization_id="org-1", name="Web", slug="web"))
+
+        assert not get_journal_file().exists()
+        clear_cache()
+        assert len(load_database().projects) == 1
+
+    def test_compact(self, temp_data_dir):
+        """Test that compact folds pending entries into data.json."""
+        import agentflow.storage
+
+        add_project(Project(organization_id="org-1", name="Web", slug="web"))
+
+        get_backend().compact()
+
+        with open(agentflow.storage.DATA_FILE, "r") as f:
+            data = json.load(f)
+        assert data["projects"][0]["slug"] == "web"
+        assert not get_journal_file().exists()
+
+
+class TestDataFileFormats:
+    """Tests for the configurable data.json format."""
+
+    @pytest.mark.parametrize("fmt", ["json", "json-compact"])
+    def test_round_trip(self, temp_data_dir, monkeypatch, fmt):
+        """Test that each format is written and detected on load."""
+        import agentflow.storage
+        from agentflow.serializers import detect_format
+
+        monkeypatch.setenv(agentflow.storage.FORMAT_ENV_VAR, fmt)
+        org = Organization(owner_id="user-1", name="Org", slug="org")
+        save_database(Database(organizations=[org]))
+        clear_cache()
+
+        assert detect_format(agentflow.storage.DATA_FILE.read_bytes()) == fmt
+        assert load_database().organizations[0] == org
+
+    def test_reads_file_written_in_another_format(self, temp_data_dir, monkeypatch):
+        """Test that changing the format doesn't break existing files."""
+        import agentflow.storage
+
+        monkeypatch.setenv(agentflow.storage.FORMAT_ENV_VAR, "json-compact")
+        save_database(Database(organizations=[Organization(owner_id="u", name="O", slug="o")]))
+        monkeypatch.setenv(agentflow.storage.FORMAT_ENV_VAR, "json")
+        clear_cache()
+
+        assert find_organization_by_slug("o") is not None
+
+    def test_convert_rejects_conflicting_override(self, temp_data_dir, tmp_path, monkeypatch):
+        """Test that convert refuses a format the environment would override."""
+        import agentflow.storage
+        from typer.testing import CliRunner
+        from agentflow.cli import app
+
+        monkeypatch.setenv(agentflow.storage.FORMAT_ENV_VAR, "json")
+        save_database(Database())
+        before = agentflow.storage.DATA_FILE.read_bytes()
+
+        with patch("agentflow.utils.config.CONFIG_FILE", tmp_path / "config.yaml"):
+            result = CliRunner().invoke(app, ["storage", "convert", "--format", "json-compact"])
+
+        assert result.exit_code == 1
+        assert "AGENTFLOW_STORAGE_FORMAT=json overrides --format" in result.stdout
+        assert agentflow.storage.DATA_FILE.read_bytes() == before
+
+    def test_convert_reports_written_format(self, temp_data_dir, tmp_path, monkeypatch):
+        """Test that convert reports the format it wrote."""
+        import agentflow.storage
+        from typer.testing import CliRunner
+        from agentflow.cli import app
+        from agentflow.serializers import detect_format
+
+        monkeypatch.delenv(agentflow.storage.FORMAT_ENV_VAR, raising=False)
+        save_database(Database())
+
+        with patch("agentflow.utils.config.CONFIG_FILE", tmp_path / "config.yaml"):
+            result = CliRunner().invoke(app, ["storage", "convert", "--format", "json-compact"])
+
+        assert result.exit_code == 0
+        assert "Data file converted to json-compact" in result.stdout
+        assert detect_format(agentflow.storage.DATA_FILE.read_bytes()) == "json-compact"
+
+    def test_unknown_format_raises(self, temp_data_dir, monkeypatch):
+        """Test that an unknown format name is rejected."""
+        import agentflow.storage
+
+        monkeypatch.setenv(agentflow.storage.FORMAT_ENV_VAR, "xml")
+
+        with pytest.raises(ValueError):
+            save_database(Database())
+
+
+class TestTransaction:
+    """Tests for the transaction context manager."""
+
+    def test_lookups_see_pending_changes(self, temp_data_dir):
+        """Test that lookups inside a transaction see uncommitted inserts."""
+        with transaction():
+            add_organization(Organization(id="org-1", owner_id="u", name="Org", slug="org"))
+            assert slug_exists_in_organizations("org") is True
+
+    def test_commit_writes_single_journal_line(self, temp_data_dir):
+        """Test that all mutations of a transaction are flushed in one write."""
+        with transaction() as tx:
+            for i in range(3):
+                tx.add_project(Project(organization_id="org-1", name=f"P{i}", slug=f"p{i}"))
+
+        assert len(get_journal_file().read_text().splitlines()) == 1
+        clear_cache()
+        assert len(find_projects_by_organization("org-1")) == 3
+
+    def test_rollback_on_exception(self, temp_data_dir):
+        """Test that a failing transaction leaves storage untouched."""
+        save_database(Database())
+
+        with pytest.raises(RuntimeError):
+            with transaction():
+                add_project(Project(organization_id="org-1", name="Web", slug="web"))
+                raise RuntimeError("boom")
+
+        assert find_projects_by_organization("org-1") == []
+        assert not get_journal_file().exists()
+
+    def test_nested_transactions_join_outer(self, temp_data_dir):
+        """Test that a nested transaction commits with the outermost one."""
+        with transaction() as outer:
+            with transaction() as inner:
+                add_project(Project(organization_id="org-1", name="Web", slug="web"))
+            assert inner is outer
+            assert not get_journal_file().exists()
+
+        assert len(get_journal_file().read_text().splitlines()) == 1
+
+    def test_save_database_inside_transaction_is_deferred(self, temp_data_dir):
+        """Test that a full save inside a transaction is written on commit."""
+        import agentflow.storage
+
+        with transaction():
+            save_database(Database(organizations=[Organization(owner_id="u", name="O", slug="o")]))
+            assert not agentflow.storage.DATA_FILE.exists()
+
+        clear_cache()
+        assert find_organization_by_slug("o") is not None
+
+
 class TestFindUserByEmail:
     """Tests for find_user_by_email function."""
 